@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Product
+from .models import Location, Product, StockMovement
+from .services import InventoryService
+from .helpers.sync import delete_product
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
@@ -9,8 +11,14 @@ class ProductAdmin(admin.ModelAdmin):
         'stock_status', 'is_active', 'created_at'
     ]
     list_filter = ['is_active', 'created_at', 'updated_at']
+    # icontains on both columns: served by the trigram indexes (migration 0007)
     search_fields = ['name', 'description']
-    readonly_fields = ['created_at', 'updated_at']
+    # Skip the unfiltered COUNT(*) over the whole catalog on every search
+    show_full_result_count = False
+    # Maintained by reservations, location stock changes and shard_stock
+    readonly_fields = [
+        'reserved_quantity', 'located_quantity', 'stock_shards', 'created_at', 'updated_at'
+    ]
     ordering = ['name']
 
     def stock_status(self, obj):
@@ -27,4 +35,35 @@ class ProductAdmin(admin.ModelAdmin):
             '<span style="color: green;">OK ({}/{})</span>',
             obj.stock_quantity, obj.low_stock_threshold
         )
-    stock_status.short_description = 'Stock Status'
\ No newline at end of file
+    stock_status.short_description = 'Stock Status'
+
+    def get_readonly_fields(self, request, obj=None):
+        # A sharded product's stock lives in its shard rows
+        if obj is not None and obj.stock_shards:
+            return [*self.readonly_fields, 'stock_quantity']
+        return self.readonly_fields
+
+    # Edits only write the form's columns, never a stale copy of the
+    # others; stock changes are recorded in the ledger
+    def save_model(self, request, obj, form, change):
+        InventoryService.save_product(
+            obj, update_fields=list(form.fields) if change else None,
+            reason=StockMovement.Reason.ADMIN, user_id=request.user.id
+        )
+
+    # Deletions must leave tombstones for the delta sync feed
+    def delete_model(self, request, obj):
+        delete_product(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            delete_product(obj)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    # Locations holding stock cannot be deleted; deactivate them instead
+    list_display = ['code', 'name', 'is_active', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['code', 'name']
+    readonly_fields = ['created_at']
@@ -0,0 +1,144 @@
+"""
+Product Inventory Management async read views
+Async ORM versions of the hot read endpoints, enabled by INVENTORY_ASYNC_READS
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.settings import api_settings
+
+from .models import Product
+from .serializers import (
+    PRODUCT_VALUE_FIELDS,
+    product_row_to_representation,
+    serialize_product_rows,
+)
+from .services import InventoryService
+from .helpers.cache import product_cache
+from .helpers.etags import (
+    if_none_match,
+    not_modified,
+    page_version_fields,
+    paginated_page_etag,
+    representation_etag,
+)
+from .helpers.filters import filter_products
+from .helpers.renderers import render_json_response
+from .helpers.responses import APIResponse, ProductCursorPagination
+
+
+def with_async_reads(async_view, sync_view):
+    """
+    Serve GET with ``async_view`` and every other method with ``sync_view``.
+
+    Writes keep going through the DRF views, run in a worker thread.
+    Responses are rendered byte-for-byte like the DRF views.
+    """
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    # DRF views are CSRF exempt; the wrapper has to say so itself
+    view.csrf_exempt = True
+    return view
+
+
+def error_response(exc):
+    """Render ``exc`` as the DRF views' exception handler does."""
+    response = api_settings.EXCEPTION_HANDLER(exc, {})
+    return render_json_response(response.data, response.status_code)
+
+
+async def product_list(request):
+    """
+    GET: /api/products/ - ProductListCreateView.list on the async ORM
+    """
+    paginator = ProductCursorPagination()
+    try:
+        queryset = filter_products(Product.objects.all(), request.GET)
+        if 'If-None-Match' in request.headers:
+            versions = await paginator.apaginate_queryset(
+                queryset.values(*page_version_fields(paginator)), request
+            )
+            etag = paginated_page_etag(paginator, versions)
+            if if_none_match(request, etag):
+                return not_modified(etag)
+        page = await paginator.apaginate_queryset(queryset.values(*PRODUCT_VALUE_FIELDS), request)
+    except (ValidationError, NotFound) as exc:
+        return error_response(exc)
+    
+    response = render_json_response(APIResponse.success_payload(
+        paginator.get_paginated_data(serialize_product_rows(page)),
+        message="Data retrieved successfully"
+    ))
+    response['ETag'] = paginated_page_etag(paginator, page)
+    return response
+
+
+async def product_detail(request, pk):
+    """
+    GET: /api/products/{id}/ - ProductDetailView.retrieve on the async ORM
+    Shares the read-through product cache with the sync view.
+    """
+    async def load():
+        try:
+            row = await Product.objects.values(*PRODUCT_VALUE_FIELDS).aget(pk=pk)
+        except Product.DoesNotExist:
+            # Same message as get_object_or_404 in the sync view
+            raise Http404(f"No {Product._meta.object_name} matches the given query.")
+        return product_row_to_representation(row)
+    
+    try:
+        data = await product_cache.aget(pk, load)
+    except Http404 as exc:
+        return error_response(exc)
+    
+    etag = representation_etag(data)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    response = render_json_response(data)
+    response['ETag'] = etag
+    return response
+
+
+async def low_stock_products(request):
+    """
+    GET: /api/products/low-stock/ - low_stock_products on the async ORM
+    """
+    try:
+        rows = InventoryService.get_low_stock_products().values(*PRODUCT_VALUE_FIELDS)
+        data = serialize_product_rows([row async for row in rows])
+        return render_json_response({
+            'success': True,
+            'message': f'Found {len(data)} low stock products',
+            'data': data
+        })
+        
+    except Exception:
+        return render_json_response(
+            {'error': 'Failed to retrieve low stock products'},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+async def inventory_summary(request):
+    """
+    GET: /api/products/summary/ - inventory_summary on the async ORM
+    """
+    try:
+        return render_json_response({
+            'success': True,
+            'message': 'Inventory summary retrieved',
+            'data': await InventoryService.aget_inventory_summary()
+        })
+        
+    except Exception:
+        return render_json_response(
+            {'error': 'Failed to retrieve inventory summary'},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
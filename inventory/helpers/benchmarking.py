@@ -0,0 +1,133 @@
+"""
+Helper functions shared by the benchmark commands and performance tests.
+"""
+
+import json
+import math
+import time
+from typing import Callable, Dict, List, Sequence
+
+from django.db import connection
+from django.utils import timezone
+
+from ..models import Product
+
+# Synthetic catalog shape: stock is spread over 0..4999 against a threshold
+# of 10, so about 0.2% of products are low on stock; every tenth product is
+# inactive.
+SEED_STOCK_MODULUS = 5000
+SEED_LOW_STOCK_THRESHOLD = 10
+
+
+def seed_products(count: int, prefix: str = 'bench', batch_size: int = 10000) -> None:
+    """
+    Insert ``count`` synthetic products named ``<prefix>-<n>``.
+
+    On PostgreSQL the rows are generated server-side with generate_series;
+    other backends fall back to batched bulk_create.
+
+    Args:
+        count: Number of products to create
+        prefix: Name prefix, must not collide with existing products
+        batch_size: Rows per INSERT on the bulk_create fallback
+    """
+    now = timezone.now()
+
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        generated = {
+            'name': "%s || '-' || n",
+            'stock_quantity': f"(n::bigint * 7919) %% {SEED_STOCK_MODULUS}",
+            'low_stock_threshold': str(SEED_LOW_STOCK_THRESHOLD),
+            'is_active': "n %% 10 <> 0",
+        }
+        columns, expressions, params = [], [], []
+        for field in Product._meta.concrete_fields:
+            if field.primary_key:
+                continue
+            columns.append(qn(field.column))
+            if field.name in generated:
+                expressions.append(generated[field.name])
+                if field.name == 'name':
+                    params.append(prefix)
+            else:
+                expressions.append('%s')
+                params.append(now if field.name in ('created_at', 'updated_at')
+                              else field.get_default())
+        sql = (
+            f"INSERT INTO {qn(Product._meta.db_table)} ({', '.join(columns)}) "
+            f"SELECT {', '.join(expressions)} FROM generate_series(1, %s) AS n"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [count])
+        return
+
+    for start in range(1, count + 1, batch_size):
+        Product.objects.bulk_create([
+            Product(
+                name=f"{prefix}-{n}",
+                stock_quantity=(n * 7919) % SEED_STOCK_MODULUS,
+                low_stock_threshold=SEED_LOW_STOCK_THRESHOLD,
+                is_active=n % 10 != 0,
+            )
+            for n in range(start, min(start + batch_size, count + 1))
+        ])
+
+
+def analyze_table(model) -> None:
+    """Refresh planner statistics after seeding (PostgreSQL only)."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def time_call(func: Callable[[], object], repeat: int) -> List[float]:
+    """Call ``func`` ``repeat`` times and return each latency in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Median, p95 and max of latency samples in milliseconds."""
+    return {
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'max': max(samples) if samples else 0.0,
+    }
+
+
+def sequential_scans(sql: str) -> List[str]:
+    """
+    Tables PostgreSQL would read with a Seq Scan when running ``sql``.
+
+    ``sql`` must be a complete SELECT with its parameters inlined, e.g. a
+    captured query. Returns an empty list on other backends.
+    """
+    if connection.vendor != 'postgresql':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    tables, nodes = [], [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            tables.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return tables
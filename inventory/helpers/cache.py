@@ -0,0 +1,268 @@
+"""
+Helper functions for caching derived inventory data.
+
+Cached values are stored under a generation token that is replaced after
+every committed write. Readers that raced with a write store their result
+under the old generation, where nobody looks for it, so a stale value can
+never outlive the transaction that made it stale.
+"""
+
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+SUMMARY_CACHE_KEY = 'inventory:summary'
+PRODUCT_CACHE_KEY = 'inventory:product'
+
+
+def _generation_key(name: str) -> str:
+    return f'{name}:generation'
+
+
+def _new_generation() -> int:
+    # Random rather than incremented, so an evicted token is never reused
+    return secrets.randbits(62)
+
+
+def get_generation(name: str) -> int:
+    """Current generation for ``name``, created on first use."""
+    generation = cache.get(_generation_key(name))
+    if generation is None:
+        cache.add(_generation_key(name), _new_generation(), timeout=None)
+        generation = cache.get(_generation_key(name))
+    return generation
+
+
+async def aget_generation(name: str) -> int:
+    """get_generation for async callers."""
+    generation = await cache.aget(_generation_key(name))
+    if generation is None:
+        await cache.aadd(_generation_key(name), _new_generation(), timeout=None)
+        generation = await cache.aget(_generation_key(name))
+    return generation
+
+
+def bump_generation(*names: str) -> None:
+    """Invalidate every entry cached under the current generation of ``names``."""
+    cache.set_many(
+        {_generation_key(name): _new_generation() for name in names},
+        timeout=None
+    )
+
+
+def get_or_compute(name: str, compute: Callable[[], Any], timeout: int) -> Any:
+    """Read-through cache lookup keyed on the current generation of ``name``."""
+    version = get_generation(name)
+    value = cache.get(name, version=version)
+    if value is None:
+        value = compute()
+        cache.set(name, value, timeout=timeout, version=version)
+    return value
+
+
+async def aget_or_compute(name: str, acompute: Callable[[], Awaitable[Any]],
+                          timeout: int) -> Any:
+    """get_or_compute for async callers; ``acompute`` is awaited on a miss."""
+    version = await aget_generation(name)
+    value = await cache.aget(name, version=version)
+    if value is None:
+        value = await acompute()
+        await cache.aset(name, value, timeout=timeout, version=version)
+    return value
+
+
+def get_cached_summary(compute: Callable[[], Any]) -> Any:
+    """Inventory summary, recomputed only after stock or thresholds change."""
+    return get_or_compute(
+        SUMMARY_CACHE_KEY, compute, settings.INVENTORY_SUMMARY_CACHE_TIMEOUT
+    )
+
+
+async def aget_cached_summary(acompute: Callable[[], Awaitable[Any]]) -> Any:
+    """get_cached_summary for async callers."""
+    return await aget_or_compute(
+        SUMMARY_CACHE_KEY, acompute, settings.INVENTORY_SUMMARY_CACHE_TIMEOUT
+    )
+
+
+def invalidate_inventory_summary() -> None:
+    """Drop the cached summary once the current transaction commits."""
+    transaction.on_commit(lambda: bump_generation(SUMMARY_CACHE_KEY))
+
+
+class ProductCache:
+    """
+    Two-tier read-through cache of serialized product payloads.
+
+    Entries are keyed on the catalog-wide generation plus the product's own
+    generation, both kept in the default cache. The first tier is a bounded
+    in-process LRU; the optional second tier is a Django cache alias shared
+    between processes. Writers replace the generations on commit, so a
+    process never serves a payload older than the last committed write it
+    can see through the default cache.
+    """
+
+    def __init__(self, max_entries: int, shared_alias: Optional[str] = None,
+                 timeout: int = 300):
+        self.max_entries = max_entries
+        self.shared_alias = shared_alias or None
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> 'ProductCache':
+        return cls(
+            max_entries=settings.INVENTORY_PRODUCT_CACHE_SIZE,
+            shared_alias=settings.INVENTORY_PRODUCT_CACHE_ALIAS,
+            timeout=settings.INVENTORY_PRODUCT_CACHE_TIMEOUT,
+        )
+
+    def _version_names(self, product_id: int):
+        return [PRODUCT_CACHE_KEY, f'{PRODUCT_CACHE_KEY}:{product_id}']
+
+    def _version(self, product_id: int) -> str:
+        names = self._version_names(product_id)
+        found = cache.get_many([_generation_key(name) for name in names])
+        parts = []
+        for name in names:
+            generation = found.get(_generation_key(name))
+            if generation is None:
+                generation = get_generation(name)
+            parts.append(str(generation))
+        return '.'.join(parts)
+
+    async def _aversion(self, product_id: int) -> str:
+        names = self._version_names(product_id)
+        found = await cache.aget_many([_generation_key(name) for name in names])
+        parts = []
+        for name in names:
+            generation = found.get(_generation_key(name))
+            if generation is None:
+                generation = await aget_generation(name)
+            parts.append(str(generation))
+        return '.'.join(parts)
+
+    def _get_local(self, key):
+        with self._lock:
+            payload = self._local.get(key)
+            if payload is not None:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+            return payload
+
+    def _count_lookup(self, shared_hit: bool) -> None:
+        with self._lock:
+            if shared_hit:
+                self.shared_hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, product_id: int, loader: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the payload for ``product_id``, calling ``loader`` on a miss.
+
+        Exceptions from ``loader`` (e.g. Http404) propagate and nothing is
+        cached for the product.
+        """
+        version = self._version(product_id)
+        local_key = (product_id, version)
+        payload = self._get_local(local_key)
+        if payload is not None:
+            return payload
+
+        shared_key = f'{PRODUCT_CACHE_KEY}:{product_id}'
+        payload = None
+        if self.shared_alias:
+            payload = caches[self.shared_alias].get(shared_key, version=version)
+
+        if payload is not None:
+            self._count_lookup(shared_hit=True)
+        else:
+            payload = dict(loader())
+            self._count_lookup(shared_hit=False)
+            if self.shared_alias:
+                caches[self.shared_alias].set(
+                    shared_key, payload, timeout=self.timeout, version=version
+                )
+
+        self._store_local(local_key, payload)
+        return payload
+
+    async def aget(self, product_id: int,
+                   aloader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """get for async callers; ``aloader`` is awaited on a miss."""
+        version = await self._aversion(product_id)
+        local_key = (product_id, version)
+        payload = self._get_local(local_key)
+        if payload is not None:
+            return payload
+
+        shared_key = f'{PRODUCT_CACHE_KEY}:{product_id}'
+        payload = None
+        if self.shared_alias:
+            payload = await caches[self.shared_alias].aget(shared_key, version=version)
+
+        if payload is not None:
+            self._count_lookup(shared_hit=True)
+        else:
+            payload = dict(await aloader())
+            self._count_lookup(shared_hit=False)
+            if self.shared_alias:
+                await caches[self.shared_alias].aset(
+                    shared_key, payload, timeout=self.timeout, version=version
+                )
+
+        self._store_local(local_key, payload)
+        return payload
+
+    def _store_local(self, key, payload) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._local[key] = payload
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def invalidate(self, product_ids: Iterable[int]) -> None:
+        """Invalidate entries for ``product_ids`` once the transaction commits."""
+        names = [f'{PRODUCT_CACHE_KEY}:{pk}' for pk in set(product_ids)]
+        if names:
+            # Superseded local entries are unreachable and age out of the LRU
+            transaction.on_commit(lambda: bump_generation(*names))
+
+    def invalidate_all(self) -> None:
+        """Invalidate every product entry once the transaction commits."""
+        def invalidate():
+            bump_generation(PRODUCT_CACHE_KEY)
+            with self._lock:
+                self._local.clear()
+        transaction.on_commit(invalidate)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            return {
+                'local_hits': self.local_hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'local_entries': len(self._local),
+            }
+
+    def clear(self) -> None:
+        """Drop local entries and reset counters (used by tests)."""
+        with self._lock:
+            self._local.clear()
+            self.local_hits = self.shared_hits = self.misses = 0
+
+
+product_cache = ProductCache.from_settings()
@@ -0,0 +1,234 @@
+"""
+Helper classes for write-behind coalescing of stock increments.
+
+Many small increments for the same product are collected in-process and
+handed to a flush function as one batch, either every ``flush_interval_ms``
+or as soon as ``max_ops`` increments are waiting, whichever comes first.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .benchmarking import summarize
+
+logger = logging.getLogger(__name__)
+
+# Acknowledge once the increment is committed
+DURABILITY_FLUSH = 'flush'
+# Acknowledge once the increment is buffered; flushed later and on shutdown
+DURABILITY_IMMEDIATE = 'immediate'
+DURABILITY_MODES = (DURABILITY_FLUSH, DURABILITY_IMMEDIATE)
+
+# Recent flushes kept for latency and batch-size percentiles
+METRIC_SAMPLES = 1000
+
+
+class PendingIncrement:
+    """One buffered increment; the flush function fills in the outcome."""
+
+    __slots__ = ('quantity', 'user_id', 'result', 'error', 'done')
+
+    def __init__(self, quantity: int, user_id: Optional[int]):
+        self.quantity = quantity
+        self.user_id = user_id
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class CoalescingBuffer:
+    """
+    Per-product accumulator flushed by a background thread.
+
+    ``flush_func`` receives ``{product_id: [PendingIncrement, ...]}`` and
+    must set ``result`` or ``error`` on every increment, a ``result`` only
+    once the increment has committed. With ``flush`` durability ``add``
+    blocks until its batch is flushed (at most ``wait_timeout_ms``) and
+    returns the result; with ``immediate`` durability it returns None at
+    once and the increment is lost if the process dies before the next
+    flush. Pending increments are flushed on interpreter shutdown in both
+    modes.
+    """
+
+    def __init__(self, flush_func: Callable[[Dict[int, List[PendingIncrement]]], None],
+                 enabled: bool = False, flush_interval_ms: int = 50,
+                 max_ops: int = 500, durability: str = DURABILITY_FLUSH,
+                 background: bool = True, wait_timeout_ms: int = 5000):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {', '.join(DURABILITY_MODES)}")
+        self.flush_func = flush_func
+        self.enabled = enabled
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_ops = max_ops
+        self.durability = durability
+        self.background = background
+        self.wait_timeout = wait_timeout_ms / 1000
+        self._pending = defaultdict(list)
+        self._pending_ops = 0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.flushes = 0
+        self.flushed_ops = 0
+        self.failed_ops = 0
+        self._latencies = deque(maxlen=METRIC_SAMPLES)
+        self._batch_sizes = deque(maxlen=METRIC_SAMPLES)
+
+    @classmethod
+    def from_settings(cls, flush_func) -> 'CoalescingBuffer':
+        return cls(
+            flush_func,
+            enabled=settings.INVENTORY_COALESCE_INCREMENTS,
+            flush_interval_ms=settings.INVENTORY_COALESCE_FLUSH_MS,
+            max_ops=settings.INVENTORY_COALESCE_MAX_OPS,
+            durability=settings.INVENTORY_COALESCE_DURABILITY,
+            wait_timeout_ms=settings.INVENTORY_COALESCE_WAIT_MS,
+        )
+
+    def add(self, product_id: int, quantity: int, user_id: Optional[int] = None) -> Any:
+        """
+        Buffer an increment of ``quantity`` for ``product_id``.
+
+        Returns:
+            The flush result for this increment, or None with
+            ``immediate`` durability
+
+        Raises:
+            TimeoutError: If a ``flush`` durability increment is not flushed
+                within ``wait_timeout_ms``; when its batch had already been
+                taken, it may still be applied
+            Whatever the flush function recorded for this increment
+        """
+        increment = PendingIncrement(quantity, user_id)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Stock increment buffer is closed")
+            self._pending[product_id].append(increment)
+            self._pending_ops += 1
+            if self.background and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='stock-increment-flusher', daemon=True
+                )
+                self._thread.start()
+            if self._pending_ops >= self.max_ops:
+                self._condition.notify()
+
+        if self.durability == DURABILITY_IMMEDIATE:
+            return None
+        if not increment.done.wait(self.wait_timeout):
+            with self._condition:
+                pending = self._pending.get(product_id, [])
+                if increment in pending:
+                    # Never taken by a flush: withdraw it so it is not applied
+                    pending.remove(increment)
+                    self._pending_ops -= 1
+            raise TimeoutError(
+                f"Stock increment for product {product_id} was not flushed "
+                f"within {self.wait_timeout * 1000:.0f}ms"
+            )
+        if increment.error is not None:
+            raise increment.error
+        return increment.result
+
+    def _take_batch(self) -> Dict[int, List[PendingIncrement]]:
+        batch, self._pending = self._pending, defaultdict(list)
+        self._pending_ops = 0
+        return batch
+
+    def flush(self) -> int:
+        """
+        Flush everything buffered so far on the calling thread.
+
+        Returns:
+            Number of increments flushed
+        """
+        with self._condition:
+            batch = self._take_batch()
+        return self._flush_batch(batch)
+
+    def _flush_batch(self, batch: Dict[int, List[PendingIncrement]]) -> int:
+        increments = [increment for pending in batch.values() for increment in pending]
+        if not increments:
+            return 0
+
+        started = time.perf_counter()
+        with self._flush_lock:
+            try:
+                self.flush_func(batch)
+            except Exception as exc:
+                for increment in increments:
+                    if increment.result is None and increment.error is None:
+                        increment.error = exc
+        latency = (time.perf_counter() - started) * 1000
+
+        failed = [increment for increment in increments if increment.error is not None]
+        with self._condition:
+            self.flushes += 1
+            self.flushed_ops += len(increments) - len(failed)
+            self.failed_ops += len(failed)
+            self._latencies.append(latency)
+            self._batch_sizes.append(len(increments))
+
+        if failed and self.durability == DURABILITY_IMMEDIATE:
+            # Nobody is waiting to hear about these, so log them
+            for product_id, pending in batch.items():
+                for increment in pending:
+                    if increment.error is not None:
+                        logger.error(
+                            f"Dropped buffered increment of {increment.quantity} "
+                            f"for product {product_id}: {increment.error}"
+                        )
+        for increment in increments:
+            increment.done.set()
+        return len(increments)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or self._pending_ops >= self.max_ops,
+                    timeout=self.flush_interval
+                )
+                closed = self._closed
+                batch = self._take_batch()
+            close_old_connections()
+            self._flush_batch(batch)
+            if closed:
+                connection.close()
+                return
+
+    def close(self) -> None:
+        """Flush whatever is pending and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Flush counters plus latency (ms) and batch-size percentiles."""
+        with self._condition:
+            return {
+                'pending_ops': self._pending_ops,
+                'flushes': self.flushes,
+                'flushed_ops': self.flushed_ops,
+                'failed_ops': self.failed_ops,
+                'flush_latency_ms': summarize(list(self._latencies)),
+                'batch_size': summarize(list(self._batch_sizes)),
+            }
+
+
+def register_shutdown_flush(buffer: CoalescingBuffer) -> None:
+    """Flush ``buffer`` when the interpreter exits normally."""
+    if buffer.enabled:
+        atexit.register(buffer.close)
@@ -0,0 +1,82 @@
+"""
+Helper functions for the incrementally maintained inventory counters.
+
+On PostgreSQL, triggers installed by migration 0010 keep the
+InventoryCounter shards in step with every write to the product table,
+in the writing transaction: API and admin edits, stock adjustments of
+every kind, imports, shard rebalancing and raw queryset updates alike.
+Reading the summary sums a handful of counter rows instead of scanning
+the catalog.
+"""
+
+from typing import Dict
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from ..models import InventoryCounter, Product
+
+COUNTER_FIELDS = ('total_products', 'low_stock_products', 'out_of_stock_products')
+
+
+def counters_enabled() -> bool:
+    """Whether the database maintains the counters (PostgreSQL only)."""
+    return connection.vendor == 'postgresql'
+
+
+def _counter_sums():
+    return {name: Coalesce(Sum(name), 0) for name in COUNTER_FIELDS}
+
+
+def _scan_aggregates():
+    return {
+        'total_products': Count('id'),
+        'low_stock_products': Count('id', filter=Q(stock_quantity__lte=F('low_stock_threshold'))),
+        'out_of_stock_products': Count('id', filter=Q(stock_quantity=0)),
+    }
+
+
+def read_counters() -> Dict[str, int]:
+    """Summary counts from the counter shards, in constant time."""
+    return InventoryCounter.objects.aggregate(**_counter_sums())
+
+
+async def aread_counters() -> Dict[str, int]:
+    return await InventoryCounter.objects.aaggregate(**_counter_sums())
+
+
+def scan_counts() -> Dict[str, int]:
+    """Summary counts from a full scan of the product table."""
+    return Product.objects.aggregate(**_scan_aggregates())
+
+
+async def ascan_counts() -> Dict[str, int]:
+    return await Product.objects.aaggregate(**_scan_aggregates())
+
+
+def reconcile_counters(fix: bool = False) -> Dict[str, Dict[str, int]]:
+    """
+    Compare the counters with a full scan, optionally resetting them to it.
+
+    Product writes are blocked (reads are not) while the scan runs, so
+    both sides describe the same state.
+
+    Returns:
+        ``{field: {'counters': n, 'scan': m}}`` for every field that differs
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"LOCK TABLE {connection.ops.quote_name(Product._meta.db_table)} IN SHARE MODE"
+            )
+        counters = read_counters()
+        scanned = scan_counts()
+        drift = {
+            name: {'counters': counters[name], 'scan': scanned[name]}
+            for name in COUNTER_FIELDS if counters[name] != scanned[name]
+        }
+        if drift and fix:
+            InventoryCounter.objects.all().delete()
+            InventoryCounter.objects.create(shard=0, **scanned)
+    return drift
@@ -0,0 +1,116 @@
+"""
+Helper functions for product ETags and conditional requests.
+
+A product's ETag encodes its id and ``updated_at``, which every write that
+changes the product representation moves. That makes the ETag cheap to
+check (one indexed column, no serialization) and lets ``If-Match`` turn
+into an ``updated_at = ...`` condition on the write itself. List pages get
+an opaque ETag hashed from the rows on the page.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterable, List, Optional
+
+from django.http import HttpResponseNotModified
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+# Bump when the product representation changes shape, so clients drop
+# bodies cached under the old ETags
+REPRESENTATION_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def product_etag(product_id: int, updated_at) -> str:
+    """Strong ETag for one product, from its raw or serialized ``updated_at``."""
+    if isinstance(updated_at, str):
+        updated_at = parse_datetime(updated_at)
+    micros = (updated_at - _EPOCH) // _MICROSECOND
+    return quote_etag(f'{REPRESENTATION_VERSION}-{product_id}-{micros}')
+
+
+def representation_etag(data) -> str:
+    """product_etag for a serialized product."""
+    return product_etag(data['id'], data['updated_at'])
+
+
+def page_etag(rows: Iterable[dict], *parts) -> str:
+    """Strong ETag for a list page: its rows' versions plus ``parts`` (count, next link...)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((REPRESENTATION_VERSION,) + parts).encode())
+    for row in rows:
+        digest.update(f"{row['id']}:{row['updated_at'].isoformat()};".encode())
+    return quote_etag(digest.hexdigest())
+
+
+def paginated_page_etag(paginator, page) -> str:
+    """page_etag of a keyset page, covering its count, next link and size."""
+    return page_etag(page, paginator.count, paginator.get_next_link(), paginator.page_size)
+
+
+def page_version_fields(paginator) -> List[str]:
+    """The columns a page's ETag and cursor need; enough for a cheap If-None-Match check."""
+    fields = ['id', 'updated_at', *(name.lstrip('-') for name in paginator.ordering)]
+    return list(dict.fromkeys(fields))
+
+
+def _header_etags(request, header: str) -> Optional[List[str]]:
+    value = request.headers.get(header)
+    if value is None:
+        return None
+    return parse_etags(value)
+
+
+def if_none_match(request, etag: str) -> bool:
+    """Whether ``If-None-Match`` names ``etag`` (weak comparison) or is ``*``."""
+    etags = _header_etags(request, 'If-None-Match')
+    if not etags:
+        return False
+    if etags == ['*']:
+        return True
+    bare = etag[2:] if etag.startswith('W/') else etag
+    return any((tag[2:] if tag.startswith('W/') else tag) == bare for tag in etags)
+
+
+def if_match_versions(request, product_id: int) -> Optional[List[datetime]]:
+    """
+    ``updated_at`` values ``If-Match`` accepts for ``product_id``.
+
+    Returns:
+        None without the header or with ``*``; otherwise the versions named
+        by strong ETags of this product, possibly none (never matches)
+    """
+    etags = _header_etags(request, 'If-Match')
+    if etags is None or etags == ['*']:
+        return None
+    versions = []
+    for tag in etags:
+        if tag.startswith('W/'):
+            continue  # If-Match uses strong comparison
+        try:
+            version, tag_product, micros = tag.strip('"').split('-')
+            if int(version) != REPRESENTATION_VERSION or int(tag_product) != product_id:
+                continue
+            versions.append(_EPOCH + int(micros) * _MICROSECOND)
+        except ValueError:
+            continue
+    return versions
+
+
+def not_modified(etag: str) -> HttpResponseNotModified:
+    """An empty 304; a plain Django response so async views can return it too."""
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    return response
+
+
+def precondition_failed() -> Response:
+    return Response(
+        {'error': 'Product has changed since it was fetched (If-Match failed)'},
+        status=status.HTTP_412_PRECONDITION_FAILED
+    )
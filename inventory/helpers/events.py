@@ -0,0 +1,292 @@
+"""
+Helper functions for the low-stock event outbox.
+
+Every write that changes a product's stock, threshold or active flag
+inserts a LowStockEvent when the product moves into or out of low stock,
+in the transaction that makes the write, so a rolled back write leaves no
+event behind. The dispatcher
+(``manage.py dispatch_low_stock_events``) drains pending events in
+batches and numbers them in commit order; subscribers stream events after
+the last sequence they saw, so they can reconnect without gaps or repeats.
+
+Each web process checks for newly dispatched events at most once per
+INVENTORY_EVENTS_POLL_MS, with a query answered from the sequence index,
+however many subscribers it serves. Subscribers only read events once
+there are new ones.
+"""
+
+import json
+import threading
+import time
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ..models import LowStockEvent
+from .export import format_datetime
+
+DISPATCH_BATCH_SIZE = 500
+PURGE_BATCH_SIZE = 5000
+
+# pg_advisory_xact_lock key serializing dispatchers (any constant unique to this lock)
+DISPATCH_LOCK_KEY = 0x1D5E_7E47
+
+
+def record_low_stock_events(changes: Iterable[Tuple[int, int, int]],
+                            thresholds: Dict[int, int], now) -> None:
+    """
+    Insert an event for every ``(product_id, delta, quantity_after)`` change that
+    crosses the product's threshold. Must run inside the adjustment's transaction.
+
+    ``thresholds`` holds the low stock threshold of each adjusted product
+    that is active; inactive products are never low stock, so they are left out.
+    """
+    record_low_stock_transitions((
+        (product_id, (quantity_after - delta, thresholds[product_id], True),
+         (quantity_after, thresholds[product_id], True))
+        for product_id, delta, quantity_after in changes
+        if product_id in thresholds
+    ), now)
+
+
+def _is_low(stock_quantity: int, low_stock_threshold: int, is_active: bool) -> bool:
+    return is_active and stock_quantity <= low_stock_threshold
+
+
+def record_low_stock_transitions(states: Iterable[Tuple[int, Optional[tuple], tuple]],
+                                 now) -> None:
+    """
+    Insert an event for every ``(product_id, before, after)`` write that moves
+    a product into or out of low stock. Must run inside the write's transaction.
+
+    ``before`` and ``after`` are ``(stock_quantity, low_stock_threshold,
+    is_active)``; ``before`` is None for a new product. Besides stock
+    changes this covers threshold edits and (de)activation: deactivating a
+    low-stock product reports ``restocked``, as it leaves the low-stock list.
+    """
+    events = []
+    for product_id, before, after in states:
+        is_low = _is_low(*after)
+        if is_low != (before is not None and _is_low(*before)):
+            events.append(LowStockEvent(
+                product_id=product_id,
+                transition=LowStockEvent.Transition.LOW if is_low else LowStockEvent.Transition.RESTOCKED,
+                stock_quantity=after[0],
+                low_stock_threshold=after[1],
+                created_at=now,
+            ))
+    if events:
+        LowStockEvent.objects.bulk_create(events)
+
+
+def dispatch_pending_events(batch_size: int = DISPATCH_BATCH_SIZE) -> int:
+    """
+    Number up to ``batch_size`` pending events, oldest first, in one transaction.
+
+    Dispatchers are serialized (an advisory lock on PostgreSQL), so
+    sequence numbers become visible in increasing order and a subscriber
+    reading past sequence N can never later miss an event below it.
+
+    Returns:
+        Number of events dispatched; 0 once none are pending
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [DISPATCH_LOCK_KEY])
+        pending = list(
+            LowStockEvent.objects.filter(sequence__isnull=True)
+            .order_by('id').only('id')[:batch_size]
+        )
+        if not pending:
+            return 0
+        last = LowStockEvent.objects.aggregate(last=Max('sequence'))['last'] or 0
+        now = timezone.now()
+        for offset, event in enumerate(pending, start=1):
+            event.sequence = last + offset
+            event.dispatched_at = now
+        LowStockEvent.objects.bulk_update(pending, ['sequence', 'dispatched_at'])
+    low_stock_feed.notify(last + len(pending))
+    return len(pending)
+
+
+def purge_dispatched_events(batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete up to ``batch_size`` events dispatched longer than
+    INVENTORY_EVENTS_RETENTION seconds ago.
+
+    The latest event is always kept: the next dispatch numbers on from it.
+
+    Returns:
+        Number of events deleted
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.INVENTORY_EVENTS_RETENTION)
+    last = LowStockEvent.objects.aggregate(last=Max('sequence'))['last']
+    if last is None:
+        return 0
+    ids = list(
+        LowStockEvent.objects.filter(sequence__lt=last, dispatched_at__lt=cutoff)
+        .order_by('sequence').values_list('id', flat=True)[:batch_size]
+    )
+    return LowStockEvent.objects.filter(id__in=ids).delete()[0] if ids else 0
+
+
+def events_after(sequence: int, limit: int = DISPATCH_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Dispatched events after ``sequence``, in order."""
+    tz = timezone.get_current_timezone()
+    return [
+        {
+            'sequence': row['sequence'],
+            'product_id': row['product_id'],
+            'transition': row['transition'],
+            'stock_quantity': row['stock_quantity'],
+            'low_stock_threshold': row['low_stock_threshold'],
+            'created_at': format_datetime(row['created_at'], tz),
+        }
+        for row in LowStockEvent.objects.filter(sequence__gt=sequence)
+        .order_by('sequence')
+        .values('sequence', 'product_id', 'transition', 'stock_quantity',
+                'low_stock_threshold', 'created_at')[:limit]
+    ]
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """One Server-Sent Events message; ``id`` lets clients resume with Last-Event-ID."""
+    data = json.dumps(event, separators=(',', ':'))
+    return f"id: {event['sequence']}\nevent: low-stock\ndata: {data}\n\n"
+
+
+# Seconds between SSE comments keeping idle connections open through proxies
+KEEPALIVE_SECONDS = 15
+# Milliseconds EventSource clients wait before reconnecting
+RETRY_MS = 1000
+
+
+def stream_events(after: int, seconds: float) -> Iterator[str]:
+    """
+    SSE messages for events after ``after`` for up to ``seconds``.
+
+    Ends after ``seconds`` so workers are handed back; EventSource clients
+    reconnect on their own, sending the last id as Last-Event-ID.
+    """
+    deadline = time.monotonic() + seconds
+    yield f"retry: {RETRY_MS}\n\n"
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        latest = low_stock_feed.wait(after, min(remaining, KEEPALIVE_SECONDS))
+        if latest <= after:
+            yield ": keepalive\n\n"
+            continue
+        events = events_after(after)
+        for event in events:
+            yield format_sse(event)
+        # Nothing read: the events up to ``latest`` were purged
+        after = events[-1]['sequence'] if events else latest
+
+
+async def astream_events(after: int, seconds: float) -> AsyncIterator[str]:
+    """stream_events for ASGI, which must not buffer a sync iterator."""
+    deadline = time.monotonic() + seconds
+    yield f"retry: {RETRY_MS}\n\n"
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        latest = await sync_to_async(low_stock_feed.wait, thread_sensitive=False)(
+            after, min(remaining, KEEPALIVE_SECONDS)
+        )
+        if latest <= after:
+            yield ": keepalive\n\n"
+            continue
+        events = await sync_to_async(events_after)(after)
+        for event in events:
+            yield format_sse(event)
+        after = events[-1]['sequence'] if events else latest
+
+
+class EventFeed:
+    """
+    Per-process view of the latest dispatched sequence.
+
+    Waiting subscribers share one poll: whichever wakes up when the last
+    poll is stale runs it and wakes the others. There is no background
+    thread, so an idle process runs no queries at all.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._latest: Optional[int] = None
+        self._polled_at = float('-inf')
+        self._polling = False
+
+    def _poll(self) -> int:
+        return LowStockEvent.objects.aggregate(last=Max('sequence'))['last'] or 0
+
+    def notify(self, sequence: int) -> None:
+        """Record a sequence dispatched by this process and wake its subscribers."""
+        with self._condition:
+            if self._latest is None or sequence > self._latest:
+                self._latest = sequence
+                self._condition.notify_all()
+
+    def latest(self) -> int:
+        """The latest dispatched sequence, polling unless a poll is fresh."""
+        with self._condition:
+            if self._latest is not None and time.monotonic() - self._polled_at < self.poll_interval:
+                return self._latest
+        latest = self._poll()
+        with self._condition:
+            self._polled_at = time.monotonic()
+        self.notify(latest)
+        return max(latest, self._latest or 0)
+
+    def reset(self) -> None:
+        """Forget what this process has seen (e.g. between tests)."""
+        with self._condition:
+            self._latest = None
+            self._polled_at = float('-inf')
+
+    def wait(self, after: int, timeout: float) -> int:
+        """
+        Block until an event after ``after`` is dispatched or ``timeout`` seconds pass.
+
+        Returns:
+            The latest dispatched sequence known to this process
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while True:
+                    if self._latest is not None and self._latest > after:
+                        return self._latest
+                    now = time.monotonic()
+                    if not self._polling and now - self._polled_at >= self.poll_interval:
+                        self._polling = True
+                        break
+                    if now >= deadline:
+                        return self._latest or 0
+                    wake = deadline if self._polling else self._polled_at + self.poll_interval
+                    self._condition.wait(max(min(wake, deadline) - now, 0.001))
+            latest = None
+            try:
+                latest = self._poll()
+            finally:
+                with self._condition:
+                    self._polling = False
+                    self._polled_at = time.monotonic()
+                    if latest is not None and (self._latest is None or latest > self._latest):
+                        self._latest = latest
+                    self._condition.notify_all()
+            if self._latest is not None and self._latest > after or time.monotonic() >= deadline:
+                return self._latest or 0
+
+
+low_stock_feed = EventFeed(settings.INVENTORY_EVENTS_POLL_MS / 1000)
@@ -10,6 +10,32 @@ class InsufficientStockException(InventoryException):
     """Raised when trying to reduce stock below available quantity."""
     pass
 
+class BulkAdjustmentError(InventoryException):
+    """Raised when an all-or-nothing bulk adjustment has failing items."""
+
+    def __init__(self, failures):
+        super().__init__(f"{len(failures)} stock adjustments failed")
+        self.failures = failures
+
+class ReservationError(InventoryException):
+    """Raised when a stock reservation is no longer active."""
+    pass
+
+class ShardedStockError(InventoryException):
+    """Raised when an operation cannot be applied to sharded stock."""
+    pass
+
+class PreconditionFailedError(InventoryException):
+    """Raised when a product no longer has the version an If-Match named."""
+    pass
+
+class ImportFormatError(InventoryException):
+    """Raised when import input cannot be decoded or parsed at all."""
+
+    def __init__(self, message, line):
+        super().__init__(message)
+        self.line = line
+
 def custom_exception_handler(exc, context):
     """Custom exception handler for inventory exceptions."""
     response = exception_handler(exc, context)
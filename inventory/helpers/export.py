@@ -0,0 +1,142 @@
+"""
+Helper functions for streaming catalog exports.
+"""
+
+import csv
+import json
+from typing import AsyncIterator, Iterator, Sequence
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import Product
+
+# Same columns, in the same order, as ProductSerializer
+EXPORT_COLUMNS = [
+    'id', 'name', 'description', 'stock_quantity', 'low_stock_threshold',
+    'is_active', 'is_low_stock', 'created_at', 'updated_at',
+]
+_SOURCE_FIELDS = [
+    'id', 'name', 'description', 'stock_quantity', 'low_stock_threshold',
+    'is_active', 'created_at', 'updated_at',
+]
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def format_datetime(value, tz=None) -> str:
+    """
+    Render a datetime exactly like DRF's ISO 8601 DateTimeField.
+
+    Pass ``tz`` when formatting many values; looking up the current
+    timezone costs more than the formatting itself.
+    """
+    value = value.astimezone(tz or timezone.get_current_timezone()).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _iter_chunks(rows, chunk_size: int) -> Iterator[tuple]:
+    """Stream ``values_list`` rows ordered by id, first column the id."""
+    if not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        yield from rows.iterator(chunk_size=chunk_size)
+        return
+    last = None
+    while True:
+        page = rows if last is None else rows.filter(id__gt=last)
+        chunk = list(page[:chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[-1][0]
+
+
+def iter_product_rows(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Yield every product as a tuple in EXPORT_COLUMNS order.
+
+    Rows come from a server-side cursor inside a single read-only
+    transaction, so memory stays flat and the export is one consistent
+    snapshot however long the client takes to read it. With server-side
+    cursors disabled (PgBouncer transaction pooling) the same transaction
+    is read in primary key ranges of ``chunk_size`` rows instead.
+    """
+    outermost = not connection.in_atomic_block
+    tz = timezone.get_current_timezone()
+    with transaction.atomic():
+        if outermost and connection.vendor == 'postgresql':
+            # Must be the first statement of the transaction
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY'
+                )
+        rows = Product.objects.order_by('id').values_list(*_SOURCE_FIELDS)
+        for (pk, name, description, stock, threshold, active,
+             created_at, updated_at) in _iter_chunks(rows, chunk_size):
+            yield (
+                pk, name, description, stock, threshold, active,
+                stock <= threshold,
+                format_datetime(created_at, tz), format_datetime(updated_at, tz),
+            )
+
+
+class _Echo:
+    """File-like object handing each written line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines: Iterator[str], size: int) -> Iterator[str]:
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def stream_csv(rows: Iterator[Sequence], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """CSV with a header row, emitted in chunks of ``chunk_size`` lines."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    lines = (
+        writer.writerow([
+            str(value).lower() if isinstance(value, bool) else value
+            for value in row
+        ])
+        for row in rows
+    )
+    yield from _batched(lines, chunk_size)
+
+
+def stream_ndjson(rows: Iterator[Sequence], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """One JSON object per line, emitted in chunks of ``chunk_size`` lines."""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    lines = (dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in rows)
+    yield from _batched(lines, chunk_size)
+
+
+async def aiter_chunks(chunks: Iterator[str]) -> AsyncIterator[str]:
+    """
+    Hand a sync export stream to ASGI one chunk at a time.
+
+    Django 4.2 buffers a sync iterator given to an ASGI response into a
+    list first. Each chunk is instead pulled on the request's
+    thread-sensitive thread, which keeps the export's transaction and
+    cursor on one connection, so memory stays flat under ASGI too. The
+    stream is closed (ending its transaction) if the client goes away.
+    """
+    pull = sync_to_async(next)
+    try:
+        while True:
+            chunk = await pull(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
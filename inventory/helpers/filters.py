@@ -0,0 +1,107 @@
+"""
+Helper filters for the product list.
+
+Every filter is written so it can be answered from an index:
+
+- ``search`` (substring of name or description) and ``name_prefix`` use
+  the trigram GIN indexes on ``UPPER(name)`` and ``UPPER(description)``
+  (PostgreSQL; other backends fall back to a scan)
+- ``is_active`` uses the (is_active, name, id) index, which also serves
+  the list's name ordering
+- ``low_stock`` uses the partial stock headroom index
+- ``min_stock`` / ``max_stock`` use the stock_quantity index
+"""
+
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .responses import query_params
+
+# Trigrams need three characters; shorter substrings would read the whole index
+MIN_SEARCH_LENGTH = 3
+
+TRUE_VALUES = {'true', '1', 'yes'}
+FALSE_VALUES = {'false', '0', 'no'}
+
+
+def _boolean(params, name):
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({name: "Must be true or false"})
+
+
+def _non_negative_int(params, name):
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer"})
+    if number < 0:
+        raise ValidationError({name: "Must not be negative"})
+    return number
+
+
+def filter_products(queryset, params):
+    """
+    Apply the product list query parameters to ``queryset``.
+
+    Works on model and ``.values()`` querysets alike.
+
+    Raises:
+        ValidationError: If a parameter is malformed
+    """
+    search = params.get('search', '').strip()
+    if search:
+        if len(search) < MIN_SEARCH_LENGTH:
+            raise ValidationError(
+                {'search': f"Must be at least {MIN_SEARCH_LENGTH} characters"}
+            )
+        queryset = queryset.filter(
+            Q(name__icontains=search) | Q(description__icontains=search)
+        )
+
+    name_prefix = params.get('name_prefix', '').strip()
+    if name_prefix:
+        queryset = queryset.filter(name__istartswith=name_prefix)
+
+    is_active = _boolean(params, 'is_active')
+    if is_active is not None:
+        queryset = queryset.filter(is_active=is_active)
+
+    low_stock = _boolean(params, 'low_stock')
+    if low_stock is True:
+        queryset = queryset.low_stock()
+    elif low_stock is False:
+        # The complement of low_stock(): inactive products are never low
+        # stock, so they are listed here whatever their stock. Same headroom
+        # expression, so the planner can reuse its statistics
+        queryset = queryset.alias(
+            stock_headroom=F('stock_quantity') - F('low_stock_threshold')
+        ).filter(Q(is_active=False) | Q(stock_headroom__gt=0))
+
+    min_stock = _non_negative_int(params, 'min_stock')
+    max_stock = _non_negative_int(params, 'max_stock')
+    if min_stock is not None and max_stock is not None and min_stock > max_stock:
+        raise ValidationError({'min_stock': "Must not exceed max_stock"})
+    if min_stock is not None:
+        queryset = queryset.filter(stock_quantity__gte=min_stock)
+    if max_stock is not None:
+        queryset = queryset.filter(stock_quantity__lte=max_stock)
+
+    return queryset
+
+
+class ProductFilterBackend(BaseFilterBackend):
+    """DRF filter backend applying filter_products to list views."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_products(queryset, query_params(request))
@@ -0,0 +1,133 @@
+"""
+Helper functions for idempotent write endpoints.
+
+A client that sends an ``Idempotency-Key`` header may retry the request
+as often as it likes: the first response that commits is stored together
+with the change it describes, and every later request with the same key
+gets that response back without running the view again.
+"""
+
+import functools
+import hashlib
+import json
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+PURGE_BATCH_SIZE = 5000
+
+
+def request_fingerprint(request) -> str:
+    """SHA-256 over the method, path and parsed body of ``request``."""
+    raw = json.dumps(
+        [request.method, request.path, request.data],
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _find_key(key: str) -> Optional[IdempotencyKey]:
+    return IdempotencyKey.objects.filter(key=key, expires_at__gt=timezone.now()).first()
+
+
+def _replay(record: IdempotencyKey, fingerprint: str) -> Response:
+    if record.fingerprint != fingerprint:
+        return Response(
+            {'error': f'{IDEMPOTENCY_HEADER} was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(
+        record.response_body,
+        status=record.response_status,
+        headers={REPLAYED_HEADER: 'true'}
+    )
+
+
+def idempotent(view_func):
+    """
+    Make a DRF function view honour the ``Idempotency-Key`` header.
+
+    Apply it below ``@api_view``. The view and the key insert share one
+    transaction, so the stored response commits if and only if the change
+    does. A concurrent duplicate blocks on the key's unique index, rolls
+    its own work back and replays the winner. Server errors (5xx) are not
+    stored, so the client can retry them. Requests without the header
+    run unchanged.
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_func(request, *args, **kwargs)
+        max_length = IdempotencyKey._meta.get_field('key').max_length
+        if len(key) > max_length:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} must be at most {max_length} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fingerprint = request_fingerprint(request)
+        record = _find_key(key)
+        if record is not None:
+            return _replay(record, fingerprint)
+
+        try:
+            with transaction.atomic():
+                response = view_func(request, *args, **kwargs)
+                if response.status_code < 500:
+                    now = timezone.now()
+                    # An expired row keeps its unique key until purged
+                    IdempotencyKey.objects.filter(key=key, expires_at__lte=now).delete()
+                    IdempotencyKey.objects.create(
+                        key=key,
+                        fingerprint=fingerprint,
+                        response_status=response.status_code,
+                        response_body=response.data,
+                        created_at=now,
+                        expires_at=now + timedelta(seconds=settings.INVENTORY_IDEMPOTENCY_KEY_TTL),
+                    )
+        except IntegrityError:
+            # A concurrent request with this key committed first
+            record = _find_key(key)
+            if record is None:
+                raise
+            return _replay(record, fingerprint)
+
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys(batch_size: int = PURGE_BATCH_SIZE, progress=None) -> int:
+    """
+    Delete expired idempotency keys, ``batch_size`` rows per statement.
+
+    Each batch commits on its own, so the purge never holds locks on a
+    large part of the table. ``progress`` is called with the running total
+    after every batch.
+
+    Returns:
+        Number of keys deleted
+    """
+    cutoff = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=cutoff)
+            .order_by('expires_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
+        if progress is not None:
+            progress(deleted)
@@ -0,0 +1,369 @@
+"""
+Helper functions for bulk product imports.
+
+Input is streamed row by row and upserted on the unique product name in
+batches, one transaction per batch.
+
+The existing products of a batch are locked first, in primary key order.
+New names are then inserted with INSERT ... ON CONFLICT DO NOTHING; a
+name another transaction inserted in the meantime is locked and treated
+as existing. Existing products are updated in one statement: on
+PostgreSQL the batch is COPY'd into a transaction-scoped staging table
+and merged with INSERT ... ON CONFLICT, other backends use
+bulk_create(update_conflicts=True).
+
+A new stock_quantity is only taken for unsharded products and when it
+still covers the stock held by reservations and locations; otherwise the
+row's other fields are updated and its stock is kept (and reported).
+Stock changes and the opening stock of new products are recorded in the
+movement ledger like any other adjustment, and every row that moves a
+product into or out of low stock (by stock, threshold or is_active)
+records a low-stock event.
+"""
+
+import csv
+import io
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Product, StockMovement
+from .cache import invalidate_inventory_summary, product_cache
+from .events import record_low_stock_transitions
+from .exceptions import ImportFormatError
+from .stock_shards import lock_shard_total, shard_total
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_FIELDS = ['name', 'description', 'stock_quantity', 'low_stock_threshold', 'is_active']
+# Positions in a cleaned row
+NAME, STOCK, THRESHOLD, ACTIVE = 0, 2, 3, 4
+UPDATE_FIELDS = ['description', 'stock_quantity', 'low_stock_threshold', 'is_active', 'updated_at']
+DEFAULT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+_TRUE = {'1', 'true', 't', 'yes', 'y'}
+_FALSE = {'0', 'false', 'f', 'no', 'n'}
+
+
+def decode_lines(lines: Iterable[bytes], encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Decode raw input lines.
+
+    Raises:
+        ImportFormatError: Naming the first line that is not valid ``encoding``
+    """
+    for number, line in enumerate(lines, 1):
+        try:
+            yield line.decode(encoding)
+        except UnicodeDecodeError:
+            raise ImportFormatError(f"Line {number} is not valid {encoding}", number)
+
+
+def read_rows(lines: Iterable[str], import_format: str) -> Iterator[Dict[str, Any]]:
+    """
+    Parse an iterable of text lines as CSV (with header) or NDJSON.
+
+    Raises:
+        ImportFormatError: If the CSV is malformed
+    """
+    if import_format == 'csv':
+        reader = csv.DictReader(lines)
+        try:
+            yield from reader
+        except csv.Error as exc:
+            # DictReader.line_num lags behind on a failed row; its reader's does not
+            line = reader.reader.line_num
+            raise ImportFormatError(f"Line {line}: {exc}", line)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line  # rejected by clean_row, without aborting the import
+
+
+def _non_negative_int(value, field: str, default: int) -> int:
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer")
+    if number < 0:
+        raise ValueError(f"{field} cannot be negative")
+    return number
+
+
+def _boolean(value, default: bool = True) -> bool:
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError("is_active must be a boolean")
+
+
+def clean_row(raw: Dict[str, Any]) -> tuple:
+    """
+    Validate one input row against the Product field rules.
+
+    Returns:
+        Tuple of values in IMPORT_FIELDS order
+
+    Raises:
+        ValueError: If the row is invalid
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("row must be a JSON object")
+    name = str(raw.get('name') or '').strip()
+    if not name:
+        raise ValueError("name is required")
+    if len(name) > Product._meta.get_field('name').max_length:
+        raise ValueError("name is too long")
+    return (
+        name,
+        str(raw.get('description') or ''),
+        _non_negative_int(raw.get('stock_quantity'), 'stock_quantity', 0),
+        _non_negative_int(raw.get('low_stock_threshold'), 'low_stock_threshold', 10),
+        _boolean(raw.get('is_active')),
+    )
+
+
+def _default_columns(now) -> Tuple[List[str], List[Any]]:
+    """Columns the import does not set, with their model defaults."""
+    qn = connection.ops.quote_name
+    columns, params = [], []
+    for field in Product._meta.concrete_fields:
+        if field.primary_key or field.name in IMPORT_FIELDS:
+            continue
+        columns.append(qn(field.column))
+        params.append(now if field.name in ('created_at', 'updated_at') else field.get_default())
+    return columns, params
+
+
+def _insert_new(batch: List[tuple], now) -> Dict[str, int]:
+    """
+    Insert rows whose names do not exist yet, skipping names that do.
+
+    Returns:
+        ``{name: id}`` of the products this call created
+    """
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        extra_columns, extra_params = _default_columns(now)
+        types = ['varchar[]', 'text[]', 'integer[]', 'integer[]', 'boolean[]']
+        columns = [qn(name) for name in IMPORT_FIELDS]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(Product._meta.db_table)} "
+                f"({', '.join(columns + extra_columns)}) "
+                f"SELECT *, {', '.join(['%s'] * len(extra_columns))} "
+                f"FROM unnest({', '.join(f'%s::{t}' for t in types)}) "
+                f"ON CONFLICT ({qn('name')}) DO NOTHING "
+                f"RETURNING {qn('name')}, {qn('id')}",
+                extra_params + [list(column) for column in zip(*batch)]
+            )
+            return dict(cursor.fetchall())
+
+    # ignore_conflicts cannot say which rows it inserted; these backends
+    # serialize writers, so no name can have appeared since it was looked up
+    Product.objects.bulk_create(
+        [Product(**dict(zip(IMPORT_FIELDS, row))) for row in batch], ignore_conflicts=True
+    )
+    return dict(
+        Product.objects.filter(name__in=[row[NAME] for row in batch]).values_list('name', 'id')
+    )
+
+
+def _copy_upsert(batch: List[tuple], now) -> None:
+    """COPY a batch into a staging table and merge it in one statement."""
+    qn = connection.ops.quote_name
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for seq, row in enumerate(batch):
+        writer.writerow((seq,) + row)
+    buffer.seek(0)
+
+    extra_columns, extra_params = _default_columns(now)
+    columns = [qn(name) for name in IMPORT_FIELDS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE inventory_product_import ("
+            "seq integer, name varchar(255), description text, "
+            "stock_quantity integer, low_stock_threshold integer, is_active boolean"
+            ") ON COMMIT DROP"
+        )
+        cursor.copy_expert(
+            "COPY inventory_product_import FROM STDIN "
+            "WITH (FORMAT csv, FORCE_NOT_NULL (description))", buffer
+        )
+        # DISTINCT ON keeps the last occurrence of a name within the batch;
+        # ON CONFLICT cannot touch the same row twice in one statement.
+        cursor.execute(
+            f"INSERT INTO {qn(Product._meta.db_table)} "
+            f"({', '.join(columns + extra_columns)}) "
+            f"SELECT {', '.join(columns)}, {', '.join(['%s'] * len(extra_columns))} "
+            f"FROM (SELECT DISTINCT ON (name) * FROM inventory_product_import "
+            f"ORDER BY name, seq DESC) AS staged "
+            f"ON CONFLICT ({qn('name')}) DO UPDATE SET "
+            + ', '.join(f"{qn(name)} = EXCLUDED.{qn(name)}" for name in UPDATE_FIELDS),
+            extra_params
+        )
+        # ON COMMIT DROP does not fire when nested in an outer transaction
+        cursor.execute("DROP TABLE inventory_product_import")
+
+
+def _bulk_create_upsert(batch: List[tuple]) -> None:
+    Product.objects.bulk_create(
+        [Product(**dict(zip(IMPORT_FIELDS, row))) for row in batch],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=UPDATE_FIELDS,
+    )
+
+
+class ProductImporter:
+    """Stream rows into the catalog in batches and keep throughput stats."""
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.rows = 0
+        self.imported = 0
+        self.errors = []
+        self.stock_rejected = []
+        self.started = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        return {
+            'rows': self.rows,
+            'imported': self.imported,
+            'skipped': self.rows - self.imported,
+            'errors': self.errors,
+            'stock_rejected': self.stock_rejected,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.imported / elapsed) if elapsed else 0,
+        }
+
+    def run(self, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Import ``rows``, committing one transaction per batch."""
+        self.started = time.perf_counter()
+        batch = []
+        for raw in rows:
+            self.rows += 1
+            try:
+                batch.append((self.rows, clean_row(raw)))
+            except ValueError as exc:
+                if len(self.errors) < MAX_REPORTED_ERRORS:
+                    self.errors.append({'row': self.rows, 'error': str(exc)})
+                continue
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+        return self.stats
+
+    def _reject_stock(self, row_number: int, error: str) -> None:
+        if len(self.stock_rejected) < MAX_REPORTED_ERRORS:
+            self.stock_rejected.append({'row': row_number, 'error': error})
+
+    @staticmethod
+    def _lock(names) -> Dict[str, tuple]:
+        """Lock existing products by name, in primary key order."""
+        return {
+            name: state for name, *state in
+            Product.objects.select_for_update()
+            .filter(name__in=names)
+            .order_by('id')
+            .values_list(
+                'name', 'id', 'stock_quantity',
+                F('reserved_quantity') + F('located_quantity'), 'stock_shards',
+                'low_stock_threshold', 'is_active'
+            )
+        }
+
+    def _flush(self, batch: List[tuple]) -> None:
+        """Upsert ``(row number, cleaned row)`` pairs in one transaction."""
+        # A name repeated within the batch keeps its last occurrence
+        unique = {row[NAME]: (row_number, row) for row_number, row in batch}
+        with transaction.atomic():
+            existing = self._lock(unique)
+            # Stamped once the existing rows are locked (see helpers/sync.py)
+            now = timezone.now()
+            new = [row for name, (_, row) in unique.items() if name not in existing]
+            created = _insert_new(new, now) if new else {}
+            if len(created) < len(new):
+                # Inserted by a concurrent import since the lock above
+                existing.update(self._lock(
+                    row[NAME] for row in new if row[NAME] not in created
+                ))
+
+            rows, changes, transitions = [], [], []
+            for name, (row_number, row) in unique.items():
+                if name in created:
+                    if row[STOCK]:
+                        # Opening stock
+                        changes.append((created[name], row[STOCK], row[STOCK]))
+                    transitions.append(
+                        (created[name], None, (row[STOCK], row[THRESHOLD], row[ACTIVE]))
+                    )
+                    continue
+                product_id, stock, held, shards, threshold, is_active = existing[name]
+                if row[STOCK] != stock:
+                    if shards:
+                        error = "stock of a sharded product can only change through stock adjustments"
+                    elif row[STOCK] < held:
+                        error = f"stock_quantity cannot drop below the {held} units held by reservations and locations"
+                    else:
+                        error = None
+                        changes.append((product_id, row[STOCK] - stock, row[STOCK]))
+                    if error:
+                        self._reject_stock(row_number, error)
+                        row = row[:STOCK] + (stock,) + row[STOCK + 1:]
+                # Threshold and is_active changes can cross too; a sharded
+                # product's low stock status follows its live shard total
+                if shards:
+                    lock_shard_total(product_id)
+                    before = after = shard_total(product_id)
+                else:
+                    before, after = stock, row[STOCK]
+                transitions.append((
+                    product_id, (before, threshold, is_active), (after, row[THRESHOLD], row[ACTIVE])
+                ))
+                rows.append(row)
+
+            if rows and connection.vendor == 'postgresql':
+                _copy_upsert(rows, now)
+            elif rows:
+                _bulk_create_upsert(rows)
+            record_low_stock_transitions(transitions, now)
+            if changes:
+                StockMovement.objects.bulk_create([
+                    StockMovement(
+                        product_id=product_id,
+                        delta=delta,
+                        quantity_after=quantity_after,
+                        reason=StockMovement.Reason.IMPORT,
+                        created_at=now,
+                    )
+                    for product_id, delta, quantity_after in changes
+                ])
+            invalidate_inventory_summary()
+            product_cache.invalidate_all()
+        self.imported += len(batch)
+        if self.progress:
+            self.progress(self.stats)
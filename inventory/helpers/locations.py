@@ -0,0 +1,91 @@
+"""
+Helper functions for per-location stock.
+
+A product's stock can be split over locations (LocationStock rows). The
+Product row keeps the precomputed total in stock_quantity, and the part
+of it held at locations in located_quantity; the rest is unassigned
+stock, which the product-level endpoints and reservations work on.
+
+Each function changes one LocationStock row with a single statement,
+whose row lock lasts until the caller's transaction ends. Callers take
+these locks before the Product row, and a product's rows in
+``location_id`` order, so concurrent transfers cannot deadlock.
+"""
+
+from typing import Optional
+
+from django.db import connection
+from django.db.models import F
+
+from ..models import Location, LocationStock
+
+
+def add_location_stock(product_id: int, location_id: int, quantity: int) -> Optional[int]:
+    """
+    Add ``quantity`` to a product's stock at an active location.
+
+    The row is created on first use. On PostgreSQL one INSERT ... ON
+    CONFLICT checks the location, creates or locks the row and returns
+    the new quantity.
+
+    Returns:
+        The quantity now at the location, or None when the location does
+        not exist or is inactive
+    """
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        table = qn(LocationStock._meta.db_table)
+        quantity_column = qn('quantity')
+        sql = (
+            f"INSERT INTO {table} AS s ({qn('product_id')}, {qn('location_id')}, {quantity_column}) "
+            f"SELECT %s, l.{qn('id')}, %s FROM {qn(Location._meta.db_table)} AS l "
+            f"WHERE l.{qn('id')} = %s AND l.{qn('is_active')} "
+            f"ON CONFLICT ({qn('product_id')}, {qn('location_id')}) DO UPDATE "
+            f"SET {quantity_column} = s.{quantity_column} + EXCLUDED.{quantity_column} "
+            f"RETURNING s.{quantity_column}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [product_id, quantity, location_id])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    if not Location.objects.filter(id=location_id, is_active=True).exists():
+        return None
+    row, _ = LocationStock.objects.select_for_update().get_or_create(
+        product_id=product_id, location_id=location_id
+    )
+    LocationStock.objects.filter(id=row.id).update(quantity=F('quantity') + quantity)
+    return row.quantity + quantity
+
+
+def take_location_stock(product_id: int, location_id: int, quantity: int) -> Optional[int]:
+    """
+    Remove ``quantity`` from a product's stock at a location in one conditional UPDATE.
+
+    Inactive locations can still be drained.
+
+    Returns:
+        The quantity left at the location, or None when it holds less
+        than ``quantity`` (or no row exists)
+    """
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        quantity_column = qn('quantity')
+        sql = (
+            f"UPDATE {qn(LocationStock._meta.db_table)} "
+            f"SET {quantity_column} = {quantity_column} - %s "
+            f"WHERE {qn('product_id')} = %s AND {qn('location_id')} = %s "
+            f"AND {quantity_column} >= %s "
+            f"RETURNING {quantity_column}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [quantity, product_id, location_id, quantity])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    rows = LocationStock.objects.filter(
+        product_id=product_id, location_id=location_id, quantity__gte=quantity
+    )
+    if not rows.update(quantity=F('quantity') - quantity):
+        return None
+    return LocationStock.objects.get(product_id=product_id, location_id=location_id).quantity
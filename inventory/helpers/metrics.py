@@ -0,0 +1,224 @@
+"""
+Helper classes for in-process request metrics.
+
+Per-route latency, DB query count, DB time and serialization time are
+collected into fixed-bucket histograms and rendered in the Prometheus text
+exposition format. Each worker process keeps its own registry; Prometheus
+sums the workers when scraping them individually.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class RequestStats:
+    """DB and serialization totals of the request being handled."""
+
+    __slots__ = ('queries', 'db_seconds', 'serialization_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+
+# Copied into sync_to_async threads, so async ORM queries are counted too
+current_request: ContextVar[Optional[RequestStats]] = ContextVar('current_request', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, safe across threads."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...],
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), then sum
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            series = [(labels, counts[:], total) for labels, (counts, total) in self._series.items()]
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total in sorted(series):
+            label_text = _format_labels(self.labelnames, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    self.labelnames + ('le',), labels + (_format_value(bound),)
+                )
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """Monotonic counter per label set."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for labels, value in values:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def gauge_lines(name: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], float]],
+                kind: str = 'gauge') -> List[str]:
+    """Exposition lines for values read at scrape time (pool sizes etc.)."""
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} {kind}']
+    for labels, value in samples:
+        lines.append(
+            f'{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}'
+        )
+    return lines
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+ROUTE_LABELS = ('method', 'route')
+
+request_duration = Histogram(
+    'inventory_request_duration_seconds', 'Request latency by route.', ROUTE_LABELS
+)
+request_queries = Histogram(
+    'inventory_request_db_queries', 'Database queries per request by route.',
+    ROUTE_LABELS, QUERY_COUNT_BUCKETS
+)
+request_db_time = Histogram(
+    'inventory_request_db_seconds', 'Time spent in database queries per request by route.',
+    ROUTE_LABELS
+)
+request_serialization_time = Histogram(
+    'inventory_request_serialization_seconds',
+    'Time spent serializing products per request by route.', ROUTE_LABELS
+)
+requests_total = Counter(
+    'inventory_requests_total', 'Requests by route and status code.', ROUTE_LABELS + ('status',)
+)
+
+REQUEST_METRICS = (
+    request_duration, request_queries, request_db_time, request_serialization_time,
+    requests_total,
+)
+
+
+def record_request(method: str, route: str, status: int, seconds: float,
+                   stats: RequestStats) -> None:
+    labels = (method, route)
+    request_duration.observe(labels, seconds)
+    request_queries.observe(labels, stats.queries)
+    request_db_time.observe(labels, stats.db_seconds)
+    request_serialization_time.observe(labels, stats.serialization_seconds)
+    requests_total.inc(labels + (str(status),))
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    ``connection.execute_wrapper`` hook adding each query to the current request.
+
+    Queries outside a request (commands, background threads) pass straight
+    through.
+    """
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    """
+    ``connection_created`` receiver that installs ``record_query`` once.
+
+    A connection wrapper lives for its thread (and across pooled reconnects),
+    so the hook stays installed instead of being pushed per request. It goes
+    first so ``execute_wrapper()`` blocks entered later still pop their own.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def add_serialization_time(seconds: float) -> None:
+    stats = current_request.get()
+    if stats is not None:
+        stats.serialization_seconds += seconds
+
+
+def render_metrics(*extra: List[str]) -> str:
+    """Every request metric plus ``extra`` exposition lines, as one text page."""
+    lines = []
+    for metric in REQUEST_METRICS:
+        lines.extend(metric.collect())
+    for block in extra:
+        lines.extend(block)
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics() -> None:
+    """Drop every recorded series (used by tests)."""
+    for metric in REQUEST_METRICS:
+        metric.clear()
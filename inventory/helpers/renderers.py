@@ -0,0 +1,52 @@
+"""
+Helper renderers for large read responses.
+"""
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to DRF's json.dumps renderer
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Output is byte-for-byte what DRF's compact renderer produces for the
+    same data. Datetimes and anything orjson does not know natively go
+    through DRF's encoder; ASCII-only, indented or non-compact output is
+    left to the parent class.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers wider than 64 bits, or non-string dict keys
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+def render_json_response(data, status: int = 200) -> HttpResponse:
+    """
+    Plain Django response with the bytes a DRF Response would render.
+
+    For views that bypass DRF (e.g. async views) but must answer exactly
+    like their DRF counterparts.
+    """
+    renderer = FastJSONRenderer()
+    return HttpResponse(renderer.render(data), content_type=renderer.media_type, status=status)
@@ -2,12 +2,20 @@
 Helper module for standardized API responses and pagination.
 """
 
+import base64
+import binascii
+import json
 import logging
+from datetime import datetime
 from typing import Dict, Any
 
+from django.db import connections
+from django.db.models import Q
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,27 +25,35 @@ class APIResponse:
     """Standardized API response formatter"""
 
     @staticmethod
-    def success(data: Any = None, message: str = "Success", status_code: int = status.HTTP_200_OK) -> Response:
-        """Format successful response"""
-        response_data = {
+    def success_payload(data: Any = None, message: str = "Success") -> Dict[str, Any]:
+        """Body of a successful response"""
+        return {
             "success": True,
             "message": message,
             "data": data,
             "error": None
         }
-        return Response(response_data, status=status_code)
 
     @staticmethod
-    def error(message: str, error_details: Any = None, status_code: int = status.HTTP_400_BAD_REQUEST) -> Response:
-        """Format error response"""
-        response_data = {
+    def success(data: Any = None, message: str = "Success", status_code: int = status.HTTP_200_OK) -> Response:
+        """Format successful response"""
+        return Response(APIResponse.success_payload(data, message), status=status_code)
+
+    @staticmethod
+    def error_payload(message: str, error_details: Any = None) -> Dict[str, Any]:
+        """Body of an error response"""
+        return {
             "success": False,
             "message": message,
             "data": None,
             "error": error_details
         }
+
+    @staticmethod
+    def error(message: str, error_details: Any = None, status_code: int = status.HTTP_400_BAD_REQUEST) -> Response:
+        """Format error response"""
         logger.error(f"API Error: {message} - Details: {error_details}")
-        return Response(response_data, status=status_code)
+        return Response(APIResponse.error_payload(message, error_details), status=status_code)
 
     @staticmethod
     def validation_error(serializer_errors: Dict) -> Response:
@@ -71,3 +87,168 @@ class StandardResultsSetPagination(PageNumberPagination):
             },
             message="Data retrieved successfully"
         )
+
+
+def estimate_count(queryset) -> int:
+    """Planner row estimate for a queryset; exact count off PostgreSQL."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def aestimate_count(queryset) -> int:
+    """estimate_count on the async ORM."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return await queryset.acount()
+    plan = json.loads(await queryset.order_by().aexplain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def query_params(request):
+    """Query parameters of a DRF Request or a plain Django HttpRequest."""
+    return getattr(request, 'query_params', request.GET)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination without OFFSET or COUNT(*).
+
+    ``ordering`` is a (field, unique tiebreak) pair sharing one direction.
+    The next page is selected with an index range condition on the leading
+    field, so every page costs the same no matter how deep the client is.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request)
+        self.count = self.get_count(queryset, query_params(request).get(self.count_query_param))
+        return self.finish_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset for async views, on the async ORM."""
+        window = self.get_window(queryset, request)
+        self.count = await self.aget_count(queryset, query_params(request).get(self.count_query_param))
+        return self.finish_page([item async for item in window])
+
+    def get_window(self, queryset, request):
+        """The unevaluated query for the requested page plus one lookahead row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, page):
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.next_position = self.get_position(page[-1]) if self.has_next else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            size = int(query_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_count(self, queryset, mode):
+        """
+        Count matching rows only when asked to.
+
+        ``exact`` runs COUNT(*); ``estimate`` reads the planner's row
+        estimate from EXPLAIN on PostgreSQL and falls back to an exact
+        count elsewhere.
+        """
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            return estimate_count(queryset)
+        return None
+
+    async def aget_count(self, queryset, mode):
+        if mode == 'exact':
+            return await queryset.acount()
+        if mode == 'estimate':
+            return await aestimate_count(queryset)
+        return None
+
+    def get_position_filter(self, position):
+        """Rows strictly after ``position`` in the pagination ordering."""
+        field, tiebreak = (name.lstrip('-') for name in self.ordering)
+        value, last = position
+        op = 'lt' if self.ordering[0].startswith('-') else 'gt'
+        # The leading >=/<= bound is what lets the database use an index range.
+        return Q(**{f'{field}__{op}e': value}) & (
+            Q(**{f'{field}__{op}': value}) | Q(**{f'{tiebreak}__{op}': last})
+        )
+
+    def get_position(self, item):
+        values = []
+        for name in self.ordering:
+            name = name.lstrip('-')
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        return values
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, request):
+        encoded = query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, ValueError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(position, list) or len(position) != 2:
+            raise NotFound("Invalid cursor")
+        return position
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_data(self, data):
+        return {
+            'results': data,
+            'pagination': {
+                'count': self.count,
+                'next': self.get_next_link(),
+                'page_size': self.page_size
+            }
+        }
+
+    def get_paginated_response(self, data):
+        """Match the company response format used by StandardResultsSetPagination"""
+        return APIResponse.success(
+            data=self.get_paginated_data(data),
+            message="Data retrieved successfully"
+        )
+
+
+class ProductCursorPagination(KeysetPagination):
+    """Default pagination for the product list, in catalog name order"""
+    ordering = ('name', 'id')
+
+
+class StockHistoryPagination(KeysetPagination):
+    """Newest-first pagination over a product's stock movements"""
+    page_size = 50
+    max_page_size = 500
+    ordering = ('-created_at', '-id')
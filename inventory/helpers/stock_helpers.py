@@ -53,7 +53,8 @@ def perform_stock_increase(product_id: int, quantity: int, user_id: int) -> Dict
         user_id: ID of the user making the change
 
     Returns:
-        Dict containing product data and adjustment details
+        Dict containing product data and adjustment details; ``product``
+        is None when the increase was queued by the increment buffer
 
     Raises:
         Product.DoesNotExist: If product not found
@@ -64,6 +65,9 @@ def perform_stock_increase(product_id: int, quantity: int, user_id: int) -> Dict
         quantity=quantity,
         user_id=user_id
     )
+    if product is None:
+        logger.info(f"Stock increase of {quantity} units queued for product {product_id}")
+        return {'product': None, 'adjustment': {'quantity_added': quantity, 'queued': True}}
 
     logger.info(
         f"Stock increased for product {product.name} (ID: {product_id}) "
@@ -0,0 +1,128 @@
+"""
+Helper functions for sharded stock counters.
+
+A sharded product's stock lives in StockShard rows. Each adjustment
+touches one shard picked at random among those that can absorb it, so
+concurrent writers to the same SKU mostly lock different rows.
+"""
+
+import random
+from typing import List, Optional
+
+from django.db import connection
+from django.db.models import F, Sum
+
+from ..models import StockShard
+
+# pg_advisory_xact_lock key space for per-product shard total locks (any
+# constant unique to this lock); the second key is the product ID
+SHARD_TOTAL_LOCK_KEY = 0x5AD_7074
+
+
+
+def split_evenly(total: int, shards: int) -> List[int]:
+    """Quantities for ``shards`` shards summing to ``total``, differing by at most one."""
+    base, extra = divmod(total, shards)
+    return [base + (1 if shard < extra else 0) for shard in range(shards)]
+
+
+def shard_total(product_id: int) -> int:
+    """Current stock of a sharded product, summed over its shards."""
+    return StockShard.objects.filter(product_id=product_id).aggregate(
+        total=Sum('quantity')
+    )['total'] or 0
+
+
+def lock_shard_total(product_id: int) -> None:
+    """
+    Serialize readers of a sharded product's total until the transaction ends.
+
+    Taken after the shard write, so holders never wait on a shard row
+    while holding it: each holder commits before the next one reads, and
+    the totals they read step through every committed adjustment in turn.
+    A no-op on backends without advisory locks, which serialize writers
+    anyway.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [SHARD_TOTAL_LOCK_KEY, product_id & 0x7FFF_FFFF],
+            )
+
+
+def try_shard_update(product_id: int, shards: int, delta: int) -> bool:
+    """
+    Apply ``delta`` to one shard that can absorb it, without waiting.
+
+    On PostgreSQL a single UPDATE picks a random qualifying shard with
+    FOR UPDATE SKIP LOCKED, so it never queues behind another writer.
+    Other backends probe the shards from a random starting point.
+
+    Returns:
+        False when no unlocked shard could take the whole delta
+    """
+    required = max(-delta, 0)
+
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        table = qn(StockShard._meta.db_table)
+        quantity = qn('quantity')
+        sql = (
+            f"UPDATE {table} SET {quantity} = {quantity} + %s "
+            f"WHERE {qn('id')} = ("
+            f"SELECT {qn('id')} FROM {table} "
+            f"WHERE {qn('product_id')} = %s AND {quantity} >= %s "
+            f"ORDER BY random() LIMIT 1 FOR UPDATE SKIP LOCKED)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [delta, product_id, required])
+            return cursor.rowcount == 1
+
+    start = random.randrange(shards)
+    for offset in range(shards):
+        updated = StockShard.objects.filter(
+            product_id=product_id,
+            shard=(start + offset) % shards,
+            quantity__gte=required,
+        ).update(quantity=F('quantity') + delta)
+        if updated:
+            return True
+    return False
+
+
+def spread_shard_update(product_id: int, delta: int) -> Optional[int]:
+    """
+    Apply ``delta`` across all shards while holding every shard lock.
+
+    The slow path for a decrement that no single shard can cover. Shards
+    are locked in shard order, so concurrent callers cannot deadlock. Must
+    run inside a transaction.
+
+    Returns:
+        The new total, or None when the shards together are short
+    """
+    rows = list(
+        StockShard.objects.select_for_update()
+        .filter(product_id=product_id)
+        .order_by('shard')
+    )
+    total = sum(row.quantity for row in rows)
+    if total + delta < 0:
+        return None
+
+    if delta >= 0:
+        rows[0].quantity += delta
+        changed = rows[:1]
+    else:
+        needed, changed = -delta, []
+        for row in rows:
+            taken = min(row.quantity, needed)
+            if taken:
+                row.quantity -= taken
+                needed -= taken
+                changed.append(row)
+            if not needed:
+                break
+    StockShard.objects.bulk_update(changed, ['quantity'])
+    return total + delta
@@ -0,0 +1,189 @@
+"""
+Helper functions for the product delta sync feed.
+
+Clients keep a local copy of the catalog and ask for what changed after
+an opaque cursor. Changes are product rows in ``(updated_at, id)`` order
+merged with deletion tombstones in ``(deleted_at, product_id)`` order;
+product ids are never reused, so one ``(timestamp, id)`` position orders
+both. Each page is two index range scans, so a sync costs in proportion
+to the number of changes rather than the size of the catalog.
+
+Timestamps are taken when a write runs, not when it commits, so a cursor
+must never move past a transaction that has yet to commit. Writers stamp
+updated_at once they hold their row locks. On PostgreSQL the feed stops
+before the start of the oldest writing transaction still open (one that
+holds a transaction ID or waits on a lock, per pg_stat_activity), however
+long it has been running. INVENTORY_SYNC_SETTLE_SECONDS is kept as a
+margin on top: for clock skew between the app servers and the database,
+and for the moment between a writer taking its timestamp and reaching
+the database. Other backends hold back only the settle window.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Product, ProductTombstone
+from ..serializers import PRODUCT_VALUE_FIELDS, serialize_product_rows
+from .export import format_datetime
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+PURGE_BATCH_SIZE = 5000
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that cannot be decoded."""
+
+
+class CursorExpired(Exception):
+    """Raised for a cursor older than the retained tombstones."""
+
+
+def encode_cursor(position: Tuple[datetime, int], issued_at: datetime) -> str:
+    """A position in the feed plus when it was handed out (for expiry)."""
+    updated_at, product_id = position
+    raw = json.dumps(
+        [updated_at.isoformat(), product_id, int(issued_at.timestamp())], separators=(',', ':')
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(encoded: str) -> Tuple[Tuple[datetime, int], datetime]:
+    """``(position, issued_at)`` of a cursor from encode_cursor."""
+    try:
+        stamp, product_id, issued = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        updated_at = parse_datetime(stamp)
+        issued_at = datetime.fromtimestamp(issued, tz=dt_timezone.utc)
+    except (binascii.Error, OverflowError, OSError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+    if updated_at is None or updated_at.tzinfo is None or not isinstance(product_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return (updated_at, product_id), issued_at
+
+
+def _after(position: Optional[Tuple[datetime, int]], stamp: str, key: str) -> Q:
+    """Rows strictly after ``position``; the leading >= keeps it an index range."""
+    if position is None:
+        return Q()
+    value, last = position
+    return Q(**{f'{stamp}__gte': value}) & (
+        Q(**{f'{stamp}__gt': value}) | Q(**{f'{key}__gt': last})
+    )
+
+
+def _oldest_open_write() -> Optional[datetime]:
+    """Start of the oldest other transaction that writes or waits on a lock (PostgreSQL only)."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND pid <> pg_backend_pid() "
+            "AND backend_type = 'client backend' "
+            "AND (backend_xid IS NOT NULL OR wait_event_type = 'Lock')"
+        )
+        return cursor.fetchone()[0]
+
+
+def get_changes(since: Optional[str], page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    One page of the sync feed after the ``since`` cursor (from the start without one).
+
+    Returns:
+        ``results`` (changed product rows), ``deleted`` (tombstones),
+        ``next`` (cursor for the following call) and ``has_more``
+
+    Raises:
+        InvalidCursor: If ``since`` cannot be decoded
+        CursorExpired: If ``since`` was handed out longer ago than tombstones
+            are kept, so deletions since may have been purged
+    """
+    now = timezone.now()
+    position = None
+    if since:
+        position, issued_at = decode_cursor(since)
+        if issued_at < now - timedelta(seconds=settings.INVENTORY_TOMBSTONE_TTL):
+            raise CursorExpired("Cursor is older than the retained deletions; start a full sync")
+    oldest = _oldest_open_write()
+    until = min(now, oldest or now) - timedelta(seconds=settings.INVENTORY_SYNC_SETTLE_SECONDS)
+
+    # Each side needs at most page_size + 1 rows to fill the page and tell if there is more
+    products = (
+        Product.objects.filter(_after(position, 'updated_at', 'id'), updated_at__lte=until)
+        .order_by('updated_at', 'id')
+        .values(*PRODUCT_VALUE_FIELDS)[:page_size + 1]
+    )
+    tombstones = (
+        ProductTombstone.objects.filter(_after(position, 'deleted_at', 'product_id'), deleted_at__lte=until)
+        .order_by('deleted_at', 'product_id')
+        .values('product_id', 'name', 'deleted_at')[:page_size + 1]
+    )
+    entries = sorted(
+        [((row['updated_at'], row['id']), row, False) for row in products]
+        + [((row['deleted_at'], row['product_id']), row, True) for row in tombstones],
+        key=lambda entry: entry[0]
+    )
+    has_more = len(entries) > page_size
+    page = entries[:page_size]
+
+    if has_more:
+        next_position = page[-1][0]
+    else:
+        # Every settled row up to ``until`` was returned, so the cursor can
+        # catch up with it and stay fresh while nothing changes
+        next_position = max(page[-1][0], (until, 0)) if page else (until, 0)
+        if position is not None:
+            next_position = max(next_position, position)
+
+    tz = timezone.get_current_timezone()
+    return {
+        'results': serialize_product_rows([row for _, row, deleted in page if not deleted]),
+        'deleted': [
+            {
+                'id': row['product_id'],
+                'name': row['name'],
+                'deleted_at': format_datetime(row['deleted_at'], tz),
+            }
+            for _, row, deleted in page if deleted
+        ],
+        'next': encode_cursor(next_position, now),
+        'has_more': has_more,
+    }
+
+
+def delete_product(product: Product) -> None:
+    """Delete ``product`` and leave a tombstone for the sync feed, atomically."""
+    with transaction.atomic():
+        ProductTombstone.objects.create(product_id=product.pk, name=product.name)
+        product.delete()
+
+
+def purge_expired_tombstones(batch_size: int = PURGE_BATCH_SIZE, progress=None) -> int:
+    """
+    Delete tombstones older than INVENTORY_TOMBSTONE_TTL, ``batch_size`` rows per statement.
+
+    Returns:
+        Number of tombstones deleted
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.INVENTORY_TOMBSTONE_TTL)
+    deleted = 0
+    while True:
+        ids = list(
+            ProductTombstone.objects.filter(deleted_at__lt=cutoff)
+            .order_by('deleted_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += ProductTombstone.objects.filter(id__in=ids).delete()[0]
+        if progress is not None:
+            progress(deleted)
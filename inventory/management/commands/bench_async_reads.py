@@ -0,0 +1,106 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from inventory.models import Product
+from inventory.helpers.benchmarking import analyze_table, seed_products, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent read throughput through Django's WSGI handler "
+        "(one thread per in-flight request) and its ASGI handler (one event "
+        "loop). Run with INVENTORY_ASYNC_READS=True to exercise the async views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--products', type=int, default=10_000,
+            help="Synthetic products to seed, deleted afterwards (default: 10,000)"
+        )
+        parser.add_argument(
+            '--requests', type=int, default=2000,
+            help="Requests per endpoint and deployment (default: 2000)"
+        )
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help="WSGI worker threads (default: 8)"
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=64,
+            help="In-flight ASGI requests (default: 64)"
+        )
+
+    def handle(self, *args, **options):
+        mode = 'async' if settings.INVENTORY_ASYNC_READS else 'sync'
+        self.stdout.write(f"Read views: {mode} (INVENTORY_ASYNC_READS={settings.INVENTORY_ASYNC_READS})")
+
+        # Committed for real: requests run on their own connections
+        seed_products(options['products'], prefix='bench-async-reads')
+        analyze_table(Product)
+        try:
+            product_id = Product.objects.filter(
+                name__startswith='bench-async-reads-'
+            ).values_list('id', flat=True).first()
+            urls = {
+                'list': reverse('inventory:product-list-create'),
+                'detail': reverse('inventory:product-detail', args=[product_id]),
+                'low-stock': reverse('inventory:low-stock-products'),
+                'summary': reverse('inventory:inventory-summary'),
+            }
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                for label, url in urls.items():
+                    wsgi = self.run_wsgi(url, options['requests'], options['threads'])
+                    asgi = asyncio.run(
+                        self.run_asgi(url, options['requests'], options['concurrency'])
+                    )
+                    self.stdout.write(f"{label} ({url})")
+                    for name, (elapsed, latencies) in (
+                        (f"WSGI x{options['threads']} threads", wsgi),
+                        (f"ASGI x{options['concurrency']} in flight", asgi),
+                    ):
+                        stats = summarize(latencies)
+                        self.stdout.write(
+                            f"  {name:<24} {len(latencies) / elapsed:,.0f} req/s "
+                            f"p50={stats['p50']:.1f}ms p95={stats['p95']:.1f}ms"
+                        )
+        finally:
+            Product.objects.filter(name__startswith='bench-async-reads-').delete()
+
+    def run_wsgi(self, url, requests, threads):
+        def fetch(_):
+            started = time.perf_counter()
+            Client().get(url)
+            return (time.perf_counter() - started) * 1000
+
+        def worker(count):
+            try:
+                return [fetch(n) for n in range(count)]
+            finally:
+                connections.close_all()
+
+        shares = [requests // threads + (1 if n < requests % threads else 0) for n in range(threads)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = [sample for samples in pool.map(worker, shares) for sample in samples]
+        return time.perf_counter() - started, latencies
+
+    async def run_asgi(self, url, requests, concurrency):
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with slots:
+                started = time.perf_counter()
+                await client.get(url)
+                return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(fetch() for _ in range(requests)))
+        return time.perf_counter() - started, latencies
@@ -0,0 +1,326 @@
+import http.client
+import json
+import multiprocessing
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from inventory.models import Product, StockMovement
+from inventory.services import stock_increment_buffer
+from inventory.helpers.benchmarking import analyze_table, percentile, seed_products
+from inventory_management.db.pool import close_all_pools
+
+ROUTES = ('list', 'detail', 'low-stock', 'increase', 'decrease')
+DEFAULT_MIX = 'list=40,detail=30,low-stock=10,increase=10,decrease=10'
+SEED_PREFIX = 'bench-inventory'
+# Starting stock of the products that take stock adjustments
+HOT_STOCK = 1_000_000
+
+
+def parse_mix(value):
+    """``route=weight,...`` into ``{route: weight}``, unknown routes rejected."""
+    mix = {}
+    for part in value.split(','):
+        route, _, weight = part.partition('=')
+        route = route.strip()
+        if route not in ROUTES:
+            raise CommandError(f"Unknown route {route!r}; choose from {', '.join(ROUTES)}")
+        try:
+            mix[route] = int(weight)
+        except ValueError:
+            raise CommandError(f"Weight of {route} must be an integer")
+    if not any(mix.values()):
+        raise CommandError("The mix needs at least one route with a positive weight")
+    return mix
+
+
+class InProcessTransport:
+    """Requests through Django's test client: full URL routing, no sockets."""
+
+    def __init__(self, base_url=None):
+        self.client = Client()
+
+    def request(self, method, path, body=None):
+        if method == 'GET':
+            return self.client.get(path).status_code
+        return self.client.post(path, body, content_type='application/json').status_code
+
+    def close(self):
+        connections.close_all()
+
+
+class HTTPTransport:
+    """Requests to a running server over one keep-alive connection."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else None
+        try:
+            self.conn.request(
+                method, self.prefix + path, body=payload,
+                headers={'Content-Type': 'application/json'} if payload else {}
+            )
+            response = self.conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            # Let the next request reconnect
+            self.conn.close()
+            raise
+
+    def close(self):
+        self.conn.close()
+
+
+def _run_worker(plan, worker_index, deadline):
+    rng = random.Random(plan['seed'] * 1000 + worker_index)
+    transport = (HTTPTransport if plan['base_url'] else InProcessTransport)(plan['base_url'])
+    routes, weights = zip(*plan['mix'].items())
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    applied = defaultdict(int)
+    ambiguous = 0
+
+    try:
+        while time.monotonic() < deadline:
+            route = rng.choices(routes, weights)[0]
+            body, delta, product_id = None, 0, None
+            if route == 'list':
+                method, path = 'GET', plan['urls']['list']
+            elif route == 'low-stock':
+                method, path = 'GET', plan['urls']['low-stock']
+            elif route == 'detail':
+                method, path = 'GET', plan['urls']['detail'].format(id=rng.choice(plan['product_ids']))
+            else:
+                product_id = rng.choice(plan['hot_ids'])
+                quantity = rng.randint(1, 5)
+                delta = quantity if route == 'increase' else -quantity
+                method, path = 'POST', plan['urls'][route].format(id=product_id)
+                body = {'quantity': quantity}
+
+            started = time.perf_counter()
+            try:
+                status = transport.request(method, path, body)
+            except Exception:
+                status = 'exception'
+            latencies[route].append((time.perf_counter() - started) * 1000)
+            statuses[route][status] += 1
+
+            if product_id is not None:
+                if status in (200, 202):
+                    applied[product_id] += delta
+                elif status == 'exception' or status >= 500:
+                    # May or may not have committed
+                    ambiguous += 1
+    finally:
+        transport.close()
+    return latencies, statuses, applied, ambiguous
+
+
+def _run_process(plan):
+    """Run ``plan['workers']`` threads until the deadline; merged results."""
+    deadline = time.monotonic() + plan['seconds']
+    with ThreadPoolExecutor(max_workers=plan['workers']) as pool:
+        futures = [
+            pool.submit(_run_worker, plan, plan['process'] * plan['workers'] + n, deadline)
+            for n in range(plan['workers'])
+        ]
+        results = [future.result() for future in futures]
+    if stock_increment_buffer.enabled:
+        # Queued increments are part of the expected totals
+        stock_increment_buffer.flush()
+    return _merge(results)
+
+
+def _merge(results):
+    latencies, statuses, applied, ambiguous = defaultdict(list), defaultdict(Counter), defaultdict(int), 0
+    for part_latencies, part_statuses, part_applied, part_ambiguous in results:
+        for route, samples in part_latencies.items():
+            latencies[route].extend(samples)
+        for route, counts in part_statuses.items():
+            statuses[route].update(counts)
+        for product_id, delta in part_applied.items():
+            applied[product_id] += delta
+        ambiguous += part_ambiguous
+    return latencies, statuses, applied, ambiguous
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a weighted mix of list, detail, low-stock and increase/decrease "
+        "stock requests through the real URL routes from concurrent workers, "
+        "then report throughput, latency percentiles and error rates per route "
+        "and check the final stock of every adjusted product for lost updates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--products', type=int, default=10_000,
+            help="Synthetic products to seed, deleted afterwards (default: 10,000)"
+        )
+        parser.add_argument(
+            '--hot-products', type=int, default=20,
+            help="Products receiving the stock adjustments (default: 20)"
+        )
+        parser.add_argument(
+            '--mix', default=DEFAULT_MIX,
+            help=f"Route weights (default: {DEFAULT_MIX})"
+        )
+        parser.add_argument(
+            '--seconds', type=float, default=30,
+            help="Duration of the run (default: 30)"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=16,
+            help="Worker threads per process (default: 16)"
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help="Worker processes, forked after seeding (default: 1)"
+        )
+        parser.add_argument(
+            '--base-url',
+            help="Send real HTTP requests to a server on this URL (e.g. "
+                 "http://localhost:8000) instead of the in-process test client. "
+                 "The server must use the same database."
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help="Random seed for the request sequence (default: 0)"
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help="Keep the seeded products and their stock movements"
+        )
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        if options['hot_products'] > options['products']:
+            raise CommandError("--hot-products cannot exceed --products")
+
+        self.stdout.write(f"Seeding {options['products']:,} products...")
+        # Committed for real: requests run on their own connections
+        seed_products(options['products'], prefix=SEED_PREFIX)
+        analyze_table(Product)
+        seeded = Product.objects.filter(name__startswith=f'{SEED_PREFIX}-')
+        try:
+            product_ids = list(seeded.order_by('id').values_list('id', flat=True))
+            hot_ids = product_ids[:options['hot_products']]
+            Product.objects.filter(id__in=hot_ids).update(stock_quantity=HOT_STOCK)
+            initial = dict(Product.objects.filter(id__in=hot_ids).values_list('id', 'stock_quantity'))
+
+            plan = {
+                'mix': mix,
+                'seconds': options['seconds'],
+                'workers': options['workers'],
+                'base_url': options['base_url'],
+                'seed': options['seed'],
+                'product_ids': product_ids,
+                'hot_ids': hot_ids,
+                'urls': {
+                    'list': reverse('inventory:product-list-create'),
+                    'low-stock': reverse('inventory:low-stock-products'),
+                    'detail': reverse('inventory:product-detail', args=[0]).replace('/0/', '/{id}/'),
+                    'increase': reverse('inventory:increase-stock', args=[0]).replace('/0/', '/{id}/'),
+                    'decrease': reverse('inventory:decrease-stock', args=[0]).replace('/0/', '/{id}/'),
+                },
+            }
+            self.stdout.write(
+                f"Running {options['processes']} x {options['workers']} workers for "
+                f"{options['seconds']:g}s against "
+                f"{options['base_url'] or 'the in-process test client'}..."
+            )
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                started = time.perf_counter()
+                latencies, statuses, applied, ambiguous = self.run(plan, options['processes'])
+                elapsed = time.perf_counter() - started
+            if options['base_url'] and any(counts[202] for counts in statuses.values()):
+                # Let the server's increment buffer flush queued increases
+                time.sleep(1)
+
+            self.report(latencies, statuses, elapsed)
+            self.check_stock(initial, applied, ambiguous)
+        finally:
+            if not options['keep']:
+                ids = seeded.values_list('id', flat=True)
+                StockMovement.objects.filter(product_id__in=ids).delete()
+                seeded.delete()
+
+    def run(self, plan, processes):
+        if processes == 1:
+            return _run_process(dict(plan, process=0))
+        # Forked children must not share the parent's sockets
+        connections.close_all()
+        close_all_pools()
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes) as pool:
+            results = pool.map(_run_process, [dict(plan, process=n) for n in range(processes)])
+        return _merge(results)
+
+    def report(self, latencies, statuses, elapsed):
+        total = sum(len(samples) for samples in latencies.values())
+        errors = sum(
+            count for counts in statuses.values() for status, count in counts.items()
+            if status == 'exception' or status >= 500
+        )
+        self.stdout.write(
+            f"\n{total:,} requests in {elapsed:.1f}s: {total / elapsed:,.0f} req/s, "
+            f"{errors / total if total else 0:.2%} errors"
+        )
+        self.stdout.write(
+            f"{'route':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'4xx':>7} {'errors':>7}"
+        )
+        for route in ROUTES:
+            samples = latencies.get(route)
+            if not samples:
+                continue
+            counts = statuses[route]
+            client_errors = sum(
+                count for status, count in counts.items()
+                if status != 'exception' and 400 <= status < 500
+            )
+            route_errors = sum(
+                count for status, count in counts.items()
+                if status == 'exception' or status >= 500
+            )
+            self.stdout.write(
+                f"{route:<10} {len(samples) / elapsed:>8,.0f} "
+                f"{percentile(samples, 50):>8.1f} {percentile(samples, 95):>8.1f} "
+                f"{percentile(samples, 99):>8.1f} "
+                f"{client_errors / len(samples):>7.1%} {route_errors / len(samples):>7.1%}"
+            )
+
+    def check_stock(self, initial, applied, ambiguous):
+        final = dict(Product.objects.filter(id__in=initial).values_list('id', 'stock_quantity'))
+        mismatched = {
+            product_id: (initial[product_id] + applied.get(product_id, 0), final[product_id])
+            for product_id in initial
+            if final[product_id] != initial[product_id] + applied.get(product_id, 0)
+        }
+        adjustments = sum(1 for delta in applied.values() if delta)
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS(
+                f"\nStock check: final stock matches every acknowledged adjustment "
+                f"on {len(initial)} products ({adjustments} with a net change)"
+            ))
+            return
+        for product_id, (expected, actual) in sorted(mismatched.items()):
+            self.stdout.write(f"  product {product_id}: expected {expected}, found {actual}")
+        message = f"Stock check: {len(mismatched)} of {len(initial)} products do not match"
+        if ambiguous:
+            # Failed requests may have committed; not necessarily lost updates
+            message += f" ({ambiguous} adjustments failed with an unknown outcome)"
+        raise CommandError(message)
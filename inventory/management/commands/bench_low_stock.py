@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from inventory.models import Product
+from inventory.services import InventoryService
+from inventory.helpers.benchmarking import (
+    analyze_table,
+    seed_products,
+    summarize,
+    time_call,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare low-stock query latency of the old column-to-column filter "
+        "with the index-backed ProductQuerySet.low_stock() query"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--products', type=int, default=1_000_000,
+            help="Number of synthetic products to seed (default: 1,000,000)"
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help="Timed runs per query (default: 20)"
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help="Commit the seeded products instead of rolling them back"
+        )
+
+    def handle(self, *args, **options):
+        queries = {
+            'before (stock_quantity <= low_stock_threshold)': Product.objects.filter(
+                is_active=True,
+                stock_quantity__lte=F('low_stock_threshold')
+            ).order_by('stock_quantity'),
+            'after (ProductQuerySet.low_stock)': InventoryService.get_low_stock_products(),
+        }
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['products']:,} products...")
+            seed_products(options['products'], prefix='bench-low-stock')
+            analyze_table(Product)
+
+            for label, queryset in queries.items():
+                ids = queryset.values_list('id', flat=True)
+                matched = len(list(ids.all()))  # warm-up run
+                stats = summarize(
+                    time_call(lambda: list(ids.all()), options['repeat'])
+                )
+                plan = ids.explain().splitlines()
+                scan = next((line for line in plan if 'Scan' in line), plan[0])
+                self.stdout.write(
+                    f"{label}\n"
+                    f"  rows={matched:,} p50={stats['p50']:.2f}ms "
+                    f"p95={stats['p95']:.2f}ms max={stats['max']:.2f}ms\n"
+                    f"  plan: {scan.strip(' ->')}"
+                )
+
+            if not options['keep']:
+                transaction.set_rollback(True)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from inventory.models import Product
+from inventory.serializers import (
+    PRODUCT_VALUE_FIELDS,
+    ProductSerializer,
+    serialize_product_rows,
+)
+from inventory.helpers.benchmarking import summarize, time_call
+from inventory.helpers.renderers import FastJSONRenderer, orjson
+
+
+def build_products(count):
+    """In-memory products and the matching ``.values()`` rows."""
+    now = timezone.now()
+    products = [
+        Product(
+            id=n, name=f"bench-serialization-{n:07d}", description="",
+            stock_quantity=(n * 7919) % 5000, low_stock_threshold=10,
+            is_active=n % 10 != 0,
+            created_at=now - timedelta(seconds=n), updated_at=now,
+        )
+        for n in range(1, count + 1)
+    ]
+    rows = [
+        {field: getattr(product, field) for field in PRODUCT_VALUE_FIELDS}
+        for product in products
+    ]
+    return products, rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ProductSerializer + JSONRenderer with the .values() fast path "
+        "+ FastJSONRenderer on in-memory products (no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+            help="Row counts to benchmark (default: 1000 10000 100000)"
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="Timed runs per path and size (default: 5)"
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write("orjson is not installed; FastJSONRenderer uses json.dumps")
+
+        for size in options['sizes']:
+            products, rows = build_products(size)
+
+            def serializer_path():
+                return JSONRenderer().render(ProductSerializer(products, many=True).data)
+
+            def fast_path():
+                return FastJSONRenderer().render(serialize_product_rows(rows))
+
+            if serializer_path() != fast_path():
+                raise CommandError(f"Fast path output differs at {size:,} rows")
+
+            before = summarize(time_call(serializer_path, options['repeat']))
+            after = summarize(time_call(fast_path, options['repeat']))
+            self.stdout.write(
+                f"{size:,} rows\n"
+                f"  ProductSerializer  p50={before['p50']:.1f}ms max={before['max']:.1f}ms\n"
+                f"  fast path          p50={after['p50']:.1f}ms max={after['max']:.1f}ms "
+                f"({before['p50'] / after['p50']:.1f}x)"
+            )
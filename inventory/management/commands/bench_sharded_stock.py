@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from inventory.models import Product, StockMovement
+from inventory.services import InventoryService
+from inventory.helpers.exceptions import InsufficientStockException
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure decrease_stock throughput on one hot product, unsharded and "
+        "with each requested shard count, from concurrent worker threads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shards', type=int, nargs='+', default=[1, 4, 16],
+            help="Shard counts to compare against the unsharded row (default: 1 4 16)"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=32,
+            help="Concurrent worker threads, one connection each (default: 32)"
+        )
+        parser.add_argument(
+            '--seconds', type=float, default=10,
+            help="Duration of each run (default: 10)"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Row lock contention is only meaningful on PostgreSQL")
+
+        for shards in [0] + options['shards']:
+            ops = self.run(shards, options['workers'], options['seconds'])
+            label = f"{shards} shards" if shards else "unsharded"
+            self.stdout.write(
+                f"{label:>12}: {ops / options['seconds']:,.0f} decrements/s"
+            )
+
+    def run(self, shards, workers, seconds):
+        # Committed for real: the workers use their own connections
+        product = Product.objects.create(
+            name=f"bench-sharded-stock-{shards}-{time.time_ns()}",
+            stock_quantity=10_000_000,
+        )
+        try:
+            if shards:
+                InventoryService.enable_stock_sharding(product.id, shards)
+            deadline = time.monotonic() + seconds
+
+            def worker():
+                count = 0
+                try:
+                    while time.monotonic() < deadline:
+                        try:
+                            InventoryService.decrease_stock(product.id, 1)
+                            count += 1
+                        except InsufficientStockException:
+                            break
+                finally:
+                    connections.close_all()
+                return count
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(worker) for _ in range(workers)]
+                return sum(future.result() for future in futures)
+        finally:
+            StockMovement.objects.filter(product_id=product.id).delete()
+            product.delete()
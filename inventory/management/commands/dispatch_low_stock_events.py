@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from inventory.helpers.events import (
+    DISPATCH_BATCH_SIZE,
+    dispatch_pending_events,
+    purge_dispatched_events,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drain the low-stock event outbox in batches, numbering events for "
+        "subscribers of /api/v1/events/low-stock/, and purge old dispatched events"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DISPATCH_BATCH_SIZE,
+            help=f"Events dispatched per transaction (default: {DISPATCH_BATCH_SIZE})"
+        )
+        parser.add_argument(
+            '--interval', type=float, default=0.2,
+            help="Seconds to sleep when the outbox is empty (default: 0.2)"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Drain the outbox once and exit instead of running forever"
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            dispatched = dispatch_pending_events(options['batch_size'])
+            total += dispatched
+            if dispatched:
+                self.stdout.write(f"{total:,} events dispatched")
+                continue
+            purged = purge_dispatched_events()
+            if purged:
+                self.stdout.write(f"{purged:,} old dispatched events purged")
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+            # Drop connections the database closed while idle
+            close_old_connections()
+        self.stdout.write(self.style.SUCCESS(f"Dispatched {total:,} low-stock events"))
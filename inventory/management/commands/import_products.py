@@ -0,0 +1,65 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.helpers.exceptions import ImportFormatError
+from inventory.helpers.importers import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ProductImporter,
+    decode_lines,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert products from a CSV (with header) or NDJSON file, matching "
+        "existing products by name"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for stdin")
+        parser.add_argument(
+            '--format', dest='import_format', choices=IMPORT_FORMATS,
+            help="Input format (default: from the file extension, else csv)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per upsert transaction (default: {DEFAULT_BATCH_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['import_format'] or (
+            'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+        )
+
+        def report(stats):
+            self.stdout.write(
+                f"{stats['imported']:,} rows imported "
+                f"({stats['rows_per_second']:,} rows/s, {stats['skipped']:,} skipped)"
+            )
+
+        importer = ProductImporter(batch_size=options['batch_size'], progress=report)
+        try:
+            if path == '-':
+                stats = importer.run(read_rows(decode_lines(sys.stdin.buffer), import_format))
+            else:
+                with open(path, 'rb') as handle:
+                    stats = importer.run(read_rows(decode_lines(handle), import_format))
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        except ImportFormatError as exc:
+            raise CommandError(
+                f"{exc}; stopped after importing {importer.imported:,} rows"
+            )
+
+        for error in stats['errors']:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        for rejected in stats['stock_rejected']:
+            self.stderr.write(f"row {rejected['row']}: stock kept, {rejected['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['imported']:,} of {stats['rows']:,} rows in "
+            f"{stats['elapsed_seconds']:.1f}s ({stats['rows_per_second']:,} rows/s)"
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from inventory.helpers.idempotency import PURGE_BATCH_SIZE, purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key responses in small batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=PURGE_BATCH_SIZE,
+            help=f"Keys deleted per statement (default: {PURGE_BATCH_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        def report(deleted):
+            self.stdout.write(f"{deleted:,} expired keys deleted")
+
+        deleted = purge_expired_keys(options['batch_size'], progress=report)
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted:,} expired idempotency keys"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from inventory.helpers.sync import PURGE_BATCH_SIZE, purge_expired_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete product deletion tombstones older than INVENTORY_TOMBSTONE_TTL in small batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=PURGE_BATCH_SIZE,
+            help=f"Tombstones deleted per statement (default: {PURGE_BATCH_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        def report(deleted):
+            self.stdout.write(f"{deleted:,} expired tombstones deleted")
+
+        deleted = purge_expired_tombstones(options['batch_size'], progress=report)
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted:,} expired product tombstones"))
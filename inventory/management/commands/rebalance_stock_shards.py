@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory.models import Product
+from inventory.services import InventoryService
+
+
+class Command(BaseCommand):
+    help = (
+        "Even out the shards of every sharded product and refresh its "
+        "Product.stock_quantity snapshot"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Keep running, rebalancing every INTERVAL seconds (default: run once)"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            product_ids = Product.objects.filter(stock_shards__gt=0).values_list('id', flat=True)
+            for product_id in product_ids:
+                try:
+                    InventoryService.rebalance_stock_shards(product_id)
+                except Product.DoesNotExist:
+                    continue  # Deleted since it was listed
+            self.stdout.write(f"Rebalanced {len(product_ids):,} sharded products")
+
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.models import Product
+from inventory.services import InventoryService
+from inventory.helpers.exceptions import ShardedStockError
+
+
+class Command(BaseCommand):
+    help = (
+        "Spread a hot product's stock over N shard rows so concurrent "
+        "adjustments stop queueing on one row lock (--shards 0 folds it back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_id', type=int)
+        parser.add_argument(
+            '--shards', type=int, required=True,
+            help="Number of shards, or 0 to return to a single stock row"
+        )
+
+    def handle(self, *args, **options):
+        product_id, shards = options['product_id'], options['shards']
+        try:
+            if shards:
+                product = InventoryService.enable_stock_sharding(product_id, shards)
+            else:
+                product = InventoryService.disable_stock_sharding(product_id)
+        except Product.DoesNotExist:
+            raise CommandError(f"Product {product_id} does not exist")
+        except (ShardedStockError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{product.name}: {product.stock_quantity:,} units in "
+            f"{product.stock_shards or 'no'} shards"
+        ))
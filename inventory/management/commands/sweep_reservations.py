@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from inventory.services import InventoryService, RESERVATION_SWEEP_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Return the stock held by expired reservations, one batch per transaction"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=RESERVATION_SWEEP_BATCH_SIZE,
+            help=f"Reservations reclaimed per transaction (default: {RESERVATION_SWEEP_BATCH_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            expired = InventoryService.expire_reservations(options['batch_size'])
+            if not expired:
+                break
+            total += expired
+            self.stdout.write(f"{total:,} expired reservations reclaimed")
+        self.stdout.write(self.style.SUCCESS(f"Reclaimed {total:,} expired reservations"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.helpers.counters import counters_enabled, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile the incrementally maintained inventory counters against a "
+        "full scan of the product table; exits non-zero on drift unless --fix"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help="Reset the counters to the scanned counts when they differ"
+        )
+
+    def handle(self, *args, **options):
+        if not counters_enabled():
+            raise CommandError("Inventory counters are only maintained on PostgreSQL")
+
+        drift = reconcile_counters(fix=options['fix'])
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Inventory counters match the product table"))
+            return
+        for name, counts in drift.items():
+            self.stdout.write(f"  {name}: counters {counts['counters']:,}, scan {counts['scan']:,}")
+        if options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"Reset {len(drift)} drifted counters to the scan"))
+            return
+        raise CommandError(f"{len(drift)} inventory counters drifted; rerun with --fix to reset them")
@@ -0,0 +1,71 @@
+"""
+Product Inventory Management middleware
+Request instrumentation feeding the /metrics endpoint
+"""
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .helpers.metrics import RequestStats, current_request, record_request
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class MetricsMiddleware:
+    """
+    Record latency, DB queries, DB time and serialization time per route.
+
+    Routes are URL patterns (``api/v1/products/<int:pk>/``), not paths, so
+    the number of series stays bounded. Works under WSGI and ASGI; DB
+    queries are counted by the execute wrapper installed in signals.py.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.INVENTORY_METRICS
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self._record(request, response, started, stats)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self._record(request, response, started, stats)
+        return response
+
+    def _record(self, request, response, started, stats):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        record_request(
+            request.method, route, response.status_code,
+            time.perf_counter() - started, stats
+        )
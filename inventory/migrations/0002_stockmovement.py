@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField(help_text='Signed quantity applied to stock')),
+                ('quantity_after', models.IntegerField(help_text='Stock quantity after the movement was applied')),
+                ('reason', models.CharField(choices=[('increase', 'Stock increase'), ('decrease', 'Stock decrease'), ('bulk', 'Bulk adjustment')], max_length=32)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, help_text='User who made the change, if known', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_movements', to='inventory.product')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['product', 'created_at', 'id'], name='inventory_movement_history')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-16 20:56
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+def create_headroom_statistics(apps, schema_editor):
+    """
+    Give the planner statistics on the headroom expression so it can
+    estimate low-stock selectivity (expression statistics need PG 14+).
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql' or connection.pg_version < 140000:
+        return
+    schema_editor.execute(
+        'CREATE STATISTICS IF NOT EXISTS "inventory_product_headroom" '
+        'ON ("stock_quantity" - "low_stock_threshold") FROM "inventory_product"'
+    )
+
+
+def drop_headroom_statistics(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP STATISTICS IF EXISTS "inventory_product_headroom"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_stockmovement'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('stock_quantity'), '-', models.F('low_stock_threshold')), condition=models.Q(('is_active', True)), name='inventory_product_low_stock'),
+        ),
+        migrations.RunPython(create_headroom_statistics, drop_headroom_statistics),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-16 21:52
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_stockreservation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stock_shards',
+            field=models.PositiveSmallIntegerField(default=0, help_text="Number of StockShard rows holding this product's stock (0: unsharded)"),
+        ),
+        migrations.CreateModel(
+            name='StockShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('quantity', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('product', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stock_shard_rows', to='inventory.product')),
+            ],
+            options={
+                'ordering': ['product', 'shard'],
+                'constraints': [models.UniqueConstraint(fields=('product', 'shard'), name='inventory_stock_shard_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_product_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LowStockEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transition', models.CharField(choices=[('low', 'Fell to low stock'), ('restocked', 'Back above low stock')], max_length=16)),
+                ('stock_quantity', models.IntegerField(help_text='Stock quantity after the adjustment')),
+                ('low_stock_threshold', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sequence', models.BigIntegerField(help_text='Position in the dispatched event stream (null: not dispatched yet)', null=True, unique=True)),
+                ('dispatched_at', models.DateTimeField(null=True)),
+                ('product', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='inventory.product')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('sequence__isnull', True)), fields=['id'], name='inventory_event_pending')],
+            },
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:50
+
+from django.db import migrations, models
+
+# Statement-level triggers keeping inventory_inventorycounter in step with
+# inventory_product: each write statement adds the differences between
+# its old and new rows (from the transition tables) to the counter shard
+# of the writing connection, and only when a count actually changes, so
+# ordinary stock adjustments that cross no threshold write no counter.
+# PostgreSQL only: elsewhere the summary is computed with a full scan.
+COUNTER_SHARDS = 16
+
+COUNTER_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION inventory_apply_counter_deltas(d_total bigint, d_low bigint, d_out bigint)
+RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    IF d_total <> 0 OR d_low <> 0 OR d_out <> 0 THEN
+        INSERT INTO inventory_inventorycounter AS c
+            (shard, total_products, low_stock_products, out_of_stock_products)
+        VALUES (pg_backend_pid() % {COUNTER_SHARDS}, d_total, d_low, d_out)
+        ON CONFLICT (shard) DO UPDATE SET
+            total_products = c.total_products + EXCLUDED.total_products,
+            low_stock_products = c.low_stock_products + EXCLUDED.low_stock_products,
+            out_of_stock_products = c.out_of_stock_products + EXCLUDED.out_of_stock_products;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION inventory_counters_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM inventory_apply_counter_deltas(
+        COUNT(*),
+        COUNT(*) FILTER (WHERE stock_quantity <= low_stock_threshold),
+        COUNT(*) FILTER (WHERE stock_quantity = 0)
+    ) FROM new_rows;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION inventory_counters_delete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM inventory_apply_counter_deltas(
+        -COUNT(*),
+        -COUNT(*) FILTER (WHERE stock_quantity <= low_stock_threshold),
+        -COUNT(*) FILTER (WHERE stock_quantity = 0)
+    ) FROM old_rows;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION inventory_counters_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM inventory_apply_counter_deltas(
+        0,
+        COALESCE(SUM((n.stock_quantity <= n.low_stock_threshold)::int
+                     - (o.stock_quantity <= o.low_stock_threshold)::int), 0),
+        COALESCE(SUM((n.stock_quantity = 0)::int - (o.stock_quantity = 0)::int), 0)
+    ) FROM old_rows o JOIN new_rows n ON n.id = o.id;
+    RETURN NULL;
+END $$;
+"""
+
+COUNTER_TRIGGERS = {
+    'inventory_counters_insert': 'AFTER INSERT ON inventory_product REFERENCING NEW TABLE AS new_rows',
+    'inventory_counters_delete': 'AFTER DELETE ON inventory_product REFERENCING OLD TABLE AS old_rows',
+    'inventory_counters_update': (
+        'AFTER UPDATE ON inventory_product REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'
+    ),
+}
+
+
+def install_counter_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # No product writes between the initial count and the triggers going live
+    schema_editor.execute('LOCK TABLE inventory_product IN SHARE ROW EXCLUSIVE MODE')
+    # No parameters: the % in the SQL is the modulo operator
+    schema_editor.execute(COUNTER_FUNCTIONS, None)
+    for name, definition in COUNTER_TRIGGERS.items():
+        schema_editor.execute(
+            f'CREATE TRIGGER {name} {definition} FOR EACH STATEMENT EXECUTE FUNCTION {name}()'
+        )
+    schema_editor.execute(
+        'INSERT INTO inventory_inventorycounter '
+        '(shard, total_products, low_stock_products, out_of_stock_products) '
+        'SELECT 0, COUNT(*), '
+        'COUNT(*) FILTER (WHERE stock_quantity <= low_stock_threshold), '
+        'COUNT(*) FILTER (WHERE stock_quantity = 0) '
+        'FROM inventory_product'
+    )
+
+
+def drop_counter_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in COUNTER_TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {name} ON inventory_product')
+        schema_editor.execute(f'DROP FUNCTION IF EXISTS {name}()')
+    schema_editor.execute('DROP FUNCTION IF EXISTS inventory_apply_counter_deltas(bigint, bigint, bigint)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_lowstockevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField(unique=True)),
+                ('total_products', models.BigIntegerField(default=0)),
+                ('low_stock_products', models.BigIntegerField(default=0)),
+                ('out_of_stock_products', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['shard'],
+            },
+        ),
+        migrations.RunPython(install_counter_triggers, drop_counter_triggers),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:54
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_inventory_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.SlugField(help_text="Short unique code, e.g. 'ams-1'", max_length=32, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('is_active', models.BooleanField(default=True, help_text='Inactive locations can still be drained but receive no stock')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='located_quantity',
+            field=models.IntegerField(default=0, help_text='Part of stock_quantity held at locations (sum of LocationStock); the rest is unassigned', validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='quantity_after',
+            field=models.IntegerField(help_text='Stock quantity after the movement was applied (at the location, if any)'),
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='reason',
+            field=models.CharField(choices=[('increase', 'Stock increase'), ('decrease', 'Stock decrease'), ('bulk', 'Bulk adjustment'), ('reservation', 'Reservation committed'), ('transfer', 'Transfer between locations')], max_length=32),
+        ),
+        migrations.CreateModel(
+            name='LocationStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stock', to='inventory.location')),
+                ('product', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='location_stock', to='inventory.product')),
+            ],
+            options={
+                'ordering': ['product', 'location'],
+            },
+        ),
+        migrations.AddField(
+            model_name='stockmovement',
+            name='location',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, help_text='Location whose stock moved (null: unassigned stock)', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='inventory.location'),
+        ),
+        migrations.AddConstraint(
+            model_name='locationstock',
+            constraint=models.UniqueConstraint(fields=('product', 'location'), name='inventory_location_stock_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_stockmovement_import_reason'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='reason',
+            field=models.CharField(choices=[('increase', 'Stock increase'), ('decrease', 'Stock decrease'), ('bulk', 'Bulk adjustment'), ('reservation', 'Reservation committed'), ('transfer', 'Transfer between locations'), ('import', 'Catalog import'), ('manual', 'Product edit'), ('admin', 'Admin edit')], max_length=32),
+        ),
+    ]
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import F, Q
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 
 class TimeStampedModel(models.Model):
     """Abstract base class for models with created and updated timestamps."""
@@ -10,6 +14,22 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
 
+class ProductQuerySet(models.QuerySet):
+    """Shared query building blocks for products."""
+
+    def low_stock(self):
+        """
+        Active products at or below their low stock threshold.
+
+        The predicate is written against the stock headroom expression so
+        it matches the partial ``inventory_product_low_stock`` index instead
+        of forcing a column-to-column comparison over every row.
+        """
+        return self.alias(
+            stock_headroom=F('stock_quantity') - F('low_stock_threshold')
+        ).filter(is_active=True, stock_headroom__lte=0)
+
+
 class Product(TimeStampedModel):
     """Product model representing inventory items."""
     
@@ -36,9 +56,45 @@ class Product(TimeStampedModel):
         default=True,
         help_text="Whether the product is active in inventory"
     )
+    reserved_quantity = models.IntegerField(
+        default=0,
+        validators=[MinValueValidator(0)],
+        help_text="Quantity held by active stock reservations"
+    )
+    stock_shards = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Number of StockShard rows holding this product's stock (0: unsharded)"
+    )
+    located_quantity = models.IntegerField(
+        default=0,
+        validators=[MinValueValidator(0)],
+        help_text="Part of stock_quantity held at locations (sum of LocationStock); the rest is unassigned"
+    )
+
+    objects = ProductQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Stock headroom (stock minus threshold) over active products only;
+            # serves ProductQuerySet.low_stock().
+            models.Index(
+                F('stock_quantity') - F('low_stock_threshold'),
+                name='inventory_product_low_stock',
+                condition=Q(is_active=True),
+            ),
+            # ?is_active= on the name-ordered product list
+            models.Index(
+                fields=['is_active', 'name', 'id'],
+                name='inventory_product_active_name',
+            ),
+            # ?min_stock= / ?max_stock= ranges
+            models.Index(fields=['stock_quantity'], name='inventory_product_stock'),
+            # Keyset scans of the delta sync feed (/products/changes/)
+            models.Index(fields=['updated_at', 'id'], name='inventory_product_sync'),
+            # Name and description search use trigram GIN indexes on
+            # UPPER(column), created on PostgreSQL only by migration 0007.
+        ]
 
     def __str__(self):
         return f"{self.name} (Stock: {self.stock_quantity})"
@@ -56,6 +112,367 @@ class Product(TimeStampedModel):
         """Check if product is below low stock threshold."""
         return self.stock_quantity <= self.low_stock_threshold
 
+    @property
+    def available_quantity(self):
+        """Unassigned on-hand stock not held by active reservations."""
+        return self.stock_quantity - self.reserved_quantity - self.located_quantity
+
     def can_reduce_stock(self, quantity):
         """Check if stock can be reduced by given quantity."""
-        return self.stock_quantity >= quantity
\ No newline at end of file
+        return self.stock_quantity >= quantity
+
+
+class ProductTombstone(models.Model):
+    """
+    Record of a deleted product for the delta sync feed.
+
+    Written in the same transaction as the delete, so clients syncing from
+    a cursor learn about deletions as well as changes. Tombstones older
+    than INVENTORY_TOMBSTONE_TTL are purged by purge_tombstones; cursors
+    from before then must start a full sync again.
+    """
+
+    product_id = models.BigIntegerField(unique=True)
+    name = models.CharField(max_length=255)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Keyset scans of the delta sync feed and the purge
+            models.Index(fields=['deleted_at', 'product_id'], name='inventory_tombstone_sync'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} ({self.name}) deleted"
+
+
+class StockMovement(models.Model):
+    """
+    Append-only ledger entry for a single stock change.
+
+    Rows are only ever inserted, in the same transaction as the adjustment
+    they describe. Foreign keys carry no database constraint so inserts
+    stay cheap and history survives product deletion.
+    """
+
+    class Reason(models.TextChoices):
+        INCREASE = 'increase', 'Stock increase'
+        DECREASE = 'decrease', 'Stock decrease'
+        BULK = 'bulk', 'Bulk adjustment'
+        RESERVATION = 'reservation', 'Reservation committed'
+        TRANSFER = 'transfer', 'Transfer between locations'
+        IMPORT = 'import', 'Catalog import'
+        MANUAL = 'manual', 'Product edit'
+        ADMIN = 'admin', 'Admin edit'
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='stock_movements'
+    )
+    delta = models.IntegerField(
+        help_text="Signed quantity applied to stock"
+    )
+    quantity_after = models.IntegerField(
+        help_text="Stock quantity after the movement was applied (at the location, if any)"
+    )
+    reason = models.CharField(
+        max_length=32,
+        choices=Reason.choices
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+',
+        help_text="User who made the change, if known"
+    )
+    location = models.ForeignKey(
+        'Location',
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+',
+        help_text="Location whose stock moved (null: unassigned stock)"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(
+                fields=['product', 'created_at', 'id'],
+                name='inventory_movement_history'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.delta:+d} -> {self.quantity_after}"
+
+    def save(self, *args, **kwargs):
+        """Only allow inserts; ledger rows are never updated."""
+        if not self._state.adding:
+            raise ValueError("Stock movements are append-only")
+        super().save(*args, **kwargs)
+
+
+class LowStockEvent(models.Model):
+    """
+    Transactional outbox entry for a product crossing its low stock threshold.
+
+    Inserted in the same transaction as the stock adjustment that caused
+    it, so an event exists if and only if the adjustment committed. The
+    dispatcher then numbers pending events with ``sequence`` in the order
+    it sees them commit; subscribers follow that sequence and resume from
+    the last one they received.
+    """
+
+    class Transition(models.TextChoices):
+        LOW = 'low', 'Fell to low stock'
+        RESTOCKED = 'restocked', 'Back above low stock'
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+'
+    )
+    transition = models.CharField(
+        max_length=16,
+        choices=Transition.choices
+    )
+    stock_quantity = models.IntegerField(
+        help_text="Stock quantity after the adjustment"
+    )
+    low_stock_threshold = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    sequence = models.BigIntegerField(
+        null=True,
+        unique=True,
+        help_text="Position in the dispatched event stream (null: not dispatched yet)"
+    )
+    dispatched_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # Pending events in insertion order; serves the dispatcher
+            models.Index(
+                fields=['id'],
+                name='inventory_event_pending',
+                condition=Q(sequence__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.transition} at {self.stock_quantity}"
+
+
+class InventoryCounter(models.Model):
+    """
+    One slice of the catalog-wide product counts behind the inventory summary.
+
+    Maintained on PostgreSQL by statement triggers on the product table,
+    which add the old/new row differences in the writing transaction; a
+    transaction only touches the row of its connection's shard, so writers
+    rarely queue on the same counter row. The summary is the sum of all
+    shards. Reconcile with ``manage.py verify_counters``.
+    """
+
+    shard = models.PositiveSmallIntegerField(unique=True)
+    total_products = models.BigIntegerField(default=0)
+    low_stock_products = models.BigIntegerField(default=0)
+    out_of_stock_products = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['shard']
+
+    def __str__(self):
+        return (
+            f"[{self.shard}] {self.total_products} total, "
+            f"{self.low_stock_products} low, {self.out_of_stock_products} out"
+        )
+
+
+class StockShard(models.Model):
+    """
+    One slice of a sharded product's stock.
+
+    Products opted into sharding keep their stock spread over several of
+    these rows, so concurrent adjustments lock different rows instead of
+    queueing on the Product row. Product.stock_quantity is then only a
+    snapshot, refreshed when the shards are rebalanced.
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        db_index=False,
+        related_name='stock_shard_rows'
+    )
+    shard = models.PositiveSmallIntegerField()
+    quantity = models.IntegerField(
+        default=0,
+        validators=[MinValueValidator(0)]
+    )
+
+    class Meta:
+        ordering = ['product', 'shard']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product', 'shard'], name='inventory_stock_shard_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}[{self.shard}]: {self.quantity}"
+
+
+class Location(models.Model):
+    """A warehouse or other place that holds stock."""
+
+    code = models.SlugField(
+        max_length=32,
+        unique=True,
+        help_text="Short unique code, e.g. 'ams-1'"
+    )
+    name = models.CharField(max_length=255)
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Inactive locations can still be drained but receive no stock"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['code']
+
+    def __str__(self):
+        return f"{self.code} ({self.name})"
+
+
+class LocationStock(models.Model):
+    """
+    A product's stock at one location.
+
+    Every change also moves Product.stock_quantity and
+    Product.located_quantity by the same amount in the same transaction,
+    so the product row keeps the precomputed total and stock reads,
+    low-stock queries and counters never sum over locations. Rows are
+    locked before the Product row, and several rows of a product in
+    ``location_id`` order, so concurrent transfers cannot deadlock.
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        db_index=False,
+        related_name='location_stock'
+    )
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.PROTECT,
+        related_name='stock'
+    )
+    quantity = models.IntegerField(
+        default=0,
+        validators=[MinValueValidator(0)]
+    )
+
+    class Meta:
+        ordering = ['product', 'location']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product', 'location'], name='inventory_location_stock_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}@{self.location_id}: {self.quantity}"
+
+
+class StockReservation(models.Model):
+    """
+    Quantity held for a pending checkout until it is committed, released
+    or expires.
+
+    Active reservations are summed into Product.reserved_quantity as they
+    change, so available stock is read from a single row. Expired
+    reservations are reclaimed in batches by the sweep_reservations
+    command.
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        COMMITTED = 'committed', 'Committed'
+        RELEASED = 'released', 'Released'
+        EXPIRED = 'expired', 'Expired'
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='reservations'
+    )
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.ACTIVE
+    )
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Active reservations by expiry; serves the sweeper
+            models.Index(
+                fields=['expires_at'],
+                name='inventory_reservation_expiry',
+                condition=Q(status='active'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.quantity} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response for a client-supplied ``Idempotency-Key``.
+
+    Written in the same transaction as the stock change it guards, so a
+    key exists if and only if its adjustment committed. Replays are served
+    from ``response_body`` without touching Product.
+    """
+
+    key = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Client-supplied Idempotency-Key header value"
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the method, path and body of the first request"
+    )
+    response_status = models.PositiveSmallIntegerField()
+    response_body = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Serves the batched purge of expired keys
+            models.Index(fields=['expires_at'], name='inventory_idempotency_expiry'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.response_status})"
@@ -1,5 +1,12 @@
+import time
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Product
+from .models import Product, StockMovement, StockReservation
+from .services import InventoryService
+from .helpers.export import format_datetime
+from .helpers.metrics import add_serialization_time
 
 class ProductSerializer(serializers.ModelSerializer):
     """Serializer for Product model."""
@@ -14,6 +21,102 @@ class ProductSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def to_representation(self, instance):
+        started = time.perf_counter()
+        data = super().to_representation(instance)
+        add_serialization_time(time.perf_counter() - started)
+        return data
+    
+    def validate_stock_quantity(self, value):
+        if self.instance is None:
+            return value
+        if self.instance.stock_shards and value != self.instance.stock_quantity:
+            raise serializers.ValidationError(
+                "Stock of a sharded product can only change through stock adjustments"
+            )
+        held = self.instance.reserved_quantity + self.instance.located_quantity
+        if value < held:
+            raise serializers.ValidationError(
+                f"Stock quantity cannot drop below the {held} units held by reservations and locations"
+            )
+        return value
+    
+    def _user_id(self):
+        request = self.context.get('request')
+        return request.user.id if request is not None else None
+    
+    def create(self, validated_data):
+        return InventoryService.save_product(Product(**validated_data), user_id=self._user_id())
+    
+    def update(self, instance, validated_data):
+        # Write only the submitted columns: the instance was loaded without a
+        # lock, and reserved/located quantities and shards may have moved since
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        return InventoryService.save_product(
+            instance, update_fields=list(validated_data), user_id=self._user_id()
+        )
+
+# Columns read by the fast path below, i.e. ProductSerializer minus is_low_stock
+PRODUCT_VALUE_FIELDS = [
+    'id', 'name', 'description', 'stock_quantity', 'low_stock_threshold',
+    'is_active', 'created_at', 'updated_at',
+]
+
+def product_row_to_representation(row, tz=None):
+    """
+    ProductSerializer output for one ``.values(*PRODUCT_VALUE_FIELDS)`` row.
+    
+    Read-only fast path: no model instance and no per-field objects, just
+    the same keys in the same order with is_low_stock computed inline.
+    """
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'description': row['description'],
+        'stock_quantity': row['stock_quantity'],
+        'low_stock_threshold': row['low_stock_threshold'],
+        'is_active': row['is_active'],
+        'is_low_stock': row['stock_quantity'] <= row['low_stock_threshold'],
+        'created_at': format_datetime(row['created_at'], tz),
+        'updated_at': format_datetime(row['updated_at'], tz),
+    }
+
+def serialize_product_rows(rows):
+    """Fast-path equivalent of ``ProductSerializer(rows, many=True).data``."""
+    started = time.perf_counter()
+    tz = timezone.get_current_timezone()
+    data = [product_row_to_representation(row, tz) for row in rows]
+    add_serialization_time(time.perf_counter() - started)
+    return data
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    """Read-only serializer for stock ledger entries."""
+    
+    class Meta:
+        model = StockMovement
+        fields = [
+            'id', 'product', 'delta', 'quantity_after',
+            'reason', 'actor', 'location', 'created_at'
+        ]
+        read_only_fields = fields
+
+class StockReservationSerializer(serializers.ModelSerializer):
+    """Read-only serializer for stock reservations."""
+    
+    class Meta:
+        model = StockReservation
+        fields = ['id', 'product', 'quantity', 'status', 'expires_at', 'created_at']
+        read_only_fields = fields
+
+class StockReservationRequestSerializer(serializers.Serializer):
+    """Serializer for reserve requests."""
+    
+    quantity = serializers.IntegerField(min_value=1)
+    ttl_seconds = serializers.IntegerField(
+        min_value=1, max_value=settings.INVENTORY_RESERVATION_MAX_TTL, required=False
+    )
 
 class StockAdjustmentSerializer(serializers.Serializer):
     """Serializer for stock adjustment operations."""
@@ -23,4 +126,38 @@ class StockAdjustmentSerializer(serializers.Serializer):
     def validate_quantity(self, value):
         if value <= 0:
             raise serializers.ValidationError("Quantity must be positive")
-        return value
\ No newline at end of file
+        return value
+
+class StockTransferSerializer(StockAdjustmentSerializer):
+    """Serializer for transfers between two locations."""
+    
+    from_location = serializers.IntegerField(min_value=1)
+    to_location = serializers.IntegerField(min_value=1)
+    
+    def validate(self, attrs):
+        if attrs['from_location'] == attrs['to_location']:
+            raise serializers.ValidationError("Source and destination locations must differ")
+        return attrs
+
+class StockAdjustmentItemSerializer(StockAdjustmentSerializer):
+    """Serializer for one item of a bulk stock adjustment."""
+    
+    quantity = None
+    product_id = serializers.IntegerField(min_value=1)
+    delta = serializers.IntegerField()
+    
+    def validate_delta(self, value):
+        # Same rules as a single adjustment, applied to the magnitude
+        self.validate_quantity(abs(value))
+        return value
+
+class BulkStockAdjustmentSerializer(serializers.Serializer):
+    """Serializer for bulk stock adjustment requests."""
+    
+    MAX_ITEMS = 10000
+    
+    # A ListSerializer validates every item with one shared child instance
+    items = StockAdjustmentItemSerializer(
+        many=True, allow_empty=False, max_length=MAX_ITEMS
+    )
+    atomic = serializers.BooleanField(default=True)
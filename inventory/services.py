@@ -1,37 +1,459 @@
-from django.db import transaction
-from .models import Product
-from .helpers.exceptions import InsufficientStockException
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, NoReturn, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import (
+    Location,
+    LocationStock,
+    Product,
+    StockMovement,
+    StockReservation,
+    StockShard,
+)
+from .helpers.cache import (
+    aget_cached_summary,
+    get_cached_summary,
+    invalidate_inventory_summary,
+    product_cache,
+)
+from .helpers.exceptions import (
+    BulkAdjustmentError,
+    InsufficientStockException,
+    PreconditionFailedError,
+    ReservationError,
+    ShardedStockError,
+)
+from .helpers.counters import (
+    aread_counters,
+    ascan_counts,
+    counters_enabled,
+    read_counters,
+    scan_counts,
+)
+from .helpers.events import record_low_stock_events, record_low_stock_transitions
+from .helpers.locations import add_location_stock, take_location_stock
+from .helpers.coalescing import (
+    CoalescingBuffer,
+    PendingIncrement,
+    register_shutdown_flush,
+)
+from .helpers.stock_shards import (
+    lock_shard_total,
+    shard_total,
+    split_evenly,
+    spread_shard_update,
+    try_shard_update,
+)
+
+# Number of products touched by each set-based UPDATE in bulk adjustments
+BULK_CHUNK_SIZE = 1000
+
+# Expired reservations reclaimed per sweeper transaction
+RESERVATION_SWEEP_BATCH_SIZE = 1000
+
+
+def _conditional_stock_update(product_id: int, delta: int, now,
+                               reserved_delta: int = 0,
+                               versions: Optional[List] = None,
+                               located_delta: int = 0) -> Optional[Product]:
+    """
+    Apply ``delta`` to a product's stock in a single conditional UPDATE.
+
+    ``reserved_delta`` moves Product.reserved_quantity and
+    ``located_delta`` Product.located_quantity in the same statement. The
+    WHERE clause only matches unsharded products whose new stock still
+    covers the new reserved and located quantities, so the row lock taken
+    by the UPDATE is the only synchronisation needed. ``updated_at`` is only touched
+    when stock changes. With ``versions`` (from If-Match) the row must also
+    still have one of those ``updated_at`` values. On PostgreSQL the new
+    row is returned with RETURNING; other backends re-read it by primary key.
+
+    Returns:
+        The updated Product, or None when no row matched
+    """
+    if versions is not None and not versions:
+        return None
+    required = reserved_delta + located_delta - delta
+
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        fields = Product._meta.concrete_fields
+        stock, reserved = qn('stock_quantity'), qn('reserved_quantity')
+        located = qn('located_quantity')
+        assignments = [f"{stock} = {stock} + %s", f"{reserved} = {reserved} + %s"]
+        params = [delta, reserved_delta]
+        if located_delta:
+            assignments.append(f"{located} = {located} + %s")
+            params.append(located_delta)
+        if delta:
+            assignments.append(f"{qn('updated_at')} = %s")
+            params.append(now)
+        conditions = [
+            f"{qn('id')} = %s", f"{qn('stock_shards')} = 0",
+            f"{stock} - {reserved} - {located} >= %s",
+        ]
+        params += [product_id, required]
+        if versions is not None:
+            conditions.append(f"{qn('updated_at')} IN ({', '.join(['%s'] * len(versions))})")
+            params += versions
+        sql = (
+            f"UPDATE {qn(Product._meta.db_table)} "
+            f"SET {', '.join(assignments)} "
+            f"WHERE {' AND '.join(conditions)} "
+            f"RETURNING {', '.join(qn(field.column) for field in fields)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return Product.from_db(
+            connection.alias, [field.attname for field in fields], row
+        )
+
+    changes = {
+        'stock_quantity': F('stock_quantity') + delta,
+        'reserved_quantity': F('reserved_quantity') + reserved_delta,
+        'located_quantity': F('located_quantity') + located_delta,
+    }
+    if delta:
+        changes['updated_at'] = now
+    matching = Product.objects.filter(id=product_id, stock_shards=0)
+    if versions is not None:
+        matching = matching.filter(updated_at__in=versions)
+    updated = matching.alias(
+        headroom=F('stock_quantity') - F('reserved_quantity') - F('located_quantity')
+    ).filter(headroom__gte=required).update(**changes)
+    if not updated:
+        return None
+    return Product.objects.get(id=product_id)
+
+
+def _raise_stock_shortfall(product_id: int, requested: int,
+                           versions: Optional[List] = None) -> NoReturn:
+    """
+    Explain why a conditional update matched nothing.
+
+    Raises:
+        Product.DoesNotExist: If the product does not exist
+        ShardedStockError: If the product's stock is sharded
+        PreconditionFailedError: If it no longer has one of ``versions``
+        InsufficientStockException: If available stock is short of ``requested``
+    """
+    state = Product.objects.filter(id=product_id).values_list(
+        F('stock_quantity') - F('reserved_quantity') - F('located_quantity'),
+        'stock_shards', 'updated_at'
+    ).first()
+    if state is None:
+        raise Product.DoesNotExist(
+            f"Product with id {product_id} does not exist"
+        )
+    available, shards, updated_at = state
+    if shards:
+        raise ShardedStockError(
+            f"Product {product_id} keeps its stock in {shards} shards"
+        )
+    if versions is not None and updated_at not in versions:
+        raise PreconditionFailedError(f"Product {product_id} has changed")
+    raise InsufficientStockException(
+        f"Insufficient stock. Available: {available}, "
+        f"Requested: {requested}"
+    )
+
+
+def _bulk_stock_update(deltas: Dict[int, int], now) -> Dict[int, int]:
+    """
+    Apply pre-checked ``{product_id: delta}`` pairs in one UPDATE.
+
+    Rows whose new stock would no longer cover their reserved and located
+    quantities are left untouched.
+
+    PostgreSQL joins the table against a VALUES list; other backends
+    fall back to a CASE expression keyed on the primary key.
+
+    Returns:
+        Mapping of product ID to its new stock quantity
+    """
+    if connection.vendor == 'postgresql':
+        qn = connection.ops.quote_name
+        stock = qn('stock_quantity')
+        values = ', '.join(['(%s::bigint, %s::integer)'] * len(deltas))
+        sql = (
+            f"UPDATE {qn(Product._meta.db_table)} AS p "
+            f"SET {stock} = p.{stock} + v.delta, {qn('updated_at')} = %s "
+            f"FROM (VALUES {values}) AS v (id, delta) "
+            f"WHERE p.{qn('id')} = v.id "
+            f"AND p.{stock} + v.delta >= p.{qn('reserved_quantity')} + p.{qn('located_quantity')} "
+            f"RETURNING p.{qn('id')}, p.{stock}"
+        )
+        params = [now]
+        for product_id, delta in deltas.items():
+            params.extend((product_id, delta))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return dict(cursor.fetchall())
+
+    Product.objects.filter(id__in=deltas).update(
+        stock_quantity=F('stock_quantity') + Case(
+            *(When(id=product_id, then=Value(delta))
+              for product_id, delta in deltas.items()),
+            output_field=IntegerField(),
+        ),
+        updated_at=now,
+    )
+    return dict(
+        Product.objects.filter(id__in=deltas).values_list('id', 'stock_quantity')
+    )
+
+
+def _low_stock_thresholds(products: Iterable) -> Dict[int, int]:
+    """``{id: low_stock_threshold}`` of the active ones among ``products``."""
+    return {
+        product.id: product.low_stock_threshold for product in products if product.is_active
+    }
+
+
+def _record_movements(changes: List[Tuple[int, int, int]], reason: str,
+                      user_id: Optional[int], now, invalidate: bool = True,
+                      thresholds: Optional[Dict[int, int]] = None,
+                      location_id: Optional[int] = None) -> None:
+    """
+    Append ledger rows for applied ``(product_id, delta, quantity_after)``
+    changes and invalidate derived data once they commit. Must run inside
+    the transaction that applied them.
+
+    ``thresholds`` (see _low_stock_thresholds) also records a low-stock
+    event for every change crossing its product's threshold. Changes at
+    a ``location_id`` carry the quantity at that location instead of the
+    product total, so they must not be given ``thresholds``.
+    """
+    if thresholds:
+        record_low_stock_events(changes, thresholds, now)
+    if invalidate:
+        invalidate_inventory_summary()
+        product_cache.invalidate(product_id for product_id, _, _ in changes)
+    StockMovement.objects.bulk_create([
+        StockMovement(
+            product_id=product_id,
+            delta=delta,
+            quantity_after=quantity_after,
+            reason=reason,
+            actor_id=user_id,
+            location_id=location_id,
+            created_at=now,
+        )
+        for product_id, delta, quantity_after in changes
+    ])
+
+
+def _raise_location_shortfall(product_id: int, location_id: int, requested: int) -> NoReturn:
+    """
+    Explain why stock could not be taken from a location.
+
+    Raises:
+        Product.DoesNotExist: If the product does not exist
+        Location.DoesNotExist: If the location does not exist
+        InsufficientStockException: If the location holds less than ``requested``
+    """
+    held = LocationStock.objects.filter(
+        product_id=product_id, location_id=location_id
+    ).values_list('quantity', flat=True).first()
+    if held is None:
+        if not Product.objects.filter(id=product_id).exists():
+            raise Product.DoesNotExist(f"Product with id {product_id} does not exist")
+        if not Location.objects.filter(id=location_id).exists():
+            raise Location.DoesNotExist(f"Location with id {location_id} does not exist")
+    raise InsufficientStockException(
+        f"Insufficient stock at location {location_id}. Available: {held or 0}, "
+        f"Requested: {requested}"
+    )
+
+
+def _flush_increments(batch: Dict[int, List[PendingIncrement]]) -> None:
+    """
+    Apply buffered increments with one UPDATE per product.
+
+    Products are updated in primary key order inside one transaction, and
+    every buffered call still gets its own ledger row. Increments for
+    sharded or missing products are retried one by one through
+    adjust_stock, so each reports its own outcome. Results are handed out
+    only after the transaction commits; if it rolls back, every increment
+    of the batch gets the error.
+    """
+    leftovers = []
+    applied_to = []
+    with transaction.atomic():
+        now = timezone.now()
+        changes = defaultdict(list)
+        products = []
+        for product_id in sorted(batch):
+            pending = batch[product_id]
+            total = sum(increment.quantity for increment in pending)
+            product = _conditional_stock_update(product_id, total, now)
+            if product is None:
+                leftovers.append(product_id)
+                continue
+            products.append(product)
+            quantity = product.stock_quantity - total
+            for increment in pending:
+                quantity += increment.quantity
+                changes[increment.user_id].append((product_id, increment.quantity, quantity))
+                applied_to.append((increment, product))
+        thresholds = _low_stock_thresholds(products)
+        for user_id, applied in changes.items():
+            _record_movements(
+                applied, StockMovement.Reason.INCREASE, user_id, now, thresholds=thresholds
+            )
+    for increment, product in applied_to:
+        increment.result = product
+
+    for product_id in leftovers:
+        for increment in batch[product_id]:
+            try:
+                increment.result = InventoryService.adjust_stock(
+                    product_id, increment.quantity,
+                    StockMovement.Reason.INCREASE, increment.user_id
+                )
+            except Exception as exc:
+                increment.error = exc
+
 
 class InventoryService:
     """Service class for inventory operations."""
-    
+
     @staticmethod
     @transaction.atomic
-    def increase_stock(product_id: int, quantity: int) -> Product:
+    def adjust_stock(product_id: int, delta: int, reason: str,
+                     user_id: Optional[int] = None,
+                     versions: Optional[List] = None) -> Product:
+        """
+        Apply a signed stock delta without a read-modify-write cycle.
+
+        Stock held by active reservations cannot be taken. Products with
+        sharded stock are adjusted one shard at a time instead. The change is recorded in the stock movement ledger within the
+        same transaction.
+
+        Args:
+            product_id: ID of the product
+            delta: Quantity to add (positive) or remove (negative)
+            reason: StockMovement.Reason value for the ledger entry
+            user_id: ID of the user making the change, if known
+            versions: ``updated_at`` values accepted by an If-Match, if any
+
+        Returns:
+            Updated Product instance
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+            InsufficientStockException: If the delta would make stock negative
+            PreconditionFailedError: If the product is not at one of ``versions``
+        """
+        now = timezone.now()
+        product = _conditional_stock_update(product_id, delta, now, versions=versions)
+        if product is not None:
+            _record_movements(
+                [(product_id, delta, product.stock_quantity)], reason, user_id, now,
+                thresholds=_low_stock_thresholds([product])
+            )
+            return product
+
+        shards, updated_at = Product.objects.filter(id=product_id).values_list(
+            'stock_shards', 'updated_at'
+        ).first() or (0, None)
+        if shards:
+            # Shard writes never move updated_at, so checking it once is enough
+            if versions is not None and updated_at not in versions:
+                raise PreconditionFailedError(f"Product {product_id} has changed")
+            return InventoryService._adjust_sharded_stock(
+                product_id, delta, shards, reason, user_id, now
+            )
+        
+        # Nothing matched: find out whether the product is missing, changed or short.
+        _raise_stock_shortfall(product_id, -delta, versions)
+    
+    @staticmethod
+    def _adjust_sharded_stock(product_id: int, delta: int, shards: int,
+                              reason: str, user_id: Optional[int], now) -> Product:
+        """
+        Apply ``delta`` to one of a sharded product's shards.
+
+        Falls back to locking every shard when no single unlocked shard
+        can cover a decrement. The Product row is only read, never locked,
+        and its stock_quantity snapshot is left for the rebalancer, so
+        cached product data is not invalidated. The returned Product
+        carries the live shard total, which is also the ledger's
+        quantity_after.
+
+        The total, and the threshold crossing derived from it, is read
+        under lock_shard_total, so concurrent adjustments see each
+        other's totals in commit order and no crossing is reported twice
+        or missed.
+        """
+        if not try_shard_update(product_id, shards, delta):
+            if spread_shard_update(product_id, delta) is None:
+                raise InsufficientStockException(
+                    f"Insufficient stock. Available: {shard_total(product_id)}, "
+                    f"Requested: {-delta}"
+                )
+        lock_shard_total(product_id)
+        total = shard_total(product_id)
+        product = Product.objects.get(id=product_id)
+        product.stock_quantity = total
+        # Events follow the live shard total, not the stock_quantity snapshot
+        _record_movements(
+            [(product_id, delta, total)], reason, user_id, now, invalidate=False,
+            thresholds=_low_stock_thresholds([product])
+        )
+        return product
+
+    @staticmethod
+    def increase_stock(product_id: int, quantity: int,
+                       user_id: Optional[int] = None,
+                       versions: Optional[List] = None) -> Optional[Product]:
         """
         Increase stock quantity for a product.
         
+        With INVENTORY_COALESCE_INCREMENTS on, calls made outside a
+        transaction go through the write-behind increment buffer. The
+        returned Product then reflects the whole flushed batch, and with
+        ``immediate`` durability nothing is returned at all. Calls inside
+        a transaction (e.g. under an Idempotency-Key) are never buffered,
+        since the increment must commit with them, and neither are calls
+        conditional on ``versions``.
+        
         Args:
             product_id: ID of the product
             quantity: Quantity to add (must be positive)
+            user_id: ID of the user making the change, if known
+            versions: ``updated_at`` values accepted by an If-Match, if any
             
         Returns:
-            Updated Product instance
+            Updated Product instance, or None once queued with
+            ``immediate`` durability
         """
-        product = Product.objects.get(id=product_id)
-        product.stock_quantity += quantity
-        product.save()
-        return product
+        if (stock_increment_buffer.enabled and versions is None
+                and not connection.in_atomic_block):
+            return stock_increment_buffer.add(product_id, quantity, user_id)
+        return InventoryService.adjust_stock(
+            product_id, quantity, StockMovement.Reason.INCREASE, user_id, versions
+        )
     
     @staticmethod
-    @transaction.atomic
-    def decrease_stock(product_id: int, quantity: int) -> Product:
+    def decrease_stock(product_id: int, quantity: int, user_id: Optional[int] = None,
+                       versions: Optional[List] = None) -> Product:
         """
         Decrease stock quantity for a product.
         
         Args:
             product_id: ID of the product
             quantity: Quantity to remove (must be positive)
+            user_id: ID of the user making the change, if known
+            versions: ``updated_at`` values accepted by an If-Match, if any
             
         Returns:
             Updated Product instance
@@ -39,47 +461,584 @@ class InventoryService:
         Raises:
             InsufficientStockException: If not enough stock available
         """
-        product = Product.objects.get(id=product_id)
+        return InventoryService.adjust_stock(
+            product_id, -quantity, StockMovement.Reason.DECREASE, user_id, versions
+        )
+    
+    @staticmethod
+    def bulk_adjust_stock(items: Iterable[Dict[str, Any]], atomic: bool = True,
+                          user_id: Optional[int] = None) -> Dict[str, list]:
+        """
+        Apply many signed stock deltas with a few set-based UPDATEs.
         
-        if not product.can_reduce_stock(quantity):
-            raise InsufficientStockException(
-                f"Insufficient stock. Available: {product.stock_quantity}, "
-                f"Requested: {quantity}"
-            )
+        Items are checked one by one in request order, each against the
+        stock left by the accepted items before it, so a failure is
+        reported against the item that caused it; the accepted items of a
+        product are then netted into a single delta. Rows are locked in
+        primary key order, so overlapping bulk requests cannot deadlock
+        each other. Products with sharded stock are rejected.
         
-        product.stock_quantity -= quantity
-        product.save()
+        Args:
+            items: Iterable of dicts with ``product_id`` and ``delta``
+            atomic: Reject the whole batch if any item fails; when False,
+                valid items are applied and failures are reported
+            user_id: ID of the user making the change, if known
+            
+        Returns:
+            Dict with ``applied`` (product_id, stock_quantity) and
+            ``failed`` (index, product_id, delta, error) lists
+            
+        Raises:
+            BulkAdjustmentError: If ``atomic`` and any item failed
+        """
+        items = list(items)
+        positions = defaultdict(list)
+        for index, item in enumerate(items):
+            positions[item['product_id']].append(index)
+        
+        applied, failed = [], []
+        product_ids = sorted(positions)
+        
+        with transaction.atomic():
+            for start in range(0, len(product_ids), BULK_CHUNK_SIZE):
+                chunk = product_ids[start:start + BULK_CHUNK_SIZE]
+                available, sharded, thresholds = {}, set(), {}
+                for product_id, headroom, shards, threshold, is_active in (
+                    Product.objects.select_for_update()
+                    .filter(id__in=chunk)
+                    .order_by('id')
+                    .values_list(
+                        'id', F('stock_quantity') - F('reserved_quantity') - F('located_quantity'),
+                        'stock_shards', 'low_stock_threshold', 'is_active'
+                    )
+                ):
+                    if shards:
+                        sharded.add(product_id)
+                    if is_active:
+                        thresholds[product_id] = threshold
+                    available[product_id] = headroom
+                # Stamped once the chunk's rows are locked (see helpers/sync.py)
+                now = timezone.now()
+                
+                ready = {}
+                for product_id in chunk:
+                    if product_id not in available:
+                        error = 'Product not found'
+                    elif product_id in sharded:
+                        error = 'Product uses sharded stock'
+                    else:
+                        error = None
+                    balance = available.get(product_id, 0)
+                    for index in positions[product_id]:
+                        delta = items[index]['delta']
+                        if error is None and balance + delta >= 0:
+                            balance += delta
+                            ready[product_id] = ready.get(product_id, 0) + delta
+                            continue
+                        failed.append({
+                            'index': index,
+                            'product_id': product_id,
+                            'delta': delta,
+                            'error': error or 'Insufficient stock available',
+                        })
+                
+                # An atomic batch is doomed once anything failed; keep
+                # checking the remaining chunks only to report every failure.
+                if ready and not (atomic and failed):
+                    quantities = _bulk_stock_update(ready, now)
+                    _record_movements(
+                        [(product_id, ready[product_id], quantity)
+                         for product_id, quantity in quantities.items()],
+                        StockMovement.Reason.BULK, user_id, now, thresholds=thresholds
+                    )
+                    applied.extend(
+                        {'product_id': product_id, 'stock_quantity': quantities[product_id]}
+                        for product_id in sorted(quantities)
+                    )
+            
+            failed.sort(key=lambda failure: failure['index'])
+            if atomic and failed:
+                raise BulkAdjustmentError(failed)
+        
+        return {'applied': applied, 'failed': failed}
+
+    @staticmethod
+    @transaction.atomic
+    def adjust_location_stock(product_id: int, location_id: int, delta: int, reason: str,
+                              user_id: Optional[int] = None) -> Tuple[Product, int]:
+        """
+        Apply a signed stock delta at one location.
+
+        The LocationStock row is changed first, then stock_quantity and
+        located_quantity move together on the Product row with the same
+        conditional UPDATE as adjust_stock, so the product keeps the
+        precomputed total and unassigned stock is left alone. Low-stock
+        events follow the product total; the ledger row records the
+        quantity at the location.
+
+        Args:
+            product_id: ID of the product
+            location_id: ID of the location
+            delta: Quantity to add (positive) or remove (negative)
+            reason: StockMovement.Reason value for the ledger entry
+            user_id: ID of the user making the change, if known
+
+        Returns:
+            ``(product, quantity at the location)``
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+            Location.DoesNotExist: If the location does not exist, or is
+                inactive and ``delta`` adds stock
+            InsufficientStockException: If the location holds less than ``-delta``
+            ShardedStockError: If the product's stock is sharded
+        """
+        now = timezone.now()
+        if delta >= 0:
+            at_location = add_location_stock(product_id, location_id, delta)
+            if at_location is None:
+                raise Location.DoesNotExist(
+                    f"Location with id {location_id} does not exist or is inactive"
+                )
+        else:
+            at_location = take_location_stock(product_id, location_id, -delta)
+            if at_location is None:
+                _raise_location_shortfall(product_id, location_id, -delta)
+
+        product = _conditional_stock_update(product_id, delta, now, located_delta=delta)
+        if product is None:
+            # Located stock is never short on the product row: missing or sharded
+            _raise_stock_shortfall(product_id, -delta)
+        thresholds = _low_stock_thresholds([product])
+        if thresholds:
+            record_low_stock_events([(product_id, delta, product.stock_quantity)], thresholds, now)
+        _record_movements(
+            [(product_id, delta, at_location)], reason, user_id, now, location_id=location_id
+        )
+        return product, at_location
+
+    @staticmethod
+    @transaction.atomic
+    def transfer_stock(product_id: int, from_location_id: int, to_location_id: int,
+                       quantity: int, user_id: Optional[int] = None) -> Dict[int, int]:
+        """
+        Move ``quantity`` of a product's stock from one location to another.
+
+        Both LocationStock rows are locked by the statements that change
+        them, in ``location_id`` order whichever way the stock moves, so
+        transfers between the same locations in opposite directions
+        queue instead of deadlocking. The product's total is unchanged,
+        so the Product row is neither locked nor written. Each side gets
+        a ledger row.
+
+        Returns:
+            ``{location_id: quantity now at the location}`` for both locations
+
+        Raises:
+            ValueError: If both locations are the same
+            Product.DoesNotExist: If the product does not exist
+            Location.DoesNotExist: If either location does not exist, or
+                the destination is inactive
+            InsufficientStockException: If the source holds less than ``quantity``
+        """
+        if from_location_id == to_location_id:
+            raise ValueError("A transfer needs two different locations")
+        now = timezone.now()
+        after = {}
+        for location_id in sorted((from_location_id, to_location_id)):
+            if location_id == from_location_id:
+                after[location_id] = take_location_stock(product_id, location_id, quantity)
+                if after[location_id] is None:
+                    _raise_location_shortfall(product_id, location_id, quantity)
+            else:
+                after[location_id] = add_location_stock(product_id, location_id, quantity)
+                if after[location_id] is None:
+                    raise Location.DoesNotExist(
+                        f"Location with id {location_id} does not exist or is inactive"
+                    )
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                product_id=product_id,
+                delta=delta,
+                quantity_after=after[location_id],
+                reason=StockMovement.Reason.TRANSFER,
+                actor_id=user_id,
+                location_id=location_id,
+                created_at=now,
+            )
+            for location_id, delta in ((from_location_id, -quantity), (to_location_id, quantity))
+        ])
+        return after
+
+    @staticmethod
+    def get_location_stock(product_id: int) -> Dict[str, Any]:
+        """
+        A product's stock split by location, plus its unassigned remainder.
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+        """
+        stock_quantity, located_quantity = Product.objects.values_list(
+            'stock_quantity', 'located_quantity'
+        ).get(id=product_id)
+        return {
+            'stock_quantity': stock_quantity,
+            'unassigned_quantity': stock_quantity - located_quantity,
+            'locations': [
+                {'location_id': location_id, 'code': code, 'quantity': quantity}
+                for location_id, code, quantity in LocationStock.objects.filter(
+                    product_id=product_id, quantity__gt=0
+                ).order_by('location__code').values_list('location_id', 'location__code', 'quantity')
+            ],
+        }
+
+    @staticmethod
+    def reserve_stock(product_id: int, quantity: int,
+                      ttl_seconds: Optional[int] = None) -> StockReservation:
+        """
+        Hold ``quantity`` of available stock for a pending checkout.
+
+        On-hand stock is untouched; only Product.reserved_quantity moves,
+        with the same single conditional UPDATE as a stock adjustment.
+
+        Args:
+            product_id: ID of the product
+            quantity: Quantity to hold (must be positive)
+            ttl_seconds: Lifetime of the hold, defaults to
+                INVENTORY_RESERVATION_TTL
+
+        Returns:
+            The new active StockReservation
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+            InsufficientStockException: If not enough stock is available
+            ShardedStockError: If the product's stock is sharded
+        """
+        now = timezone.now()
+        ttl = ttl_seconds or settings.INVENTORY_RESERVATION_TTL
+        with transaction.atomic():
+            if _conditional_stock_update(product_id, 0, now, reserved_delta=quantity) is None:
+                _raise_stock_shortfall(product_id, quantity)
+            return StockReservation.objects.create(
+                product_id=product_id,
+                quantity=quantity,
+                created_at=now,
+                expires_at=now + timedelta(seconds=ttl),
+            )
+
+    @staticmethod
+    def _close_reservation(reservation_id: int, status: str) -> StockReservation:
+        """Lock an active, unexpired reservation and move it to ``status``."""
+        reservation = StockReservation.objects.select_for_update().get(id=reservation_id)
+        if reservation.status != StockReservation.Status.ACTIVE:
+            raise ReservationError(
+                f"Reservation {reservation_id} is already {reservation.status}"
+            )
+        if reservation.expires_at <= timezone.now():
+            raise ReservationError(f"Reservation {reservation_id} has expired")
+        reservation.status = status
+        reservation.save(update_fields=['status'])
+        return reservation
+
+    @staticmethod
+    @transaction.atomic
+    def commit_reservation(reservation_id: int, user_id: Optional[int] = None) -> Product:
+        """
+        Turn an active reservation into a stock decrement.
+
+        Stock and reserved quantity drop together in one UPDATE, and the
+        decrement is recorded in the stock movement ledger.
+
+        Returns:
+            Updated Product instance
+
+        Raises:
+            StockReservation.DoesNotExist: If the reservation does not exist
+            ReservationError: If it is no longer active or has expired
+        """
+        reservation = InventoryService._close_reservation(
+            reservation_id, StockReservation.Status.COMMITTED
+        )
+        now = timezone.now()
+        product = _conditional_stock_update(
+            reservation.product_id, -reservation.quantity, now,
+            reserved_delta=-reservation.quantity
+        )
+        if product is None:
+            raise ReservationError(
+                f"Product {reservation.product_id} of reservation {reservation_id} no longer exists"
+            )
+        _record_movements(
+            [(product.id, -reservation.quantity, product.stock_quantity)],
+            StockMovement.Reason.RESERVATION, user_id, now,
+            thresholds=_low_stock_thresholds([product])
+        )
         return product
-    
+
+    @staticmethod
+    @transaction.atomic
+    def release_reservation(reservation_id: int) -> StockReservation:
+        """
+        Return an active reservation's quantity to available stock.
+
+        Raises:
+            StockReservation.DoesNotExist: If the reservation does not exist
+            ReservationError: If it is no longer active or has expired
+        """
+        reservation = InventoryService._close_reservation(
+            reservation_id, StockReservation.Status.RELEASED
+        )
+        _conditional_stock_update(
+            reservation.product_id, 0, None, reserved_delta=-reservation.quantity
+        )
+        return reservation
+
+    @staticmethod
+    def expire_reservations(batch_size: int = RESERVATION_SWEEP_BATCH_SIZE) -> int:
+        """
+        Reclaim up to ``batch_size`` expired reservations in one transaction.
+
+        Reservations are claimed with SKIP LOCKED, so concurrent sweepers
+        and in-flight commits never wait on each other. Products are then
+        locked in primary key order and their reserved quantities reduced
+        with one UPDATE.
+
+        Returns:
+            Number of reservations expired; 0 once none are left
+        """
+        with transaction.atomic():
+            expired = list(
+                StockReservation.objects.select_for_update(skip_locked=True)
+                .filter(status=StockReservation.Status.ACTIVE,
+                        expires_at__lte=timezone.now())
+                .order_by('expires_at')
+                .values_list('id', 'product_id', 'quantity')[:batch_size]
+            )
+            if not expired:
+                return 0
+
+            held = defaultdict(int)
+            for _, product_id, quantity in expired:
+                held[product_id] += quantity
+            StockReservation.objects.filter(
+                id__in=[reservation_id for reservation_id, _, _ in expired]
+            ).update(status=StockReservation.Status.EXPIRED)
+            list(
+                Product.objects.select_for_update()
+                .filter(id__in=held).order_by('id').values_list('id', flat=True)
+            )
+            Product.objects.filter(id__in=held).update(
+                reserved_quantity=F('reserved_quantity') - Case(
+                    *(When(id=product_id, then=Value(quantity))
+                      for product_id, quantity in held.items()),
+                    output_field=IntegerField(),
+                )
+            )
+            return len(expired)
+
+    @staticmethod
+    @transaction.atomic
+    def enable_stock_sharding(product_id: int, shards: int) -> Product:
+        """
+        Spread a product's stock evenly over ``shards`` StockShard rows.
+
+        Meant for flash-sale SKUs whose adjustments would otherwise queue
+        on the Product row lock. Sharded products cannot be reserved,
+        bulk adjusted or stocked at locations.
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+            ShardedStockError: If it is already sharded, has reservations
+                or holds stock at locations
+        """
+        if shards < 1:
+            raise ValueError("A sharded product needs at least one shard")
+        product = Product.objects.select_for_update().get(id=product_id)
+        if product.stock_shards:
+            raise ShardedStockError(f"Product {product_id} is already sharded")
+        if product.reserved_quantity:
+            raise ShardedStockError(
+                f"Product {product_id} has {product.reserved_quantity} units reserved"
+            )
+        if product.located_quantity:
+            raise ShardedStockError(
+                f"Product {product_id} has {product.located_quantity} units at locations"
+            )
+        StockShard.objects.bulk_create([
+            StockShard(product_id=product_id, shard=shard, quantity=quantity)
+            for shard, quantity in enumerate(split_evenly(product.stock_quantity, shards))
+        ])
+        product.stock_shards = shards
+        product.save(update_fields=['stock_shards', 'updated_at'])
+        return product
+
+    @staticmethod
+    @transaction.atomic
+    def disable_stock_sharding(product_id: int) -> Product:
+        """
+        Fold a sharded product's stock back into Product.stock_quantity.
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+        """
+        product = Product.objects.select_for_update().get(id=product_id)
+        if not product.stock_shards:
+            return product
+        shards = StockShard.objects.filter(product_id=product_id)
+        product.stock_quantity = sum(
+            shards.select_for_update().order_by('shard').values_list('quantity', flat=True)
+        )
+        shards.delete()
+        product.stock_shards = 0
+        product.save(update_fields=['stock_quantity', 'stock_shards', 'updated_at'])
+        return product
+
+    @staticmethod
+    @transaction.atomic
+    def rebalance_stock_shards(product_id: int) -> Product:
+        """
+        Even out a sharded product's shards and refresh its stock snapshot.
+
+        Decrements drain shards unevenly; moving quantity back keeps every
+        shard able to serve the fast path. Product.stock_quantity is set
+        to the shard total, so list, summary and low-stock reads catch up.
+        The Product row is locked before the shards, in the same order as
+        enabling and disabling sharding.
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+        """
+        product = Product.objects.select_for_update().get(id=product_id)
+        if not product.stock_shards:
+            return product
+        rows = list(
+            StockShard.objects.select_for_update()
+            .filter(product_id=product_id)
+            .order_by('shard')
+        )
+        total = sum(row.quantity for row in rows)
+        target = split_evenly(total, len(rows))
+        moved = [row for row, quantity in zip(rows, target) if row.quantity != quantity]
+        for row, quantity in zip(rows, target):
+            row.quantity = quantity
+        StockShard.objects.bulk_update(moved, ['quantity'])
+        if product.stock_quantity != total:
+            product.stock_quantity = total
+            product.save(update_fields=['stock_quantity', 'updated_at'])
+        return product
+
+    @staticmethod
+    @transaction.atomic
+    def save_product(product: Product, update_fields: Optional[List[str]] = None,
+                     reason: str = StockMovement.Reason.MANUAL,
+                     user_id: Optional[int] = None) -> Product:
+        """
+        Create a product, or save an edit made outside the stock endpoints.
+
+        An edit locks the row and writes only ``update_fields`` (plus
+        updated_at), so reservation, location and shard columns changed
+        since the instance was loaded are kept. A change of
+        stock_quantity, and a new product's opening stock, is recorded in
+        the stock movement ledger in the same transaction, as is a
+        low-stock event when the write moves the product into or out of
+        low stock (by stock, threshold or is_active).
+
+        Args:
+            product: New or edited Product instance
+            update_fields: Columns an edit writes; required for edits
+            reason: StockMovement.Reason value for the ledger entry
+            user_id: ID of the user making the change, if known
+        """
+        now = timezone.now()
+        if product.pk is None:
+            product.save()
+            before, state = 0, None
+        else:
+            before, threshold, is_active, shards = Product.objects.select_for_update().values_list(
+                'stock_quantity', 'low_stock_threshold', 'is_active', 'stock_shards'
+            ).get(pk=product.pk)
+            product.save(update_fields=[*update_fields, 'updated_at'])
+            # A sharded product's stock_quantity is a snapshot and cannot be
+            # edited; its low stock status follows the live shard total
+            if shards:
+                lock_shard_total(product.pk)
+            stock = shard_total(product.pk) if shards else before
+            state = (stock, threshold, is_active)
+        delta = product.stock_quantity - before
+        if delta:
+            # Caches are invalidated by the post_save signal
+            _record_movements(
+                [(product.pk, delta, product.stock_quantity)], reason, user_id, now,
+                invalidate=False
+            )
+        stock = state[0] if product.stock_shards else product.stock_quantity
+        record_low_stock_transitions([
+            (product.pk, state, (stock, product.low_stock_threshold, product.is_active))
+        ], now)
+        return product
+
+    @staticmethod
+    def get_stock_availability(product_id: int) -> Dict[str, int]:
+        """
+        On-hand, reserved and available stock for a product from one row.
+
+        Available stock is the unassigned part of on-hand stock (see
+        adjust_location_stock) that reservations do not hold. Sharded
+        products report the live sum of their shards.
+
+        Raises:
+            Product.DoesNotExist: If the product does not exist
+        """
+        availability = Product.objects.values(
+            'stock_quantity', 'reserved_quantity', 'stock_shards',
+            available_quantity=F('stock_quantity') - F('reserved_quantity') - F('located_quantity'),
+        ).get(id=product_id)
+        if availability.pop('stock_shards'):
+            total = shard_total(product_id)
+            availability['stock_quantity'] = availability['available_quantity'] = total
+        return availability
+
     @staticmethod
     def get_low_stock_products():
-        """Get all products that are below their low stock threshold."""
-        from django.db.models import F
-        
-        return Product.objects.filter(
-            is_active=True,
-            stock_quantity__lte=F('low_stock_threshold')
-        ).order_by('stock_quantity')
+        """Get all active products that are below their low stock threshold."""
+        return Product.objects.low_stock().order_by('stock_quantity')
 
     @staticmethod
     def get_stock_history(product_id: int):
-        """Get stock adjustment history for a product. (Stub implementation)"""
-        # Placeholder for stock history logic
-        return []
+        """
+        Get stock movements for a product, newest first.
+
+        Returns an unevaluated queryset; paginate it with
+        StockHistoryPagination so every page is an index range scan.
+        """
+        return StockMovement.objects.filter(product_id=product_id)
     
     @staticmethod
     def get_inventory_summary():
-        """Get overall inventory summary statistics. (Stub implementation)"""
-        from django.db.models import F
-        
-        total_products = Product.objects.count()
-        low_stock_count = Product.objects.filter(
-            stock_quantity__lte=F('low_stock_threshold')
-        ).count()
-        out_of_stock_count = Product.objects.filter(stock_quantity=0).count()
+        """
+        Get overall inventory summary statistics.
         
-        return {
-            'total_products': total_products,
-            'low_stock_products': low_stock_count,
-            'out_of_stock_products': out_of_stock_count
-        }
+        On PostgreSQL the counts are read from the trigger-maintained
+        counter shards in constant time; other backends aggregate over
+        every product. The result is cached until stock or thresholds
+        next change.
+        """
+        return get_cached_summary(InventoryService._compute_inventory_summary)
+    
+    @staticmethod
+    async def aget_inventory_summary():
+        """get_inventory_summary on the async ORM and cache APIs."""
+        return await aget_cached_summary(InventoryService._acompute_inventory_summary)
+    
+    @staticmethod
+    def _compute_inventory_summary():
+        return read_counters() if counters_enabled() else scan_counts()
+    
+    @staticmethod
+    async def _acompute_inventory_summary():
+        return await aread_counters() if counters_enabled() else await ascan_counts()
+
+
+stock_increment_buffer = CoalescingBuffer.from_settings(_flush_increments)
+register_shutdown_flush(stock_increment_buffer)
@@ -0,0 +1,28 @@
+"""
+Model signal handlers keeping derived inventory data in sync.
+
+Stock adjustments bypass these (they use queryset updates) and invalidate
+explicitly in InventoryService.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Product
+from .helpers.cache import invalidate_inventory_summary, product_cache
+from .helpers.metrics import install_query_recorder
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    """Invalidate cached data when a product is saved or deleted."""
+    invalidate_inventory_summary()
+    product_cache.invalidate([instance.pk])
+
+
+if settings.INVENTORY_METRICS:
+    # Count every query of a request, whichever thread runs it
+    connection_created.connect(install_query_recorder, dispatch_uid='inventory-query-metrics')
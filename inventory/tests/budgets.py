@@ -0,0 +1,47 @@
+"""
+Query budget assertions for endpoint tests.
+"""
+
+from contextlib import contextmanager
+from typing import Iterable, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from inventory.helpers.benchmarking import sequential_scans
+
+# Transaction bookkeeping, not work the endpoint asked the database to do
+IGNORED_PREFIXES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+@contextmanager
+def query_budget(limit: int):
+    """
+    Fail the test if the block runs more than ``limit`` queries.
+
+    Yields a list that is filled with the SQL of every counted query when
+    the block exits. Savepoints are not counted. Streaming responses must
+    be consumed inside the block.
+    """
+    executed: List[str] = []
+    with CaptureQueriesContext(connection) as context:
+        yield executed
+    executed.extend(
+        query['sql'] for query in context.captured_queries
+        if not query['sql'].startswith(IGNORED_PREFIXES)
+    )
+    if len(executed) > limit:
+        listing = '\n'.join(f'  {index}. {sql}' for index, sql in enumerate(executed, 1))
+        pytest.fail(f"{len(executed)} queries over a budget of {limit}:\n{listing}")
+
+
+def assert_no_sequential_scans(queries: Iterable[str], tables: Iterable[str]) -> None:
+    """Fail if PostgreSQL plans any captured SELECT as a Seq Scan on ``tables``."""
+    tables = set(tables)
+    for sql in queries:
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        scanned = tables.intersection(sequential_scans(sql))
+        if scanned:
+            pytest.fail(f"Sequential scan on {', '.join(sorted(scanned))}:\n  {sql}")
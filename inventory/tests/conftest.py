@@ -0,0 +1,30 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from inventory.helpers.cache import product_cache
+from inventory.models import Product
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached inventory data from leaking between tests."""
+    cache.clear()
+    product_cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def product():
+    return Product.objects.create(
+        name="Test Product",
+        description="Test Description",
+        stock_quantity=10,
+        low_stock_threshold=5
+    )
@@ -0,0 +1,69 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from inventory import async_views
+from inventory.models import Product
+
+
+@pytest.fixture
+def products():
+    return [
+        Product.objects.create(name=f"Async Product {i}", stock_quantity=i, low_stock_threshold=2)
+        for i in range(5)
+    ]
+
+
+def call_async(view, url, *args):
+    return async_to_sync(view)(RequestFactory().get(url), *args)
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """The async views must answer byte-for-byte like their DRF counterparts."""
+
+    @pytest.mark.parametrize('query', [
+        '', '?page_size=2', '?count=exact', '?search=product%203', '?low_stock=true',
+        '?min_stock=1&max_stock=3', '?search=ab', '?cursor=bogus',
+    ])
+    def test_product_list_matches_sync_view(self, products, query):
+        url = reverse('inventory:product-list-create') + query
+
+        expected = APIClient().get(url)
+        response = call_async(async_views.product_list, url)
+
+        assert response.status_code == expected.status_code
+        assert response.content == expected.content
+
+    def test_product_detail_matches_sync_view(self, products):
+        url = reverse('inventory:product-detail', args=[products[0].id])
+
+        expected = APIClient().get(url)
+        response = call_async(async_views.product_detail, url, products[0].id)
+
+        assert response.content == expected.content
+
+    def test_product_detail_not_found(self):
+        url = reverse('inventory:product-detail', args=[999999])
+
+        expected = APIClient().get(url)
+        response = call_async(async_views.product_detail, url, 999999)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.content == expected.content
+
+    @pytest.mark.parametrize('name', ['low-stock-products', 'inventory-summary'])
+    def test_low_stock_and_summary_match_sync_views(self, products, name):
+        url = reverse(f'inventory:{name}')
+        view = {
+            'low-stock-products': async_views.low_stock_products,
+            'inventory-summary': async_views.inventory_summary,
+        }[name]
+
+        expected = APIClient().get(url)
+        response = call_async(view, url)
+
+        assert response.content == expected.content
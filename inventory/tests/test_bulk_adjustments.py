@@ -0,0 +1,125 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from inventory.models import Product
+from inventory.services import InventoryService
+from inventory.helpers.exceptions import BulkAdjustmentError
+
+
+@pytest.fixture
+def products():
+    return [
+        Product.objects.create(name=f"Bulk Product {i}", stock_quantity=10)
+        for i in range(3)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkAdjustStockService:
+    def test_applies_all_deltas(self, products):
+        """Test every item is applied and new quantities are returned."""
+        items = [
+            {'product_id': products[0].id, 'delta': 5},
+            {'product_id': products[1].id, 'delta': -10},
+        ]
+
+        result = InventoryService.bulk_adjust_stock(items)
+
+        assert result['failed'] == []
+        assert result['applied'] == [
+            {'product_id': products[0].id, 'stock_quantity': 15},
+            {'product_id': products[1].id, 'stock_quantity': 0},
+        ]
+
+    def test_nets_duplicate_products(self, products):
+        """Test several items for one product are applied as a single delta."""
+        items = [
+            {'product_id': products[0].id, 'delta': -8},
+            {'product_id': products[0].id, 'delta': 3},
+            {'product_id': products[0].id, 'delta': -4},
+        ]
+
+        InventoryService.bulk_adjust_stock(items)
+
+        products[0].refresh_from_db()
+        assert products[0].stock_quantity == 1
+
+    def test_atomic_failure_rolls_back_everything(self, products):
+        """Test an all-or-nothing batch leaves stock untouched on failure."""
+        items = [
+            {'product_id': products[0].id, 'delta': 5},
+            {'product_id': products[1].id, 'delta': -11},
+            {'product_id': 999999, 'delta': 1},
+        ]
+
+        with pytest.raises(BulkAdjustmentError) as excinfo:
+            InventoryService.bulk_adjust_stock(items, atomic=True)
+
+        assert [f['index'] for f in excinfo.value.failures] == [1, 2]
+        assert excinfo.value.failures[1]['error'] == 'Product not found'
+        products[0].refresh_from_db()
+        assert products[0].stock_quantity == 10
+
+    def test_partial_mode_reports_failures(self, products):
+        """Test partial mode applies valid items and reports the rest."""
+        items = [
+            {'product_id': products[0].id, 'delta': 5},
+            {'product_id': products[1].id, 'delta': -11},
+        ]
+
+        result = InventoryService.bulk_adjust_stock(items, atomic=False)
+
+        assert result['applied'] == [
+            {'product_id': products[0].id, 'stock_quantity': 15},
+        ]
+        assert result['failed'] == [{
+            'index': 1,
+            'product_id': products[1].id,
+            'delta': -11,
+            'error': 'Insufficient stock available',
+        }]
+        products[1].refresh_from_db()
+        assert products[1].stock_quantity == 10
+
+    def test_partial_mode_reports_the_failing_item(self, products):
+        """Test only the item that overdraws a product fails, not its siblings."""
+        items = [
+            {'product_id': products[0].id, 'delta': -6},
+            {'product_id': products[0].id, 'delta': -6},
+            {'product_id': products[0].id, 'delta': 2},
+        ]
+
+        result = InventoryService.bulk_adjust_stock(items, atomic=False)
+
+        assert [failure['index'] for failure in result['failed']] == [1]
+        assert result['applied'] == [{'product_id': products[0].id, 'stock_quantity': 6}]
+
+
+@pytest.mark.django_db
+class TestBulkAdjustStockAPI:
+    url = reverse('inventory:bulk-stock-adjustments')
+
+    def test_bulk_adjust(self, api_client, products):
+        data = {'items': [{'product_id': p.id, 'delta': 2} for p in products]}
+
+        response = api_client.post(self.url, data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['data']['applied']) == 3
+
+    def test_bulk_adjust_atomic_failure(self, api_client, products):
+        data = {'items': [{'product_id': products[0].id, 'delta': -20}]}
+
+        response = api_client.post(self.url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['failed'][0]['index'] == 0
+
+    def test_bulk_adjust_rejects_zero_delta(self, api_client, products):
+        data = {'items': [{'product_id': products[0].id, 'delta': 0}]}
+
+        response = api_client.post(self.url, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'delta' in response.data['detail']['items'][0]
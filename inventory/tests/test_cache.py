@@ -0,0 +1,82 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from inventory.models import Product
+from inventory.services import InventoryService
+from inventory.helpers.cache import ProductCache, product_cache
+from inventory.helpers.stock_helpers import perform_stock_increase
+
+
+def detail_url(product):
+    return reverse('inventory:product-detail', args=[product.id])
+
+
+class TestProductCache:
+    def test_lru_is_bounded(self):
+        """Test the local tier evicts the least recently used entry."""
+        lru = ProductCache(max_entries=2)
+        for pk in (1, 2, 1, 3):
+            lru.get(pk, lambda: {'id': pk})
+
+        assert lru.stats() == {
+            'local_hits': 1, 'shared_hits': 0, 'misses': 3, 'local_entries': 2
+        }
+        lru.get(2, lambda: {'id': 2})
+        assert lru.stats()['misses'] == 4
+
+    def test_shared_tier(self):
+        """Test a second process-local cache is filled from the shared tier."""
+        first = ProductCache(max_entries=10, shared_alias='default')
+        second = ProductCache(max_entries=10, shared_alias='default')
+
+        first.get(1, lambda: {'id': 1})
+        payload = second.get(1, lambda: pytest.fail("loader should not run"))
+
+        assert payload == {'id': 1}
+        assert second.stats()['shared_hits'] == 1
+
+
+@pytest.mark.django_db
+class TestProductDetailCache:
+    def test_repeat_reads_skip_database(self, api_client, product, django_assert_num_queries):
+        api_client.get(detail_url(product))
+
+        with django_assert_num_queries(0):
+            response = api_client.get(detail_url(product))
+
+        assert response.data['stock_quantity'] == 10
+        assert product_cache.stats()['local_hits'] == 1
+
+    def test_save_invalidates(self, api_client, product, django_capture_on_commit_callbacks):
+        api_client.get(detail_url(product))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            product.name = "Renamed Product"
+            product.save()
+
+        assert api_client.get(detail_url(product)).data['name'] == "Renamed Product"
+
+    def test_stock_adjustments_invalidate(self, api_client, product,
+                                          django_capture_on_commit_callbacks):
+        api_client.get(detail_url(product))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            InventoryService.decrease_stock(product.id, 4)
+        assert api_client.get(detail_url(product)).data['stock_quantity'] == 6
+
+        with django_capture_on_commit_callbacks(execute=True):
+            perform_stock_increase(product.id, 5, user_id=None)
+        assert api_client.get(detail_url(product)).data['stock_quantity'] == 11
+
+        with django_capture_on_commit_callbacks(execute=True):
+            InventoryService.bulk_adjust_stock([{'product_id': product.id, 'delta': -1}])
+        assert api_client.get(detail_url(product)).data['stock_quantity'] == 10
+
+    def test_delete_invalidates(self, api_client, product, django_capture_on_commit_callbacks):
+        api_client.get(detail_url(product))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(detail_url(product))
+
+        assert api_client.get(detail_url(product)).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,99 @@
+import pytest
+
+from inventory import services
+from inventory.models import Product, StockMovement
+from inventory.services import _flush_increments
+from inventory.helpers.coalescing import CoalescingBuffer, DURABILITY_IMMEDIATE
+
+
+@pytest.fixture
+def buffer():
+    # Flushed by hand: no background thread, no shutdown hook
+    return CoalescingBuffer(
+        _flush_increments, enabled=True, durability=DURABILITY_IMMEDIATE,
+        background=False
+    )
+
+
+@pytest.fixture
+def products():
+    return [
+        Product.objects.create(name=f"Dock Product {i}", stock_quantity=10)
+        for i in range(2)
+    ]
+
+
+@pytest.mark.django_db
+class TestCoalescingBuffer:
+    def test_increments_apply_only_on_flush(self, buffer, products):
+        for _ in range(3):
+            assert buffer.add(products[0].id, 1) is None
+
+        products[0].refresh_from_db()
+        assert products[0].stock_quantity == 10
+        assert buffer.flush() == 3
+        products[0].refresh_from_db()
+        assert products[0].stock_quantity == 13
+
+    def test_each_buffered_call_keeps_its_ledger_row(self, buffer, products):
+        """Test one UPDATE per product still leaves one movement per increment."""
+        buffer.add(products[0].id, 1)
+        buffer.add(products[0].id, 2)
+        buffer.add(products[1].id, 5)
+
+        buffer.flush()
+
+        movements = StockMovement.objects.filter(product=products[0]).order_by('id')
+        assert [(m.delta, m.quantity_after) for m in movements] == [(1, 11), (2, 13)]
+        assert StockMovement.objects.get(product=products[1]).quantity_after == 15
+
+    def test_missing_product_does_not_block_the_batch(self, buffer, products):
+        buffer.add(999999, 1)
+        buffer.add(products[0].id, 1)
+
+        buffer.flush()
+
+        products[0].refresh_from_db()
+        assert products[0].stock_quantity == 11
+        assert buffer.stats()['failed_ops'] == 1
+
+    def test_rolled_back_flush_fails_every_increment(self, buffer, products, monkeypatch):
+        """Test no increment is acknowledged when the batch transaction rolls back."""
+        def fail(*args, **kwargs):
+            raise RuntimeError("ledger unavailable")
+
+        monkeypatch.setattr(services, '_record_movements', fail)
+        for product in products:
+            buffer.add(product.id, 1)
+
+        buffer.flush()
+
+        stats = buffer.stats()
+        assert (stats['flushed_ops'], stats['failed_ops']) == (0, 2)
+        products[0].refresh_from_db()
+        assert products[0].stock_quantity == 10
+
+    def test_unflushed_wait_times_out_and_is_withdrawn(self, products):
+        buffer = CoalescingBuffer(
+            _flush_increments, enabled=True, background=False, wait_timeout_ms=10
+        )
+
+        with pytest.raises(TimeoutError):
+            buffer.add(products[0].id, 1)
+        assert buffer.stats()['pending_ops'] == 0
+        assert buffer.flush() == 0
+
+    def test_stats_report_batch_size_and_latency(self, buffer, products):
+        for product in products:
+            buffer.add(product.id, 1)
+        buffer.flush()
+
+        stats = buffer.stats()
+        assert stats['flushes'] == 1
+        assert stats['flushed_ops'] == 2
+        assert stats['batch_size']['max'] == 2
+        assert stats['flush_latency_ms']['p50'] > 0
+
+    def test_rejects_unknown_durability(self):
+        with pytest.raises(ValueError):
+            CoalescingBuffer(_flush_increments, durability='eventually')
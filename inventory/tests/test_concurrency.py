@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection, connections
+
+from inventory.models import Location, LocationStock, Product, StockMovement
+from inventory.services import InventoryService
+from inventory.helpers.exceptions import InsufficientStockException
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason="Row-level locking semantics need PostgreSQL"
+)
+
+WORKERS = 16
+
+
+def _run_in_thread(func, *args):
+    """Run func on a worker thread and release its connection afterwards."""
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
+
+
+def _decrement(product_id):
+    try:
+        InventoryService.decrease_stock(product_id, 1)
+        return True
+    except InsufficientStockException:
+        return False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentStockAdjustments:
+    def test_parallel_decrements_lose_no_updates(self):
+        """Every successful decrement is reflected and stock never goes negative."""
+        product = Product.objects.create(name="Hot SKU", stock_quantity=250)
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            results = list(pool.map(
+                lambda _: _run_in_thread(_decrement, product.id), range(300)
+            ))
+
+        product.refresh_from_db()
+        assert results.count(True) == 250
+        assert results.count(False) == 50
+        assert product.stock_quantity == 0
+
+    def test_parallel_increments_and_decrements(self):
+        """Interleaved increments and decrements sum exactly."""
+        product = Product.objects.create(name="Busy SKU", stock_quantity=1000)
+
+        def adjust(i):
+            if i % 2:
+                return InventoryService.increase_stock(product.id, 3)
+            return InventoryService.decrease_stock(product.id, 2)
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            list(pool.map(lambda i: _run_in_thread(adjust, i), range(400)))
+
+        product.refresh_from_db()
+        assert product.stock_quantity == 1000 + 200 * 3 - 200 * 2
+
+    def test_opposite_transfers_do_not_deadlock(self):
+        """Transfers A->B and B->A lock rows in the same order, so none aborts."""
+        product = Product.objects.create(name="Shuttled SKU")
+        east = Location.objects.create(code='east', name="East")
+        west = Location.objects.create(code='west', name="West")
+        for location in (east, west):
+            InventoryService.adjust_location_stock(
+                product.id, location.id, 500, StockMovement.Reason.INCREASE
+            )
+
+        def transfer(i):
+            source, target = (east, west) if i % 2 else (west, east)
+            InventoryService.transfer_stock(product.id, source.id, target.id, 1)
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            list(pool.map(lambda i: _run_in_thread(transfer, i), range(400)))
+
+        quantities = dict(
+            LocationStock.objects.filter(product=product).values_list('location__code', 'quantity')
+        )
+        assert quantities == {'east': 500, 'west': 500}
+        product.refresh_from_db()
+        assert (product.stock_quantity, product.located_quantity) == (1000, 1000)
@@ -0,0 +1,84 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from inventory.models import InventoryCounter, Product
+from inventory.services import InventoryService
+from inventory.helpers.counters import read_counters, reconcile_counters, scan_counts
+from inventory.helpers.importers import ProductImporter
+from inventory.helpers.stock_helpers import perform_stock_decrease
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason="Counters are maintained by PostgreSQL triggers"),
+]
+
+
+def assert_counters_match():
+    assert read_counters() == scan_counts()
+
+
+class TestCounterTriggers:
+    def test_create_update_delete(self, product):
+        assert_counters_match()
+
+        product.low_stock_threshold = 20
+        product.save()
+        assert_counters_match()
+
+        product.delete()
+        assert_counters_match()
+
+    def test_stock_adjustments_on_every_path(self, product):
+        api_client = APIClient()
+
+        api_client.post(
+            reverse('inventory:decrease-stock', args=[product.id]), {'quantity': 6}, format='json'
+        )
+        assert_counters_match()
+        perform_stock_decrease(product.id, 4, user_id=None)
+        assert read_counters()['out_of_stock_products'] == scan_counts()['out_of_stock_products'] == 1
+        InventoryService.adjust_stock(product.id, 12, 'increase')
+        assert_counters_match()
+
+    def test_bulk_writes_and_imports(self):
+        products = Product.objects.bulk_create([
+            Product(name=f"Counted {i}", stock_quantity=i, low_stock_threshold=3) for i in range(10)
+        ])
+        InventoryService.bulk_adjust_stock(
+            [{'product_id': product.id, 'delta': 2} for product in products]
+        )
+        assert_counters_match()
+
+        ProductImporter().run([
+            {'name': 'Counted 0', 'stock_quantity': 0},
+            {'name': 'Counted New', 'stock_quantity': 1},
+        ])
+        Product.objects.filter(name__startswith='Counted').update(low_stock_threshold=5)
+        assert_counters_match()
+
+    def test_summary_reads_the_counters(self, product, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            summary = InventoryService.get_inventory_summary()
+        assert summary == scan_counts()
+
+    def test_api_delete_through_detail_view(self, product):
+        response = APIClient().delete(reverse('inventory:product-detail', args=[product.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert_counters_match()
+
+
+class TestVerifyCounters:
+    def test_detects_and_fixes_drift(self, product):
+        assert reconcile_counters() == {}
+
+        InventoryCounter.objects.update(total_products=0)
+        with pytest.raises(CommandError):
+            call_command('verify_counters')
+
+        call_command('verify_counters', '--fix')
+        assert reconcile_counters() == {}
+        assert_counters_match()
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from inventory_management.db.pool import ConnectionPool, PoolTimeout
+from inventory_management.db.postgresql_pool.base import DatabaseWrapper
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def usable(conn):
+    return True
+
+
+def broken(conn):
+    return False
+
+
+class TestConnectionPool:
+    def test_released_connection_is_reused(self):
+        pool = ConnectionPool(max_size=2)
+        first = pool.acquire(FakeConnection, usable)
+        pool.release(first, reusable=True)
+
+        assert pool.acquire(FakeConnection, usable) is first
+        stats = pool.stats()
+        assert stats['checkouts'] == 2
+        assert stats['connects'] == 1
+        assert stats['in_use'] == 1
+
+    def test_unreusable_connection_is_closed(self):
+        pool = ConnectionPool(max_size=2)
+        conn = pool.acquire(FakeConnection, usable)
+        pool.release(conn, reusable=False)
+
+        assert conn.closed
+        assert pool.acquire(FakeConnection, usable) is not conn
+        assert pool.stats()['discarded'] == 1
+
+    def test_exhausted_pool_times_out(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        pool.acquire(FakeConnection, usable)
+
+        with pytest.raises(PoolTimeout):
+            pool.acquire(FakeConnection, usable)
+        assert pool.stats()['timeouts'] == 1
+
+    def test_waiting_checkout_gets_released_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        conn = pool.acquire(FakeConnection, usable)
+        timer = threading.Timer(0.05, pool.release, args=(conn, True))
+        timer.start()
+
+        assert pool.acquire(FakeConnection, usable) is conn
+        timer.join()
+        assert pool.stats()['waits'] == 1
+
+    def test_stale_connection_failing_health_check_is_replaced(self):
+        pool = ConnectionPool(max_size=1, check_after=0)
+        stale = pool.acquire(FakeConnection, usable)
+        pool.release(stale, reusable=True)
+
+        fresh = pool.acquire(FakeConnection, broken)
+        assert fresh is not stale
+        assert stale.closed
+        assert pool.stats()['open'] == 1
+
+    def test_idle_connections_past_max_idle_are_closed(self):
+        pool = ConnectionPool(max_size=2, max_idle=0)
+        conn = pool.acquire(FakeConnection, usable)
+        pool.release(conn, reusable=True)
+
+        assert pool.acquire(FakeConnection, usable) is not conn
+        assert conn.closed
+
+    def test_close_drops_idle_connections(self):
+        pool = ConnectionPool(max_size=2)
+        conn = pool.acquire(FakeConnection, usable)
+        pool.release(conn, reusable=True)
+        pool.close()
+
+        assert conn.closed
+        assert pool.stats()['open'] == 0
+
+
+def test_pgbouncer_mode_refuses_assume_role_before_connecting():
+    wrapper = DatabaseWrapper({
+        'NAME': 'inventory', 'OPTIONS': {'assume_role': 'reporting'}, 'POOL': {'PGBOUNCER': True},
+    })
+
+    with pytest.raises(ImproperlyConfigured, match='assume_role'):
+        wrapper.get_new_connection({'database': 'inventory'})
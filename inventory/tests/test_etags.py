@@ -0,0 +1,164 @@
+from datetime import datetime, timezone
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from inventory import async_views
+from inventory.models import Product
+from inventory.helpers.etags import (
+    if_match_versions,
+    if_none_match,
+    page_etag,
+    product_etag,
+)
+from inventory.tests.budgets import query_budget
+
+
+@pytest.fixture
+def product():
+    return Product.objects.create(name="Tagged Product", stock_quantity=20, low_stock_threshold=5)
+
+
+def detail_url(product):
+    return reverse('inventory:product-detail', args=[product.id])
+
+
+class TestEtagHelpers:
+    def test_product_etag_accepts_raw_and_serialized_timestamps(self):
+        updated_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+        assert product_etag(7, updated_at) == product_etag(7, '2024-05-01T12:30:15.123456Z')
+        assert product_etag(7, updated_at) != product_etag(8, updated_at)
+
+    def test_if_none_match_uses_weak_comparison(self):
+        etag = product_etag(1, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        factory = RequestFactory()
+
+        assert if_none_match(factory.get('/', HTTP_IF_NONE_MATCH=f'W/{etag}'), etag)
+        assert if_none_match(factory.get('/', HTTP_IF_NONE_MATCH='*'), etag)
+        assert not if_none_match(factory.get('/', HTTP_IF_NONE_MATCH='"other"'), etag)
+        assert not if_none_match(factory.get('/'), etag)
+
+    def test_if_match_versions_round_trip(self):
+        updated_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        etag = product_etag(3, updated_at)
+        factory = RequestFactory()
+
+        assert if_match_versions(factory.get('/'), 3) is None
+        assert if_match_versions(factory.get('/', HTTP_IF_MATCH='*'), 3) is None
+        assert if_match_versions(factory.get('/', HTTP_IF_MATCH=etag), 3) == [updated_at]
+        # Another product's tag, weak tags and garbage never match
+        assert if_match_versions(factory.get('/', HTTP_IF_MATCH=etag), 4) == []
+        assert if_match_versions(factory.get('/', HTTP_IF_MATCH=f'W/{etag}'), 3) == []
+        assert if_match_versions(factory.get('/', HTTP_IF_MATCH='"nonsense"'), 3) == []
+
+    def test_page_etag_changes_with_rows_and_parts(self):
+        rows = [{'id': 1, 'updated_at': datetime(2024, 1, 1, tzinfo=timezone.utc)}]
+        moved = [{'id': 1, 'updated_at': datetime(2024, 1, 2, tzinfo=timezone.utc)}]
+
+        assert page_etag(rows, None) == page_etag(rows, None)
+        assert page_etag(rows, None) != page_etag(moved, None)
+        assert page_etag(rows, None) != page_etag(rows, 'next-link')
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_detail_not_modified(self, api_client, product):
+        response = api_client.get(detail_url(product))
+        etag = response['ETag']
+
+        # Answered from the product cache: no query, no body
+        with query_budget(0):
+            response = api_client.get(detail_url(product), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert response.content == b''
+
+    def test_detail_etag_moves_with_stock(self, api_client, product,
+                                          django_capture_on_commit_callbacks):
+        etag = api_client.get(detail_url(product))['ETag']
+        # The cached representation is invalidated on commit
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                reverse('inventory:decrease-stock', args=[product.id]), {'quantity': 1}, format='json'
+            )
+
+        response = api_client.get(detail_url(product), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_list_not_modified_until_a_row_changes(self, api_client, product):
+        url = reverse('inventory:product-list-create')
+        etag = api_client.get(url)['ETag']
+
+        with query_budget(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        product.name = "Renamed Product"
+        product.save()
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_async_views_answer_not_modified(self, api_client, product):
+        factory = RequestFactory()
+        detail_etag = api_client.get(detail_url(product))['ETag']
+        list_url = reverse('inventory:product-list-create')
+        list_etag = api_client.get(list_url)['ETag']
+
+        detail = async_to_sync(async_views.product_detail)(
+            factory.get(detail_url(product), HTTP_IF_NONE_MATCH=detail_etag), product.id
+        )
+        listing = async_to_sync(async_views.product_list)(
+            factory.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        )
+
+        assert detail.status_code == listing.status_code == status.HTTP_304_NOT_MODIFIED
+        assert detail['ETag'] == detail_etag
+        assert listing['ETag'] == list_etag
+
+
+@pytest.mark.django_db
+class TestIfMatchWrites:
+    def test_update_with_current_etag(self, api_client, product):
+        etag = api_client.get(detail_url(product))['ETag']
+
+        response = api_client.patch(
+            detail_url(product), {'name': 'Patched'}, format='json', HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+        # The old ETag is now stale
+        response = api_client.patch(
+            detail_url(product), {'name': 'Lost Update'}, format='json', HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Product.objects.get(id=product.id).name == 'Patched'
+
+    def test_stock_adjustments_with_stale_etag(self, api_client, product):
+        etag = api_client.get(detail_url(product))['ETag']
+        url = reverse('inventory:increase-stock', args=[product.id])
+
+        response = api_client.post(url, {'quantity': 5}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        fresh = response['ETag']
+
+        response = api_client.post(url, {'quantity': 5}, format='json', HTTP_IF_MATCH=etag)
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+        response = api_client.post(
+            reverse('inventory:decrease-stock', args=[product.id]),
+            {'quantity': 2}, format='json', HTTP_IF_MATCH=fresh
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert Product.objects.get(id=product.id).stock_quantity == 23
+
+    def test_if_match_star_is_unconditional(self, api_client, product):
+        response = api_client.post(
+            reverse('inventory:decrease-stock', args=[product.id]),
+            {'quantity': 1}, format='json', HTTP_IF_MATCH='*'
+        )
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from inventory.models import IdempotencyKey, StockMovement
+from inventory.helpers.idempotency import purge_expired_keys
+
+
+def increase(client, product, quantity=5, key='retry-1'):
+    return client.post(
+        reverse('inventory:increase-stock', args=[product.id]),
+        {'quantity': quantity}, format='json', HTTP_IDEMPOTENCY_KEY=key
+    )
+
+
+@pytest.mark.django_db
+class TestIdempotencyKeys:
+    def test_retry_replays_original_response(self, api_client, product):
+        """Test a retried request is answered from the key without adjusting again."""
+        first = increase(api_client, product)
+        retry = increase(api_client, product)
+
+        product.refresh_from_db()
+        assert product.stock_quantity == 15
+        assert StockMovement.objects.filter(product=product).count() == 1
+        assert retry.status_code == first.status_code == status.HTTP_200_OK
+        assert retry.json() == first.json()
+        assert retry['Idempotent-Replayed'] == 'true'
+
+    def test_key_reused_for_different_request(self, api_client, product):
+        increase(api_client, product, quantity=5)
+
+        response = increase(api_client, product, quantity=6)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        product.refresh_from_db()
+        assert product.stock_quantity == 15
+
+    def test_client_errors_are_replayed(self, api_client, product):
+        """Test a rejected decrease is stored, so a retry cannot apply it later."""
+        url = reverse('inventory:decrease-stock', args=[product.id])
+        first = api_client.post(url, {'quantity': 50}, format='json', HTTP_IDEMPOTENCY_KEY='short')
+        product.stock_quantity = 100
+        product.save()
+
+        retry = api_client.post(url, {'quantity': 50}, format='json', HTTP_IDEMPOTENCY_KEY='short')
+
+        assert first.status_code == retry.status_code == status.HTTP_400_BAD_REQUEST
+        product.refresh_from_db()
+        assert product.stock_quantity == 100
+
+    def test_requests_without_key_are_not_recorded(self, api_client, product):
+        url = reverse('inventory:increase-stock', args=[product.id])
+        api_client.post(url, {'quantity': 1}, format='json')
+        api_client.post(url, {'quantity': 1}, format='json')
+
+        product.refresh_from_db()
+        assert product.stock_quantity == 12
+        assert not IdempotencyKey.objects.exists()
+
+    def test_expired_key_runs_again(self, api_client, product):
+        increase(api_client, product)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = increase(api_client, product)
+
+        assert 'Idempotent-Replayed' not in response
+        product.refresh_from_db()
+        assert product.stock_quantity == 20
+
+    def test_purge_deletes_only_expired_keys(self, api_client, product):
+        for n in range(5):
+            increase(api_client, product, key=f'purge-{n}')
+        IdempotencyKey.objects.filter(key__in=['purge-0', 'purge-1', 'purge-2']).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        assert purge_expired_keys(batch_size=2) == 3
+        assert set(IdempotencyKey.objects.values_list('key', flat=True)) == {'purge-3', 'purge-4'}
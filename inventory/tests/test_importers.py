@@ -0,0 +1,178 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from inventory.models import LowStockEvent, Product, StockMovement
+from inventory.services import InventoryService
+from inventory.helpers.importers import ProductImporter, read_rows
+
+CSV_INPUT = """name,description,stock_quantity,low_stock_threshold,is_active
+Widget,Blue widget,10,5,true
+Gadget,,3,,false
+Widget,Red widget,12,5,true
+,missing name,1,1,true
+Sprocket,,-4,1,true
+"""
+
+
+@pytest.mark.django_db
+class TestProductImporter:
+    def test_upserts_batches(self):
+        """Test rows are inserted, later duplicates win and bad rows are skipped."""
+        Product.objects.create(name="Gadget", stock_quantity=99)
+
+        stats = ProductImporter(batch_size=2).run(
+            read_rows(StringIO(CSV_INPUT), 'csv')
+        )
+
+        assert stats['rows'] == 5
+        assert stats['imported'] == 3
+        assert [e['row'] for e in stats['errors']] == [4, 5]
+        widget = Product.objects.get(name="Widget")
+        assert (widget.description, widget.stock_quantity) == ("Red widget", 12)
+        gadget = Product.objects.get(name="Gadget")
+        assert (gadget.stock_quantity, gadget.low_stock_threshold, gadget.is_active) == (3, 10, False)
+
+    def test_duplicates_within_one_batch(self):
+        """Test a name repeated inside one batch keeps its last occurrence."""
+        ProductImporter().run(read_rows(StringIO(CSV_INPUT), 'csv'))
+
+        assert Product.objects.filter(name="Widget").count() == 1
+        assert Product.objects.get(name="Widget").stock_quantity == 12
+
+    def test_ndjson_rows(self):
+        """Test NDJSON input, including an unparseable line."""
+        lines = [
+            json.dumps({'name': 'Bolt', 'stock_quantity': 7}) + '\n',
+            '{not json\n',
+        ]
+
+        stats = ProductImporter().run(read_rows(lines, 'ndjson'))
+
+        assert stats['imported'] == 1
+        assert stats['errors'][0]['row'] == 2
+        assert Product.objects.get(name="Bolt").stock_quantity == 7
+
+    def test_stock_changes_are_recorded(self):
+        """Test an import's stock changes land in the ledger and the event outbox."""
+        gadget = Product.objects.create(name="Gadget", stock_quantity=99, low_stock_threshold=5)
+        lines = [json.dumps({'name': 'Gadget', 'stock_quantity': 4, 'low_stock_threshold': 5})]
+
+        ProductImporter().run(read_rows(lines, 'ndjson'))
+
+        movement = StockMovement.objects.get(product=gadget)
+        assert (movement.reason, movement.delta, movement.quantity_after) == ('import', -95, 4)
+        event = LowStockEvent.objects.get(product=gadget)
+        assert (event.transition, event.stock_quantity) == ('low', 4)
+
+    def test_opening_stock_is_recorded(self):
+        lines = [json.dumps({'name': 'Bolt', 'stock_quantity': 7}), json.dumps({'name': 'Nut'})]
+
+        ProductImporter().run(read_rows(lines, 'ndjson'))
+
+        assert list(StockMovement.objects.values_list('product__name', 'reason', 'delta')) == [
+            ('Bolt', 'import', 7),
+        ]
+
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason="Other backends serialize writers")
+    def test_name_inserted_concurrently_is_treated_as_existing(self, monkeypatch):
+        """Test a name created after the batch's lock is guarded like any existing row."""
+        lock = ProductImporter._lock
+        calls = []
+
+        def lock_then_race(names):
+            locked = lock(names)
+            if not calls:
+                raced = Product.objects.create(name="Raced", stock_quantity=5)
+                InventoryService.reserve_stock(raced.id, 4)
+            calls.append(names)
+            return locked
+
+        monkeypatch.setattr(ProductImporter, '_lock', staticmethod(lock_then_race))
+        stats = ProductImporter().run(read_rows([json.dumps({'name': 'Raced', 'stock_quantity': 2})], 'ndjson'))
+
+        assert stats['stock_rejected'][0]['row'] == 1
+        assert Product.objects.get(name="Raced").stock_quantity == 5
+
+    def test_held_and_sharded_stock_is_kept(self):
+        """Test stock is not taken below reservations, nor written to sharded products."""
+        reserved = Product.objects.create(name="Reserved", stock_quantity=10)
+        InventoryService.reserve_stock(reserved.id, 6)
+        sharded = Product.objects.create(name="Sharded", stock_quantity=8)
+        InventoryService.enable_stock_sharding(sharded.id, 2)
+        lines = [
+            json.dumps({'name': 'Reserved', 'description': 'Edited', 'stock_quantity': 5}),
+            json.dumps({'name': 'Sharded', 'stock_quantity': 20}),
+            json.dumps({'name': 'Reserved', 'description': 'Edited', 'stock_quantity': 6}),
+        ]
+
+        stats = ProductImporter().run(read_rows(lines, 'ndjson'))
+
+        assert [r['row'] for r in stats['stock_rejected']] == [2]
+        reserved.refresh_from_db()
+        assert (reserved.description, reserved.stock_quantity) == ("Edited", 6)
+        assert Product.objects.get(name="Sharded").stock_quantity == 8
+
+        stats = ProductImporter().run(read_rows(lines[:1], 'ndjson'))
+
+        assert stats['stock_rejected'][0]['row'] == 1
+        assert "6 units held" in stats['stock_rejected'][0]['error']
+        assert Product.objects.get(name="Reserved").stock_quantity == 6
+        assert not StockMovement.objects.filter(product=sharded).exists()
+
+    def test_management_command_reports_undecodable_input(self, tmp_path):
+        path = tmp_path / 'products.csv'
+        path.write_bytes(b'name\nWidget\n\xff\n')
+
+        with pytest.raises(CommandError, match="Line 3"):
+            call_command('import_products', str(path), stdout=StringIO(), stderr=StringIO())
+
+    def test_management_command(self, tmp_path):
+        path = tmp_path / 'products.csv'
+        path.write_text(CSV_INPUT)
+        out = StringIO()
+
+        call_command('import_products', str(path), stdout=out, stderr=StringIO())
+
+        assert "Imported 3 of 5 rows" in out.getvalue()
+        assert Product.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestImportEndpoint:
+    def test_import_csv_body(self):
+        response = APIClient().generic(
+            'POST', reverse('inventory:import-products'),
+            CSV_INPUT, content_type='text/csv'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['imported'] == 3
+
+    def test_import_rejects_unknown_content_type(self):
+        response = APIClient().generic(
+            'POST', reverse('inventory:import-products'),
+            '{}', content_type='application/json'
+        )
+
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    @pytest.mark.parametrize('body, line', [
+        (b'name\nWidget\n\xff\n', 3),
+        (b'name\n"' + b'x' * 200000 + b'"\n', 2),
+    ])
+    def test_import_rejects_undecodable_or_malformed_input(self, body, line):
+        response = APIClient().generic(
+            'POST', reverse('inventory:import-products'), body, content_type='text/csv'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['success'] is False
+        assert response.json()['error']['line'] == line
@@ -0,0 +1,201 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from inventory.models import Location, LocationStock, LowStockEvent, Product, StockMovement
+from inventory.services import InventoryService
+from inventory.views import ProductDetailView
+from inventory.helpers.exceptions import InsufficientStockException, ShardedStockError
+
+INCREASE = StockMovement.Reason.INCREASE
+DECREASE = StockMovement.Reason.DECREASE
+
+
+@pytest.fixture
+def product():
+    # 5 units of unassigned stock to start with
+    return Product.objects.create(name="Located Product", stock_quantity=5, low_stock_threshold=10)
+
+
+@pytest.fixture
+def east():
+    return Location.objects.create(code='east', name="East Warehouse")
+
+
+@pytest.fixture
+def west():
+    return Location.objects.create(code='west', name="West Warehouse")
+
+
+def at(product, location):
+    return LocationStock.objects.get(product=product, location=location).quantity
+
+
+@pytest.mark.django_db
+class TestLocationStock:
+    def test_location_changes_move_the_product_total(self, product, east):
+        product, quantity = InventoryService.adjust_location_stock(product.id, east.id, 20, INCREASE)
+        assert (product.stock_quantity, product.located_quantity, quantity) == (25, 20, 20)
+
+        product, quantity = InventoryService.adjust_location_stock(product.id, east.id, -8, DECREASE)
+        assert (product.stock_quantity, product.located_quantity, quantity) == (17, 12, 12)
+
+        movement = StockMovement.objects.filter(product=product).latest('id')
+        assert (movement.location_id, movement.delta, movement.quantity_after) == (east.id, -8, 12)
+
+    def test_cannot_take_more_than_the_location_holds(self, product, east, west):
+        InventoryService.adjust_location_stock(product.id, east.id, 3, INCREASE)
+
+        with pytest.raises(InsufficientStockException):
+            InventoryService.adjust_location_stock(product.id, east.id, -4, DECREASE)
+        with pytest.raises(InsufficientStockException):
+            InventoryService.adjust_location_stock(product.id, west.id, -1, DECREASE)
+        product.refresh_from_db()
+        assert (product.stock_quantity, product.located_quantity) == (8, 3)
+
+    def test_product_level_changes_only_use_unassigned_stock(self, product, east):
+        InventoryService.adjust_location_stock(product.id, east.id, 20, INCREASE)
+
+        with pytest.raises(InsufficientStockException):
+            InventoryService.decrease_stock(product.id, 6)
+        with pytest.raises(InsufficientStockException):
+            InventoryService.reserve_stock(product.id, 6)
+        assert InventoryService.get_stock_availability(product.id)['available_quantity'] == 5
+        InventoryService.decrease_stock(product.id, 5)
+        assert at(product, east) == 20
+
+    def test_inactive_locations_can_be_drained_but_not_stocked(self, product, east):
+        InventoryService.adjust_location_stock(product.id, east.id, 4, INCREASE)
+        Location.objects.filter(id=east.id).update(is_active=False)
+
+        with pytest.raises(Location.DoesNotExist):
+            InventoryService.adjust_location_stock(product.id, east.id, 1, INCREASE)
+        InventoryService.adjust_location_stock(product.id, east.id, -4, DECREASE)
+        assert at(product, east) == 0
+
+    def test_failed_increase_leaves_nothing_behind(self, east):
+        with pytest.raises(Product.DoesNotExist):
+            InventoryService.adjust_location_stock(999999, east.id, 5, INCREASE)
+        assert not LocationStock.objects.exists()
+
+    def test_low_stock_events_follow_the_product_total(self, product, east):
+        InventoryService.adjust_location_stock(product.id, east.id, 10, INCREASE)  # 5 -> 15
+        InventoryService.adjust_location_stock(product.id, east.id, -6, DECREASE)  # 15 -> 9
+
+        assert list(LowStockEvent.objects.order_by('id').values_list('transition', 'stock_quantity')) == [
+            ('restocked', 15), ('low', 9),
+        ]
+
+    def test_sharded_products_cannot_hold_located_stock(self, product, east):
+        InventoryService.adjust_location_stock(product.id, east.id, 2, INCREASE)
+        with pytest.raises(ShardedStockError):
+            InventoryService.enable_stock_sharding(product.id, 2)
+
+        other = Product.objects.create(name="Sharded Product", stock_quantity=4)
+        InventoryService.enable_stock_sharding(other.id, 2)
+        with pytest.raises(ShardedStockError):
+            InventoryService.adjust_location_stock(other.id, east.id, 1, INCREASE)
+
+
+@pytest.mark.django_db
+class TestStockTransfers:
+    def test_transfer_moves_stock_between_locations(self, product, east, west):
+        InventoryService.adjust_location_stock(product.id, east.id, 10, INCREASE)
+
+        assert InventoryService.transfer_stock(product.id, east.id, west.id, 4) == {east.id: 6, west.id: 4}
+        product.refresh_from_db()
+        assert (product.stock_quantity, product.located_quantity) == (15, 10)
+        assert list(
+            StockMovement.objects.filter(reason=StockMovement.Reason.TRANSFER)
+            .order_by('id').values_list('location_id', 'delta', 'quantity_after')
+        ) == [(east.id, -4, 6), (west.id, 4, 4)]
+
+    def test_short_transfer_changes_nothing(self, product, east, west):
+        InventoryService.adjust_location_stock(product.id, west.id, 3, INCREASE)
+
+        # The destination sorts first, so it was already written when the source came up short
+        with pytest.raises(InsufficientStockException):
+            InventoryService.transfer_stock(product.id, west.id, east.id, 5)
+        assert at(product, west) == 3
+        assert not LocationStock.objects.filter(location=east).exists()
+
+    def test_transfer_to_an_inactive_location_is_rejected(self, product, east, west):
+        InventoryService.adjust_location_stock(product.id, east.id, 3, INCREASE)
+        Location.objects.filter(id=west.id).update(is_active=False)
+
+        with pytest.raises(Location.DoesNotExist):
+            InventoryService.transfer_stock(product.id, east.id, west.id, 1)
+        assert at(product, east) == 3
+
+
+@pytest.mark.django_db
+class TestLocationViews:
+    def test_increase_transfer_and_read_back(self, api_client, product, east, west):
+        response = api_client.post(
+            reverse('inventory:increase-location-stock', args=[product.id, east.id]),
+            {'quantity': 7}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['stock_quantity'] == 12
+        assert response.json()['data']['location'] == {'location_id': east.id, 'quantity': 7}
+
+        response = api_client.post(
+            reverse('inventory:transfer-stock', args=[product.id]),
+            {'from_location': east.id, 'to_location': west.id, 'quantity': 2}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.get(reverse('inventory:location-stock', args=[product.id]))
+        assert response.json()['data'] == {
+            'stock_quantity': 12,
+            'unassigned_quantity': 5,
+            'locations': [
+                {'location_id': east.id, 'code': 'east', 'quantity': 5},
+                {'location_id': west.id, 'code': 'west', 'quantity': 2},
+            ],
+        }
+
+    def test_error_responses(self, api_client, product, east):
+        url = reverse('inventory:decrease-location-stock', args=[product.id, east.id])
+        response = api_client.post(url, {'quantity': 1}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.post(
+            reverse('inventory:increase-location-stock', args=[product.id, 999999]),
+            {'quantity': 1}, format='json'
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = api_client.post(
+            reverse('inventory:transfer-stock', args=[product.id]),
+            {'from_location': east.id, 'to_location': east.id, 'quantity': 1}, format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_put_cannot_drop_stock_below_located_stock(self, api_client, product, east):
+        InventoryService.adjust_location_stock(product.id, east.id, 10, INCREASE)
+
+        response = api_client.patch(
+            reverse('inventory:product-detail', args=[product.id]), {'stock_quantity': 9}, format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_update_keeps_location_stock_added_after_the_product_was_loaded(
+        self, api_client, product, east, monkeypatch
+    ):
+        load = ProductDetailView.get_object
+
+        def load_then_locate(view):
+            instance = load(view)
+            InventoryService.adjust_location_stock(product.id, east.id, 10, INCREASE)
+            return instance
+
+        monkeypatch.setattr(ProductDetailView, 'get_object', load_then_locate)
+        response = api_client.patch(
+            reverse('inventory:product-detail', args=[product.id]),
+            {'description': 'Edited'}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        product.refresh_from_db()
+        assert (product.description, product.stock_quantity, product.located_quantity) == ('Edited', 15, 10)
@@ -0,0 +1,143 @@
+import pytest
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from inventory.models import LowStockEvent, Product
+from inventory.services import InventoryService
+from inventory.helpers.events import dispatch_pending_events, low_stock_feed
+
+EVENTS_URL = reverse('inventory:low-stock-events')
+
+
+@pytest.fixture(autouse=True)
+def fresh_feed():
+    low_stock_feed.reset()
+    yield
+    low_stock_feed.reset()
+
+
+@pytest.fixture
+def product():
+    return Product.objects.create(name="Event Product", stock_quantity=20, low_stock_threshold=5)
+
+
+def transitions():
+    return list(LowStockEvent.objects.order_by('id').values_list('transition', 'stock_quantity'))
+
+
+def read_stream(api_client, **headers):
+    response = api_client.get(EVENTS_URL, **headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'text/event-stream'
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_crossings_in_both_directions(self, product):
+        InventoryService.decrease_stock(product.id, 10)  # 20 -> 10: still above
+        InventoryService.decrease_stock(product.id, 5)   # 10 -> 5: low
+        InventoryService.decrease_stock(product.id, 3)   # 5 -> 2: still low
+        InventoryService.adjust_stock(product.id, 8, 'increase')  # 2 -> 10: restocked
+
+        assert transitions() == [('low', 5), ('restocked', 10)]
+
+    def test_inactive_products_never_cross(self, product):
+        Product.objects.filter(id=product.id).update(is_active=False)
+
+        InventoryService.decrease_stock(product.id, 18)
+        assert transitions() == []
+
+    def test_rolled_back_adjustment_leaves_no_event(self, product):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                InventoryService.decrease_stock(product.id, 18)
+                raise RuntimeError("checkout failed")
+
+        assert transitions() == []
+
+    def test_bulk_adjustments_and_reservation_commits(self, product):
+        other = Product.objects.create(name="Event Other", stock_quantity=3, low_stock_threshold=5)
+
+        InventoryService.bulk_adjust_stock([
+            {'product_id': product.id, 'delta': -16},
+            {'product_id': other.id, 'delta': 7},
+        ])
+        assert set(LowStockEvent.objects.values_list('product_id', 'transition')) == {
+            (product.id, 'low'), (other.id, 'restocked'),
+        }
+
+        reservation = InventoryService.reserve_stock(other.id, 6)
+        InventoryService.commit_reservation(reservation.id)
+        assert LowStockEvent.objects.filter(product_id=other.id).latest('id').transition == 'low'
+
+    def test_edits_creates_and_imports_cross_too(self, api_client, product):
+        url = reverse('inventory:product-detail', args=[product.id])
+
+        api_client.patch(url, {'low_stock_threshold': 20}, format='json')  # 20 <= 20: low
+        api_client.patch(url, {'is_active': False}, format='json')  # leaves the low-stock list
+        api_client.patch(url, {'description': "No crossing"}, format='json')
+        api_client.post(reverse('inventory:product-list-create'), {
+            'name': "Event New", 'stock_quantity': 1, 'low_stock_threshold': 5,
+        }, format='json')
+        api_client.generic(
+            'POST', reverse('inventory:import-products'),
+            '{"name": "Event Product", "stock_quantity": 20, "low_stock_threshold": 30}',
+            content_type='application/x-ndjson',
+        )  # threshold-only row reactivating the product
+
+        assert list(LowStockEvent.objects.order_by('id').values_list(
+            'product__name', 'transition', 'low_stock_threshold'
+        )) == [
+            ("Event Product", 'low', 20),
+            ("Event Product", 'restocked', 20),
+            ("Event New", 'low', 5),
+            ("Event Product", 'low', 30),
+        ]
+
+    def test_dispatch_numbers_events_once(self, product):
+        InventoryService.decrease_stock(product.id, 18)
+        InventoryService.adjust_stock(product.id, 18, 'increase')
+
+        assert dispatch_pending_events() == 2
+        assert dispatch_pending_events() == 0
+        assert list(LowStockEvent.objects.order_by('id').values_list('sequence', flat=True)) == [1, 2]
+
+
+@pytest.mark.django_db
+class TestEventStream:
+    @pytest.fixture(autouse=True)
+    def short_streams(self):
+        with override_settings(INVENTORY_EVENTS_STREAM_SECONDS=0.2):
+            yield
+
+    def test_streams_dispatched_events_after_last_event_id(self, api_client, product):
+        InventoryService.decrease_stock(product.id, 18)
+        InventoryService.adjust_stock(product.id, 18, 'increase')
+        dispatch_pending_events()
+
+        body = read_stream(api_client, HTTP_LAST_EVENT_ID='0')
+        assert 'id: 1\nevent: low-stock\n' in body
+        assert 'id: 2\n' in body and '"transition":"restocked"' in body
+
+        # Resuming after the first event skips it
+        body = read_stream(api_client, HTTP_LAST_EVENT_ID='1')
+        assert 'id: 1\n' not in body
+        assert 'id: 2\n' in body
+
+    def test_undispatched_events_are_not_streamed(self, api_client, product):
+        InventoryService.decrease_stock(product.id, 18)
+
+        assert 'event: low-stock' not in read_stream(api_client, HTTP_LAST_EVENT_ID='0')
+
+    def test_new_subscribers_start_at_the_latest_event(self, api_client, product):
+        InventoryService.decrease_stock(product.id, 18)
+        dispatch_pending_events()
+
+        assert 'event: low-stock' not in read_stream(api_client)
+
+    def test_rejects_malformed_last_event_id(self, api_client):
+        response = api_client.get(EVENTS_URL, HTTP_LAST_EVENT_ID='abc')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
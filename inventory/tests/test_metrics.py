@@ -0,0 +1,73 @@
+import pytest
+from django.urls import reverse
+
+from inventory.models import Product
+from inventory.helpers.metrics import Histogram, reset_metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', 'Test.', ('route',), buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(('a',), value)
+
+        lines = histogram.collect()
+        assert 'test_seconds_bucket{route="a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{route="a",le="1"} 2' in lines
+        assert 'test_seconds_bucket{route="a",le="+Inf"} 3' in lines
+        assert 'test_seconds_sum{route="a"} 5.55' in lines
+        assert 'test_seconds_count{route="a"} 3' in lines
+
+    def test_label_values_are_escaped(self):
+        histogram = Histogram('test_seconds', 'Test.', ('route',), buckets=(1,))
+        histogram.observe(('say "hi"',), 0.5)
+
+        assert 'test_seconds_count{route="say \\"hi\\""} 1' in histogram.collect()
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    def _scrape(self, api_client):
+        response = api_client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        return response.content.decode().splitlines()
+
+    def test_requests_are_recorded_by_route(self, api_client):
+        product = Product.objects.create(name="Metered Product", stock_quantity=3)
+        api_client.get(reverse('inventory:product-detail', args=[product.id]))
+        api_client.get(reverse('inventory:product-detail', args=[product.id + 1000]))
+
+        lines = self._scrape(api_client)
+        route = 'method="GET",route="api/v1/products/<int:pk>/"'
+        assert f'inventory_requests_total{{{route},status="200"}} 1' in lines
+        assert f'inventory_requests_total{{{route},status="404"}} 1' in lines
+        assert f'inventory_request_duration_seconds_count{{{route}}} 2' in lines
+
+    def test_queries_and_serialization_are_attributed(self, api_client):
+        Product.objects.create(name="Metered Product", stock_quantity=3)
+        api_client.get(reverse('inventory:product-list-create'))
+
+        lines = self._scrape(api_client)
+        route = 'method="GET",route="api/v1/products/"'
+        # The list view runs at least one query and serializes its page
+        assert f'inventory_request_db_queries_bucket{{{route},le="0"}} 0' in lines
+        serialization_sum = next(
+            line for line in lines
+            if line.startswith(f'inventory_request_serialization_seconds_sum{{{route}}}')
+        )
+        assert float(serialization_sum.split()[-1]) > 0
+
+    def test_unmatched_paths_share_one_series(self, api_client):
+        api_client.get('/no-such-page/1')
+        api_client.get('/no-such-page/2')
+
+        lines = self._scrape(api_client)
+        assert 'inventory_requests_total{method="GET",route="<unmatched>",status="404"} 2' in lines
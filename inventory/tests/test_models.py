@@ -1,6 +1,6 @@
 import pytest
 from django.core.exceptions import ValidationError
-from apps.inventory.models import Product
+from inventory.models import Product
 
 
 @pytest.mark.django_db
@@ -0,0 +1,162 @@
+"""
+Query budgets and plans against a large seeded catalog.
+
+Deselected by default; run with ``pytest -m perf``. The catalog size comes
+from INVENTORY_PERF_PRODUCTS (10,000 by default; try 1000000 before
+shipping a new query). Plan checks need PostgreSQL.
+"""
+
+import os
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from inventory.models import Product, StockMovement
+from inventory.helpers.benchmarking import analyze_table, seed_products
+from inventory.helpers.sync import encode_cursor
+from inventory.tests.budgets import assert_no_sequential_scans, query_budget
+from inventory.tests.test_query_budgets import BUDGETS
+
+pytestmark = [pytest.mark.perf, pytest.mark.django_db]
+
+PERF_PRODUCTS = int(os.environ.get('INVENTORY_PERF_PRODUCTS', 10000))
+PERF_PREFIX = 'perf'
+
+PRODUCT_TABLE = Product._meta.db_table
+MOVEMENT_TABLE = StockMovement._meta.db_table
+
+
+@pytest.fixture(scope='module')
+def large_catalog(django_db_setup, django_db_blocker):
+    """Seed PERF_PRODUCTS products once for the module, committed."""
+    with django_db_blocker.unblock():
+        seed_products(PERF_PRODUCTS, prefix=PERF_PREFIX)
+        analyze_table(Product)
+    yield PERF_PRODUCTS
+    with django_db_blocker.unblock():
+        # Raw DELETE: the ORM would load every row to send post_delete
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(PRODUCT_TABLE)} WHERE name LIKE %s",
+                [f'{PERF_PREFIX}-%']
+            )
+
+
+@pytest.fixture
+def hot_product(large_catalog):
+    return Product.objects.filter(name=f'{PERF_PREFIX}-1').get()
+
+
+def get_within_budget(api_client, url, budget, tables=(PRODUCT_TABLE,), **params):
+    with query_budget(budget) as executed:
+        response = api_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    assert_no_sequential_scans(executed, tables)
+    return response.json()
+
+
+class TestLargeCatalogReads:
+    def test_list_pages_stay_indexed(self, api_client, large_catalog):
+        url = reverse('inventory:product-list-create')
+        budget = BUDGETS['product-list-create']['GET']
+
+        data = get_within_budget(api_client, url, budget, page_size=100)
+        # Deep pages cost the same as the first
+        for _ in range(5):
+            next_url = data['data']['pagination']['next']
+            with query_budget(budget) as executed:
+                data = api_client.get(next_url).json()
+            assert_no_sequential_scans(executed, [PRODUCT_TABLE])
+
+    def test_list_count_estimate_does_not_scan(self, api_client, large_catalog):
+        url = reverse('inventory:product-list-create')
+
+        # The estimate reads the planner's statistics, not the table
+        data = get_within_budget(api_client, url, 2, count='estimate')
+        assert data['data']['pagination']['count'] > 0
+
+    @pytest.mark.parametrize('params', [
+        {'search': f'{PERF_PREFIX}-4242'},
+        {'name_prefix': f'{PERF_PREFIX}-99'},
+        {'is_active': 'false'},
+        {'low_stock': 'true'},
+        {'min_stock': 4990},
+    ])
+    def test_list_filters_stay_indexed(self, api_client, large_catalog, params):
+        get_within_budget(
+            api_client, reverse('inventory:product-list-create'),
+            BUDGETS['product-list-create']['GET'], **params
+        )
+
+    def test_detail_and_availability(self, api_client, hot_product):
+        get_within_budget(
+            api_client, reverse('inventory:product-detail', args=[hot_product.id]),
+            BUDGETS['product-detail']['GET']
+        )
+        get_within_budget(
+            api_client, reverse('inventory:stock-availability', args=[hot_product.id]),
+            BUDGETS['stock-availability']['GET']
+        )
+
+    def test_low_stock_uses_headroom_index(self, api_client, large_catalog):
+        get_within_budget(
+            api_client, reverse('inventory:low-stock-products'),
+            BUDGETS['low-stock-products']['GET']
+        )
+
+    @override_settings(INVENTORY_SYNC_SETTLE_SECONDS=0)
+    def test_changes_since_recent_cursor_stays_indexed(self, api_client, hot_product):
+        hot_product.save()
+        now = timezone.now()
+        since = encode_cursor((now - timedelta(seconds=5), 0), now)
+
+        data = get_within_budget(
+            api_client, reverse('inventory:product-changes'),
+            BUDGETS['product-changes']['GET'], since=since
+        )
+        assert hot_product.id in [row['id'] for row in data['data']['results']]
+
+    def test_history_of_busy_product_stays_indexed(self, api_client, hot_product):
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                product=hot_product, delta=1, quantity_after=i,
+                reason=StockMovement.Reason.INCREASE
+            )
+            for i in range(5000)
+        ])
+        analyze_table(StockMovement)
+
+        get_within_budget(
+            api_client, reverse('inventory:stock-history', args=[hot_product.id]),
+            BUDGETS['stock-history']['GET'], tables=[MOVEMENT_TABLE], page_size=100
+        )
+
+
+class TestLargeCatalogWrites:
+    def test_single_adjustments(self, api_client, hot_product):
+        for name in ('increase-stock', 'decrease-stock'):
+            with query_budget(BUDGETS[name]['POST']):
+                response = api_client.post(
+                    reverse(f'inventory:{name}', args=[hot_product.id]),
+                    {'quantity': 1}, format='json'
+                )
+            assert response.status_code == status.HTTP_200_OK
+
+    def test_bulk_adjustment_of_a_full_chunk(self, api_client, large_catalog):
+        ids = list(
+            Product.objects.filter(name__startswith=f'{PERF_PREFIX}-')
+            .order_by('id').values_list('id', flat=True)[:1000]
+        )
+        items = [{'product_id': product_id, 'delta': 1} for product_id in ids]
+
+        with query_budget(BUDGETS['bulk-stock-adjustments']['POST']) as executed:
+            response = api_client.post(
+                reverse('inventory:bulk-stock-adjustments'), {'items': items}, format='json'
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert_no_sequential_scans(executed, [PRODUCT_TABLE])
@@ -0,0 +1,77 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from inventory.models import Product
+
+
+@pytest.fixture
+def products():
+    return {
+        'widget': Product.objects.create(
+            name="Blue Widget", description="Small steel part",
+            stock_quantity=2, low_stock_threshold=5
+        ),
+        'gadget': Product.objects.create(
+            name="Red Gadget", description="Contains a widget",
+            stock_quantity=40, low_stock_threshold=5
+        ),
+        'retired': Product.objects.create(
+            name="Blueprint Binder", description="Paper",
+            stock_quantity=0, low_stock_threshold=5, is_active=False
+        ),
+    }
+
+
+def listed_names(api_client, **params):
+    response = api_client.get(reverse('inventory:product-list-create'), params)
+    assert response.status_code == status.HTTP_200_OK
+    return [row['name'] for row in response.json()['data']['results']]
+
+
+@pytest.mark.django_db
+class TestProductListFilters:
+    def test_search_matches_name_or_description_case_insensitively(self, api_client, products):
+        assert listed_names(api_client, search='WIDGET') == ["Blue Widget", "Red Gadget"]
+
+    def test_name_prefix(self, api_client, products):
+        # Set comparison: collations disagree on where the space sorts
+        assert set(listed_names(api_client, name_prefix='blue')) == {"Blue Widget", "Blueprint Binder"}
+
+    def test_is_active(self, api_client, products):
+        assert listed_names(api_client, is_active='false') == ["Blueprint Binder"]
+        assert listed_names(api_client, is_active='true') == ["Blue Widget", "Red Gadget"]
+
+    def test_low_stock_matches_low_stock_endpoint(self, api_client, products):
+        # Inactive products are never low stock, as on /products/low-stock/,
+        # so low_stock=false lists them whatever their stock
+        assert listed_names(api_client, low_stock='true') == ["Blue Widget"]
+        assert listed_names(api_client, low_stock='false') == ["Blueprint Binder", "Red Gadget"]
+
+    def test_stock_range(self, api_client, products):
+        assert listed_names(api_client, min_stock=1, max_stock=40) == ["Blue Widget", "Red Gadget"]
+        assert listed_names(api_client, max_stock=0) == ["Blueprint Binder"]
+
+    def test_filters_combine(self, api_client, products):
+        assert listed_names(api_client, name_prefix='blue', is_active='true') == ["Blue Widget"]
+
+    def test_next_page_keeps_filters(self, api_client, products):
+        url = reverse('inventory:product-list-create')
+        first = api_client.get(url, {'search': 'widget', 'page_size': 1}).json()['data']
+
+        second = api_client.get(first['pagination']['next']).json()['data']
+        assert [row['name'] for row in second['results']] == ["Red Gadget"]
+        assert second['pagination']['next'] is None
+
+    @pytest.mark.parametrize('params, field', [
+        ({'search': 'ab'}, 'search'),
+        ({'is_active': 'maybe'}, 'is_active'),
+        ({'min_stock': 'ten'}, 'min_stock'),
+        ({'max_stock': '-1'}, 'max_stock'),
+        ({'min_stock': 5, 'max_stock': 1}, 'min_stock'),
+    ])
+    def test_invalid_parameters_are_rejected(self, api_client, params, field):
+        response = api_client.get(reverse('inventory:product-list-create'), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert field in response.json()
@@ -0,0 +1,297 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.urls import URLPattern, reverse
+from rest_framework import status
+
+from inventory import urls as inventory_urls
+from inventory.models import Location, Product, StockMovement, StockReservation
+from inventory.services import InventoryService
+from inventory.tests.budgets import query_budget
+
+# Queries each route may run, savepoints excluded. Raise a budget only
+# with a reason; an N+1 shows up as a budget overrun or as a count that
+# grows with the number of rows.
+BUDGETS = {
+    # POST records the opening stock in the ledger; POST and PUT add an
+    # outbox insert when the write crosses the low stock threshold
+    'product-list-create': {'GET': 1, 'POST': 3},
+    # PUT locks the row to diff stock_quantity for the ledger (+1 ledger
+    # insert when it changes); DELETE writes a tombstone and removes the
+    # product's location stock rows
+    'product-detail': {'GET': 1, 'PUT': 4, 'DELETE': 5},
+    # Oldest open write transaction (pg_stat_activity), then products and tombstones
+    'product-changes': {'GET': 3},
+    # +1 when an adjustment crosses the low stock threshold (outbox insert)
+    'increase-stock': {'POST': 2},
+    'decrease-stock': {'POST': 2},
+    'bulk-stock-adjustments': {'POST': 3},
+    'stock-history': {'GET': 1},
+    'location-stock': {'GET': 2},
+    # Location row, then Product row, then ledger; +1 when crossing the threshold
+    'increase-location-stock': {'POST': 3},
+    'decrease-location-stock': {'POST': 3},
+    'transfer-stock': {'POST': 3},
+    'reserve-stock': {'POST': 2},
+    'stock-availability': {'GET': 1},
+    'commit-reservation': {'POST': 4},
+    'release-reservation': {'POST': 3},
+    'low-stock-products': {'GET': 1},
+    'low-stock-events': {'GET': 1},  # to connect; then one query per batch of new events
+    'export-products': {'GET': 2},  # snapshot SET TRANSACTION + the cursor
+    # Per batch: row locks, insert of new names, ledger insert for stock changes
+    # and opening stock, outbox insert for rows crossing the low stock
+    # threshold (the new products here start low); +3 (staging table,
+    # upsert, drop) when names exist
+    'import-products': {'POST': 4},
+    'inventory-summary': {'GET': 1},
+    'db-pool-stats': {'GET': 0},
+}
+
+# The budgets count PostgreSQL queries; other backends take the fallback
+# paths (re-reads instead of RETURNING, no COPY), so they only run there
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason="Budgets are PostgreSQL query counts"
+)
+
+
+@pytest.fixture
+def product():
+    return Product.objects.create(
+        name="Budget Product", stock_quantity=50, low_stock_threshold=5
+    )
+
+
+def create_products(count, prefix="Budget Row", stock_quantity=50):
+    return Product.objects.bulk_create([
+        Product(name=f"{prefix} {i:04d}", stock_quantity=stock_quantity, low_stock_threshold=5)
+        for i in range(count)
+    ])
+
+
+def count_queries(request):
+    with query_budget(10 ** 6) as executed:
+        response = request()
+        if response.streaming:
+            b''.join(response.streaming_content)
+    return len(executed)
+
+
+def test_every_route_has_a_budget():
+    names = {
+        pattern.name for pattern in inventory_urls.urlpatterns
+        if isinstance(pattern, URLPattern)
+    }
+    assert names == set(BUDGETS)
+
+
+@postgresql_only
+@pytest.mark.django_db
+class TestProductBudgets:
+    def test_list(self, api_client):
+        create_products(30)
+        url = reverse('inventory:product-list-create')
+
+        with query_budget(BUDGETS['product-list-create']['GET']):
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        # The next page costs the same
+        next_url = response.json()['data']['pagination']['next']
+        with query_budget(BUDGETS['product-list-create']['GET']):
+            assert api_client.get(next_url).status_code == status.HTTP_200_OK
+
+    def test_list_query_count_does_not_grow_with_page_size(self, api_client):
+        create_products(100)
+        url = reverse('inventory:product-list-create')
+
+        small = count_queries(lambda: api_client.get(url, {'page_size': 2}))
+        large = count_queries(lambda: api_client.get(url, {'page_size': 100}))
+        assert small == large
+
+    def test_create(self, api_client):
+        data = {'name': 'Budget New', 'stock_quantity': 3, 'low_stock_threshold': 1}
+
+        with query_budget(BUDGETS['product-list-create']['POST']):
+            response = api_client.post(reverse('inventory:product-list-create'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_detail(self, api_client, product):
+        url = reverse('inventory:product-detail', args=[product.id])
+
+        with query_budget(BUDGETS['product-detail']['GET']):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+        # Served from the product cache the second time
+        with query_budget(0):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    def test_update(self, api_client, product):
+        data = {'name': 'Budget Renamed', 'stock_quantity': 50, 'low_stock_threshold': 7}
+
+        with query_budget(BUDGETS['product-detail']['PUT']):
+            response = api_client.put(
+                reverse('inventory:product-detail', args=[product.id]), data, format='json'
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_delete(self, api_client, product):
+        with query_budget(BUDGETS['product-detail']['DELETE']):
+            response = api_client.delete(reverse('inventory:product-detail', args=[product.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    @override_settings(INVENTORY_SYNC_SETTLE_SECONDS=0)
+    def test_changes_query_count_does_not_grow_with_page_size(self, api_client):
+        create_products(60)
+        url = reverse('inventory:product-changes')
+
+        with query_budget(BUDGETS['product-changes']['GET']):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+        small = count_queries(lambda: api_client.get(url, {'page_size': 1}))
+        assert count_queries(lambda: api_client.get(url, {'page_size': 60})) == small
+
+    def test_low_stock_query_count_does_not_grow_with_matches(self, api_client):
+        url = reverse('inventory:low-stock-products')
+        create_products(1, prefix="Low", stock_quantity=0)
+
+        with query_budget(BUDGETS['low-stock-products']['GET']):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+        few = count_queries(lambda: api_client.get(url))
+        create_products(50, prefix="Lower", stock_quantity=0)
+        assert count_queries(lambda: api_client.get(url)) == few
+
+    @override_settings(INVENTORY_EVENTS_STREAM_SECONDS=0)
+    def test_low_stock_events_connect(self, api_client):
+        with query_budget(BUDGETS['low-stock-events']['GET']):
+            response = api_client.get(reverse('inventory:low-stock-events'))
+            b''.join(response.streaming_content)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_summary(self, api_client, product):
+        url = reverse('inventory:inventory-summary')
+
+        with query_budget(BUDGETS['inventory-summary']['GET']):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+        with query_budget(0):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    def test_db_pool_stats(self, api_client):
+        with query_budget(BUDGETS['db-pool-stats']['GET']):
+            assert api_client.get(reverse('inventory:db-pool-stats')).status_code == status.HTTP_200_OK
+
+
+@postgresql_only
+@pytest.mark.django_db
+class TestStockBudgets:
+    def test_increase_and_decrease(self, api_client, product):
+        for name in ('increase-stock', 'decrease-stock'):
+            with query_budget(BUDGETS[name]['POST']):
+                response = api_client.post(
+                    reverse(f'inventory:{name}', args=[product.id]), {'quantity': 2}, format='json'
+                )
+            assert response.status_code == status.HTTP_200_OK
+
+    def test_bulk_query_count_does_not_grow_with_items(self, api_client):
+        products = create_products(200)
+        url = reverse('inventory:bulk-stock-adjustments')
+
+        def adjust(targets):
+            items = [{'product_id': target.id, 'delta': 1} for target in targets]
+            return lambda: api_client.post(url, {'items': items}, format='json')
+
+        with query_budget(BUDGETS['bulk-stock-adjustments']['POST']):
+            assert adjust(products[:1])().status_code == status.HTTP_200_OK
+        assert count_queries(adjust(products)) == count_queries(adjust(products[:1]))
+
+    def test_history_query_count_does_not_grow_with_page_size(self, api_client, product):
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                product=product, delta=1, quantity_after=50 + i,
+                reason=StockMovement.Reason.INCREASE
+            )
+            for i in range(60)
+        ])
+        url = reverse('inventory:stock-history', args=[product.id])
+
+        with query_budget(BUDGETS['stock-history']['GET']):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+        small = count_queries(lambda: api_client.get(url, {'page_size': 1}))
+        assert count_queries(lambda: api_client.get(url, {'page_size': 60})) == small
+
+    def test_location_stock_and_transfers(self, api_client, product):
+        east = Location.objects.create(code='east', name="East")
+        west = Location.objects.create(code='west', name="West")
+
+        for name in ('increase-location-stock', 'decrease-location-stock'):
+            with query_budget(BUDGETS[name]['POST']):
+                response = api_client.post(
+                    reverse(f'inventory:{name}', args=[product.id, east.id]),
+                    {'quantity': 2 if name.startswith('increase') else 1}, format='json'
+                )
+            assert response.status_code == status.HTTP_200_OK
+
+        with query_budget(BUDGETS['transfer-stock']['POST']):
+            response = api_client.post(
+                reverse('inventory:transfer-stock', args=[product.id]),
+                {'from_location': east.id, 'to_location': west.id, 'quantity': 1}, format='json'
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+        with query_budget(BUDGETS['location-stock']['GET']):
+            response = api_client.get(reverse('inventory:location-stock', args=[product.id]))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_reservation_lifecycle(self, api_client, product):
+        with query_budget(BUDGETS['reserve-stock']['POST']):
+            response = api_client.post(
+                reverse('inventory:reserve-stock', args=[product.id]), {'quantity': 3}, format='json'
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        reservation_id = response.json()['data']['id']
+
+        with query_budget(BUDGETS['stock-availability']['GET']):
+            response = api_client.get(reverse('inventory:stock-availability', args=[product.id]))
+        assert response.status_code == status.HTTP_200_OK
+
+        with query_budget(BUDGETS['commit-reservation']['POST']):
+            response = api_client.post(reverse('inventory:commit-reservation', args=[reservation_id]))
+        assert response.status_code == status.HTTP_200_OK
+
+        other = InventoryService.reserve_stock(product.id, 2)
+        with query_budget(BUDGETS['release-reservation']['POST']):
+            response = api_client.post(reverse('inventory:release-reservation', args=[other.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert StockReservation.objects.get(id=other.id).status == StockReservation.Status.RELEASED
+
+
+@postgresql_only
+@pytest.mark.django_db
+class TestCatalogBudgets:
+    def test_export_query_count_does_not_grow_with_rows(self, api_client):
+        url = reverse('inventory:export-products')
+        create_products(5)
+
+        with query_budget(BUDGETS['export-products']['GET']):
+            response = api_client.get(url, {'format': 'ndjson'})
+            b''.join(response.streaming_content)
+        few = count_queries(lambda: api_client.get(url, {'format': 'ndjson'}))
+        create_products(200, prefix="Export Row")
+        assert count_queries(lambda: api_client.get(url, {'format': 'ndjson'})) == few
+
+    def test_import_query_count_does_not_grow_with_rows(self, api_client):
+        url = reverse('inventory:import-products')
+
+        def body(count, prefix):
+            return '\n'.join(
+                json.dumps({'name': f'{prefix} {i}', 'stock_quantity': i + 1}) for i in range(count)
+            )
+
+        def post(count, prefix):
+            return lambda: api_client.generic(
+                'POST', url, body(count, prefix), content_type='application/x-ndjson'
+            )
+
+        with query_budget(BUDGETS['import-products']['POST']):
+            assert post(1, 'Imported')().status_code == status.HTTP_200_OK
+        assert count_queries(post(300, 'Imported Many')) == count_queries(post(1, 'Imported One'))
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from inventory.models import StockMovement, StockReservation
+from inventory.services import InventoryService
+from inventory.views import ProductDetailView
+from inventory.helpers.exceptions import InsufficientStockException, ReservationError
+
+
+def expire(reservation):
+    StockReservation.objects.filter(id=reservation.id).update(
+        expires_at=timezone.now() - timedelta(seconds=1)
+    )
+
+
+@pytest.mark.django_db
+class TestStockReservations:
+    def test_reserve_holds_available_stock(self, product):
+        InventoryService.reserve_stock(product.id, 4)
+
+        assert InventoryService.get_stock_availability(product.id) == {
+            'stock_quantity': 10, 'reserved_quantity': 4, 'available_quantity': 6,
+        }
+
+    def test_cannot_reserve_or_decrease_held_stock(self, product):
+        InventoryService.reserve_stock(product.id, 8)
+
+        with pytest.raises(InsufficientStockException):
+            InventoryService.reserve_stock(product.id, 3)
+        with pytest.raises(InsufficientStockException):
+            InventoryService.decrease_stock(product.id, 3)
+        result = InventoryService.bulk_adjust_stock(
+            [{'product_id': product.id, 'delta': -3}], atomic=False
+        )
+        assert result['failed'][0]['error'] == 'Insufficient stock available'
+
+    def test_commit_decrements_stock_once(self, product):
+        """Test committing moves the held quantity out of stock and reserved together."""
+        reservation = InventoryService.reserve_stock(product.id, 4)
+
+        updated = InventoryService.commit_reservation(reservation.id)
+
+        assert (updated.stock_quantity, updated.reserved_quantity) == (6, 0)
+        assert StockMovement.objects.get(product=product).reason == 'reservation'
+        with pytest.raises(ReservationError):
+            InventoryService.commit_reservation(reservation.id)
+
+    def test_release_frees_held_stock(self, product):
+        reservation = InventoryService.reserve_stock(product.id, 4)
+
+        InventoryService.release_reservation(reservation.id)
+
+        product.refresh_from_db()
+        assert (product.stock_quantity, product.reserved_quantity) == (10, 0)
+        with pytest.raises(ReservationError):
+            InventoryService.commit_reservation(reservation.id)
+
+    def test_expired_reservation_cannot_be_committed(self, product):
+        reservation = InventoryService.reserve_stock(product.id, 4)
+        expire(reservation)
+
+        with pytest.raises(ReservationError):
+            InventoryService.commit_reservation(reservation.id)
+
+    def test_sweeper_reclaims_expired_reservations_in_batches(self, product):
+        """Test only expired holds are returned, across several batches."""
+        held = [InventoryService.reserve_stock(product.id, 1) for _ in range(5)]
+        for reservation in held[:3]:
+            expire(reservation)
+
+        call_command('sweep_reservations', '--batch-size', '2')
+
+        product.refresh_from_db()
+        assert product.reserved_quantity == 2
+        assert StockReservation.objects.filter(status='expired').count() == 3
+        assert InventoryService.expire_reservations() == 0
+
+    def test_reservation_endpoints(self, product):
+        client = APIClient()
+
+        reserved = client.post(
+            reverse('inventory:reserve-stock', args=[product.id]),
+            {'quantity': 3}, format='json'
+        )
+        reservation_id = reserved.json()['data']['id']
+        committed = client.post(reverse('inventory:commit-reservation', args=[reservation_id]))
+        released = client.post(reverse('inventory:release-reservation', args=[reservation_id]))
+        availability = client.get(reverse('inventory:stock-availability', args=[product.id]))
+
+        assert reserved.status_code == status.HTTP_201_CREATED
+        assert committed.json()['data']['stock_quantity'] == 7
+        assert released.status_code == status.HTTP_409_CONFLICT
+        assert availability.json()['data']['available_quantity'] == 7
+
+    def test_update_keeps_a_reservation_made_after_the_product_was_loaded(self, product, monkeypatch):
+        load = ProductDetailView.get_object
+
+        def load_then_reserve(view):
+            instance = load(view)
+            InventoryService.reserve_stock(product.id, 4)
+            return instance
+
+        monkeypatch.setattr(ProductDetailView, 'get_object', load_then_reserve)
+        response = APIClient().patch(
+            reverse('inventory:product-detail', args=[product.id]),
+            {'description': 'Edited'}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        product.refresh_from_db()
+        assert (product.description, product.reserved_quantity) == ('Edited', 4)
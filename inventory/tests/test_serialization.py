@@ -0,0 +1,45 @@
+import pytest
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from inventory.models import Product
+from inventory.serializers import (
+    PRODUCT_VALUE_FIELDS,
+    ProductSerializer,
+    serialize_product_rows,
+)
+from inventory.helpers.renderers import FastJSONRenderer
+
+
+@pytest.fixture
+def products():
+    return [
+        Product.objects.create(name="Plenty", stock_quantity=50, low_stock_threshold=10),
+        Product.objects.create(
+            name="Caf\u00e9 Scarce", description="line\u2028break",
+            stock_quantity=3, low_stock_threshold=10
+        ),
+    ]
+
+
+@pytest.mark.django_db
+class TestProductFastPath:
+    def test_matches_product_serializer(self, products):
+        """Test the .values() fast path renders byte-for-byte like ProductSerializer."""
+        queryset = Product.objects.order_by('id')
+        expected = JSONRenderer().render(ProductSerializer(queryset, many=True).data)
+
+        rows = serialize_product_rows(queryset.values(*PRODUCT_VALUE_FIELDS))
+
+        assert FastJSONRenderer().render(rows) == expected
+
+    def test_list_and_low_stock_responses(self, products):
+        client = APIClient()
+        expected = ProductSerializer(products[1]).data
+
+        listed = client.get(reverse('inventory:product-list-create')).json()
+        low_stock = client.get(reverse('inventory:low-stock-products')).json()
+
+        assert listed['data']['results'][0] == expected
+        assert low_stock['data'] == [expected]
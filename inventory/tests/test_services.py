@@ -1,21 +1,12 @@
 import pytest
 from django.db import transaction
-from apps.inventory.models import Product
-from apps.inventory.services import InventoryService
-from apps.inventory.helpers.exceptions import InsufficientStockException
+from inventory.models import Product, StockMovement
+from inventory.services import InventoryService
+from inventory.helpers.exceptions import InsufficientStockException
 
 
 @pytest.mark.django_db
 class TestInventoryService:
-    @pytest.fixture
-    def product(self):
-        return Product.objects.create(
-            name="Test Product",
-            description="Test Description",
-            stock_quantity=10,
-            low_stock_threshold=5
-        )
-
     def test_increase_stock_success(self, product):
         """Test successful stock increase."""
         initial_stock = product.stock_quantity
@@ -142,10 +133,87 @@ class TestInventoryService:
         summary = InventoryService.get_inventory_summary()
 
         assert summary['total_products'] == 3
-        assert summary['low_stock_products'] == 1  # Low
+        assert summary['low_stock_products'] == 2  # Low and Out: stock at or below threshold
         assert summary['out_of_stock_products'] == 1  # Out
 
-    def test_get_stock_history_stub(self):
-        """Test get_stock_history returns empty list (stub implementation)."""
+    def test_get_inventory_summary_single_query(self, product, django_assert_num_queries):
+        """Test the summary is one aggregate query and then served from cache."""
+        with django_assert_num_queries(1):
+            InventoryService.get_inventory_summary()
+        with django_assert_num_queries(0):
+            summary = InventoryService.get_inventory_summary()
+
+        assert summary['total_products'] == 1
+
+    def test_get_inventory_summary_invalidated_by_adjustment(
+        self, product, django_capture_on_commit_callbacks
+    ):
+        """Test a committed stock change invalidates the cached summary."""
+        assert InventoryService.get_inventory_summary()['out_of_stock_products'] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            InventoryService.decrease_stock(product.id, product.stock_quantity)
+
+        summary = InventoryService.get_inventory_summary()
+        assert summary['out_of_stock_products'] == 1
+        assert summary['low_stock_products'] == 1
+
+    def test_get_inventory_summary_invalidated_by_threshold_change(
+        self, product, django_capture_on_commit_callbacks
+    ):
+        """Test saving a product invalidates the cached summary."""
+        assert InventoryService.get_inventory_summary()['low_stock_products'] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            product.low_stock_threshold = 50
+            product.save()
+
+        assert InventoryService.get_inventory_summary()['low_stock_products'] == 1
+
+    def test_get_stock_history_empty(self):
+        """Test get_stock_history is empty for a product without movements."""
         history = InventoryService.get_stock_history(1)
-        assert history == []
+        assert list(history) == []
+
+    def test_get_stock_history_records_adjustments(self, product):
+        """Test every adjustment appends a ledger row, newest first."""
+        InventoryService.increase_stock(product.id, 5, user_id=7)
+        InventoryService.decrease_stock(product.id, 3)
+
+        history = list(InventoryService.get_stock_history(product.id))
+
+        assert [(m.delta, m.quantity_after, m.reason) for m in history] == [
+            (-3, 12, StockMovement.Reason.DECREASE),
+            (5, 15, StockMovement.Reason.INCREASE),
+        ]
+        assert history[1].actor_id == 7
+
+    def test_save_product_records_stock_edits(self, product):
+        """Test edits and opening stock outside the stock endpoints reach the ledger."""
+        product.stock_quantity = 14
+        product.description = "Edited"
+        InventoryService.save_product(product, update_fields=['stock_quantity', 'description'], user_id=7)
+        product.description = "Edited again"
+        InventoryService.save_product(product, update_fields=['description'])
+        opened = InventoryService.save_product(Product(name="Opening", stock_quantity=6))
+
+        history = list(InventoryService.get_stock_history(product.id))
+        assert [(m.delta, m.quantity_after, m.reason, m.actor_id) for m in history] == [
+            (4, 14, StockMovement.Reason.MANUAL, 7),
+        ]
+        assert StockMovement.objects.get(product_id=opened.id).delta == 6
+
+    def test_failed_adjustment_records_no_movement(self, product):
+        """Test a rejected decrease leaves the ledger untouched."""
+        with pytest.raises(InsufficientStockException):
+            InventoryService.decrease_stock(product.id, 11)
+
+        assert not StockMovement.objects.filter(product_id=product.id).exists()
+
+    def test_stock_movements_are_append_only(self, product):
+        """Test saving an existing ledger row is refused."""
+        InventoryService.increase_stock(product.id, 1)
+        movement = StockMovement.objects.get(product_id=product.id)
+
+        with pytest.raises(ValueError, match="append-only"):
+            movement.save()
@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from inventory.models import LowStockEvent, Product, StockMovement, StockShard
+from inventory.services import InventoryService
+from inventory.views import ProductDetailView
+from inventory.helpers.exceptions import InsufficientStockException, ShardedStockError
+
+
+def shard_quantities(product):
+    return list(StockShard.objects.filter(product=product).values_list('quantity', flat=True))
+
+
+@pytest.mark.django_db
+class TestShardedStock:
+    def test_enable_spreads_stock_evenly(self, product):
+        InventoryService.enable_stock_sharding(product.id, 4)
+
+        assert shard_quantities(product) == [3, 3, 2, 2]
+
+    def test_adjustments_apply_to_shards(self, product):
+        """Test sharded adjustments keep the total exact and leave the Product row alone."""
+        InventoryService.enable_stock_sharding(product.id, 4)
+
+        InventoryService.increase_stock(product.id, 5)
+        updated = InventoryService.decrease_stock(product.id, 3)
+
+        assert updated.stock_quantity == sum(shard_quantities(product)) == 12
+        assert StockMovement.objects.filter(product=product).latest('id').quantity_after == 12
+        product.refresh_from_db()
+        assert product.stock_quantity == 10
+
+    def test_decrement_spanning_shards_never_goes_negative(self, product):
+        InventoryService.enable_stock_sharding(product.id, 4)
+
+        InventoryService.decrease_stock(product.id, 9)
+        with pytest.raises(InsufficientStockException):
+            InventoryService.decrease_stock(product.id, 2)
+
+        assert sum(shard_quantities(product)) == 1
+        assert min(shard_quantities(product)) >= 0
+
+    def test_rebalance_evens_shards_and_refreshes_snapshot(self, product):
+        InventoryService.enable_stock_sharding(product.id, 2)
+        InventoryService.decrease_stock(product.id, 4)
+
+        call_command('rebalance_stock_shards')
+
+        product.refresh_from_db()
+        assert product.stock_quantity == 6
+        assert shard_quantities(product) == [3, 3]
+
+    def test_disable_folds_shards_back(self, product):
+        InventoryService.enable_stock_sharding(product.id, 3)
+        InventoryService.decrease_stock(product.id, 4)
+
+        InventoryService.disable_stock_sharding(product.id)
+
+        product.refresh_from_db()
+        assert (product.stock_quantity, product.stock_shards) == (6, 0)
+        assert not StockShard.objects.filter(product=product).exists()
+
+    def test_reservations_and_bulk_adjustments_are_rejected(self, product):
+        InventoryService.enable_stock_sharding(product.id, 2)
+
+        with pytest.raises(ShardedStockError):
+            InventoryService.reserve_stock(product.id, 1)
+        result = InventoryService.bulk_adjust_stock(
+            [{'product_id': product.id, 'delta': 1}], atomic=False
+        )
+        assert result['failed'][0]['error'] == 'Product uses sharded stock'
+
+    def test_update_keeps_sharding_enabled_after_the_product_was_loaded(self, product, monkeypatch):
+        load = ProductDetailView.get_object
+
+        def load_then_shard(view):
+            instance = load(view)
+            InventoryService.enable_stock_sharding(product.id, 2)
+            return instance
+
+        monkeypatch.setattr(ProductDetailView, 'get_object', load_then_shard)
+        response = APIClient().patch(
+            reverse('inventory:product-detail', args=[product.id]),
+            {'low_stock_threshold': 3}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        product.refresh_from_db()
+        assert (product.low_stock_threshold, product.stock_shards) == (3, 2)
+        assert sum(shard_quantities(product)) == 10
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="Needs PostgreSQL row locks")
+@pytest.mark.django_db(transaction=True)
+def test_parallel_sharded_decrements_lose_no_updates():
+    product = Product.objects.create(name="Sharded Hot SKU", stock_quantity=250)
+    InventoryService.enable_stock_sharding(product.id, 8)
+
+    def decrement(_):
+        try:
+            InventoryService.decrease_stock(product.id, 1)
+            return True
+        except InsufficientStockException:
+            return False
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(decrement, range(300)))
+
+    assert results.count(True) == 250
+    assert sum(shard_quantities(product)) == 0
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="Needs PostgreSQL row locks")
+@pytest.mark.django_db(transaction=True)
+def test_parallel_sharded_adjustments_report_each_crossing_once():
+    product = Product.objects.create(name="Sharded Event SKU", stock_quantity=60, low_stock_threshold=30)
+    InventoryService.enable_stock_sharding(product.id, 8)
+
+    def adjust(delta):
+        try:
+            InventoryService.adjust_stock(product.id, delta, 'increase' if delta > 0 else 'decrease')
+        finally:
+            connections.close_all()
+
+    # Net -40 in both directions at once: crossings alternate, starting and ending low
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(adjust, [-1, -1, 1] * 20 + [-1] * 20))
+
+    transitions = list(
+        LowStockEvent.objects.filter(product=product).order_by('id').values_list('transition', flat=True)
+    )
+    assert transitions[0] == transitions[-1] == 'low'
+    assert all(a != b for a, b in zip(transitions, transitions[1:]))
@@ -0,0 +1,144 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection, connections, transaction
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from inventory.models import Product, ProductTombstone
+from inventory.services import InventoryService
+from inventory.helpers.sync import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    purge_expired_tombstones,
+)
+
+CHANGES_URL = reverse('inventory:product-changes')
+
+
+@pytest.fixture(autouse=True)
+def no_settle_window():
+    with override_settings(INVENTORY_SYNC_SETTLE_SECONDS=0):
+        yield
+
+
+def sync(api_client, since=None, **params):
+    if since is not None:
+        params['since'] = since
+    response = api_client.get(CHANGES_URL, params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()['data']
+
+
+def test_cursor_round_trip():
+    now = timezone.now()
+    position, issued_at = decode_cursor(encode_cursor((now, 42), now))
+
+    assert position == (now, 42)
+    assert issued_at == now.replace(microsecond=0)
+    with pytest.raises(InvalidCursor):
+        decode_cursor('not-a-cursor')
+
+
+@pytest.mark.django_db
+class TestProductChanges:
+    def test_full_sync_pages_through_the_catalog(self, api_client):
+        for i in range(5):
+            Product.objects.create(name=f"Sync Product {i}", stock_quantity=i)
+
+        seen, cursor = [], None
+        while True:
+            data = sync(api_client, cursor, page_size=2)
+            seen += [row['name'] for row in data['results']]
+            cursor = data['next']
+            if not data['has_more']:
+                break
+        assert sorted(seen) == [f"Sync Product {i}" for i in range(5)]
+
+        # Caught up: nothing until something changes
+        assert sync(api_client, cursor)['results'] == []
+
+    def test_returns_only_rows_changed_after_the_cursor(self, api_client):
+        first = Product.objects.create(name="Sync First", stock_quantity=1)
+        Product.objects.create(name="Sync Second", stock_quantity=1)
+        cursor = sync(api_client)['next']
+
+        api_client.post(
+            reverse('inventory:increase-stock', args=[first.id]), {'quantity': 3}, format='json'
+        )
+        data = sync(api_client, cursor)
+        assert [row['name'] for row in data['results']] == ["Sync First"]
+        assert data['results'][0]['stock_quantity'] == 4
+
+    def test_deletions_through_the_detail_view_leave_tombstones(self, api_client):
+        product = Product.objects.create(name="Sync Doomed", stock_quantity=1)
+        cursor = sync(api_client)['next']
+
+        response = api_client.delete(reverse('inventory:product-detail', args=[product.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        data = sync(api_client, cursor)
+        assert data['results'] == []
+        assert [(row['id'], row['name']) for row in data['deleted']] == [(product.id, "Sync Doomed")]
+
+    def test_settle_window_holds_back_fresh_rows(self, api_client):
+        Product.objects.create(name="Sync Fresh", stock_quantity=1)
+
+        with override_settings(INVENTORY_SYNC_SETTLE_SECONDS=60):
+            data = sync(api_client)
+        assert data['results'] == []
+        # The cursor did not move past the held-back row
+        assert [row['name'] for row in sync(api_client, data['next'])['results']] == ["Sync Fresh"]
+
+    def test_bad_and_expired_cursors(self, api_client):
+        response = api_client.get(CHANGES_URL, {'since': 'garbage'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        long_ago = timezone.now() - timedelta(days=400)
+        response = api_client.get(CHANGES_URL, {'since': encode_cursor((long_ago, 0), long_ago)})
+        assert response.status_code == status.HTTP_410_GONE
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="Needs pg_stat_activity")
+@pytest.mark.django_db(transaction=True)
+def test_cursor_waits_for_open_write_transactions(api_client):
+    product = Product.objects.create(name="Sync Slow Writer", stock_quantity=1)
+    cursor = sync(api_client)['next']
+    written, release = threading.Event(), threading.Event()
+
+    def slow_writer():
+        try:
+            with transaction.atomic():
+                InventoryService.save_product(
+                    Product(id=product.id, name="Sync Slow Writer", stock_quantity=2),
+                    update_fields=['stock_quantity'],
+                )
+                written.set()
+                release.wait(10)
+        finally:
+            connections.close_all()
+
+    writer = threading.Thread(target=slow_writer)
+    writer.start()
+    written.wait(10)
+    # The writer stamped updated_at but has not committed: the cursor must stay behind it
+    cursor = sync(api_client, cursor)['next']
+    release.set()
+    writer.join()
+
+    assert [row['stock_quantity'] for row in sync(api_client, cursor)['results']] == [2]
+
+
+@pytest.mark.django_db
+def test_purge_expired_tombstones():
+    ProductTombstone.objects.create(
+        product_id=1, name="Old", deleted_at=timezone.now() - timedelta(days=400)
+    )
+    ProductTombstone.objects.create(product_id=2, name="Recent")
+
+    assert purge_expired_tombstones(batch_size=1) == 1
+    assert list(ProductTombstone.objects.values_list('name', flat=True)) == ["Recent"]
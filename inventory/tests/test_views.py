@@ -1,21 +1,15 @@
+import csv
+import io
+import json
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.contrib import admin
+from django.test import AsyncClient
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APIClient
-from apps.inventory.models import Product
-
-@pytest.fixture
-def api_client():
-    return APIClient()
-
-@pytest.fixture
-def product():
-    return Product.objects.create(
-        name="Test Product",
-        description="Test Description",
-        stock_quantity=10,
-        low_stock_threshold=5
-    )
+from inventory.admin import ProductAdmin
+from inventory.models import Product, StockMovement
 
 @pytest.mark.django_db
 class TestProductAPI:
@@ -28,7 +22,7 @@ class TestProductAPI:
             'low_stock_threshold': 5
         }
         
-        response = api_client.post(url, data)
+        response = api_client.post(url, data, format='json')
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data['name'] == data['name']
         assert response.data['stock_quantity'] == data['stock_quantity']
@@ -38,27 +32,57 @@ class TestProductAPI:
         initial_quantity = product.stock_quantity
         increase_by = 5
         
-        response = api_client.post(url, {'quantity': increase_by})
+        response = api_client.post(url, {'quantity': increase_by}, format='json')
         assert response.status_code == status.HTTP_200_OK
-        assert response.data['product']['stock_quantity'] == initial_quantity + increase_by
+        assert response.data['data']['stock_quantity'] == initial_quantity + increase_by
 
     def test_decrease_stock_success(self, api_client, product):
         url = reverse('inventory:decrease-stock', args=[product.id])
         initial_quantity = product.stock_quantity
         decrease_by = 5
         
-        response = api_client.post(url, {'quantity': decrease_by})
+        response = api_client.post(url, {'quantity': decrease_by}, format='json')
         assert response.status_code == status.HTTP_200_OK
-        assert response.data['product']['stock_quantity'] == initial_quantity - decrease_by
+        assert response.data['data']['stock_quantity'] == initial_quantity - decrease_by
 
     def test_decrease_stock_insufficient(self, api_client, product):
         url = reverse('inventory:decrease-stock', args=[product.id])
         decrease_by = product.stock_quantity + 1
         
-        response = api_client.post(url, {'quantity': decrease_by})
+        response = api_client.post(url, {'quantity': decrease_by}, format='json')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'error' in response.data
 
+    def test_stock_edits_are_recorded_in_the_ledger(self, api_client, admin_user, rf, product):
+        api_client.patch(
+            reverse('inventory:product-detail', args=[product.id]),
+            {'stock_quantity': 12}, format='json'
+        )
+        request = rf.post('/')
+        request.user = admin_user
+        model_admin = ProductAdmin(Product, admin.site)
+        form = model_admin.get_form(request, product, change=True)(
+            {'name': product.name, 'description': '', 'stock_quantity': 9,
+             'low_stock_threshold': 5, 'is_active': 'on'},
+            instance=Product.objects.get(id=product.id)
+        )
+        assert form.is_valid()
+        model_admin.save_model(request, form.save(commit=False), form, change=True)
+
+        product.refresh_from_db()
+        assert product.stock_quantity == 9
+        assert list(
+            StockMovement.objects.filter(product=product).order_by('id')
+            .values_list('reason', 'delta', 'quantity_after')
+        ) == [('manual', 2, 12), ('admin', -3, 9)]
+
+    def test_missing_product_is_reported_before_bad_quantity(self, api_client):
+        for name in ('increase-stock', 'decrease-stock'):
+            response = api_client.post(
+                reverse(f'inventory:{name}', args=[999999]), {'quantity': 0}, format='json'
+            )
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_low_stock_products(self, api_client, product):
         # Set stock below threshold
         product.stock_quantity = product.low_stock_threshold - 1
@@ -68,5 +92,110 @@ class TestProductAPI:
         response = api_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) > 0
-        assert any(p['id'] == product.id for p in response.data)
\ No newline at end of file
+        assert len(response.data['data']) > 0
+        assert any(p['id'] == product.id for p in response.data['data'])
+
+    def test_stock_history_keyset_pagination(self, api_client, product):
+        for _ in range(5):
+            api_client.post(
+                reverse('inventory:increase-stock', args=[product.id]),
+                {'quantity': 1}, format='json'
+            )
+
+        url = reverse('inventory:stock-history', args=[product.id])
+        response = api_client.get(url, {'page_size': 3})
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.data['data']['results']
+        assert [m['quantity_after'] for m in first_page] == [15, 14, 13]
+
+        response = api_client.get(response.data['data']['pagination']['next'])
+        second_page = response.data['data']['results']
+        assert [m['quantity_after'] for m in second_page] == [12, 11]
+        assert response.data['data']['pagination']['next'] is None
+
+    def test_list_products_cursor_pagination(self, api_client):
+        for i in range(5):
+            Product.objects.create(name=f"Paged {i}", stock_quantity=i)
+
+        url = reverse('inventory:product-list-create')
+        response = api_client.get(url, {'page_size': 2, 'count': 'exact'})
+        assert response.status_code == status.HTTP_200_OK
+        pagination = response.data['data']['pagination']
+        assert pagination['count'] == 5
+
+        names = [p['name'] for p in response.data['data']['results']]
+        while pagination['next']:
+            response = api_client.get(pagination['next'])
+            pagination = response.data['data']['pagination']
+            names += [p['name'] for p in response.data['data']['results']]
+
+        assert names == [f"Paged {i}" for i in range(5)]
+
+    def test_list_products_count_is_optional(self, api_client, product):
+        url = reverse('inventory:product-list-create')
+
+        response = api_client.get(url)
+        assert response.data['data']['pagination']['count'] is None
+
+        response = api_client.get(url, {'count': 'estimate'})
+        assert response.data['data']['pagination']['count'] >= 0
+
+    def test_list_products_invalid_cursor(self, api_client):
+        url = reverse('inventory:product-list-create')
+        response = api_client.get(url, {'cursor': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_low_stock_products_excludes_inactive(self, api_client, product):
+        product.stock_quantity = 0
+        product.is_active = False
+        product.save()
+
+        response = api_client.get(reverse('inventory:low-stock-products'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data'] == []
+
+    def test_inventory_summary(self, api_client, product):
+        response = api_client.get(reverse('inventory:inventory-summary'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data'] == {
+            'total_products': 1,
+            'low_stock_products': 0,
+            'out_of_stock_products': 0,
+        }
+
+    def test_export_products_ndjson_matches_serializer(self, api_client, product):
+        response = api_client.get(reverse('inventory:export-products'), {'format': 'ndjson'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        detail = api_client.get(reverse('inventory:product-detail', args=[product.id]))
+        assert [json.loads(line) for line in lines] == [dict(detail.data)]
+
+    def test_export_products_csv(self, api_client, product):
+        response = api_client.get(reverse('inventory:export-products'), {'format': 'csv'})
+
+        rows = list(csv.reader(
+            io.StringIO(b''.join(response.streaming_content).decode())
+        ))
+        assert rows[0][:4] == ['id', 'name', 'description', 'stock_quantity']
+        assert rows[1][1:4] == ['Test Product', 'Test Description', '10']
+        assert len(rows) == 2
+
+    def test_export_products_streams_asynchronously_under_asgi(self, product):
+        async def export():
+            response = await AsyncClient().get(
+                reverse('inventory:export-products'), {'format': 'ndjson'}
+            )
+            # An async iterator, which Django streams without buffering it first
+            assert response.is_async
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        lines = async_to_sync(export)().decode().splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [product.id]
+
+    def test_export_products_rejects_unknown_format(self, api_client):
+        response = api_client.get(reverse('inventory:export-products'), {'format': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,17 +1,58 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'inventory'
 
+product_list_create = views.ProductListCreateView.as_view()
+product_detail = views.ProductDetailView.as_view()
+low_stock_products = views.low_stock_products
+inventory_summary = views.inventory_summary
+
+if settings.INVENTORY_ASYNC_READS:
+    # GETs on the async ORM; writes still go through the DRF views
+    product_list_create = async_views.with_async_reads(async_views.product_list, product_list_create)
+    product_detail = async_views.with_async_reads(async_views.product_detail, product_detail)
+    low_stock_products = async_views.with_async_reads(async_views.low_stock_products, low_stock_products)
+    inventory_summary = async_views.with_async_reads(async_views.inventory_summary, inventory_summary)
+
 urlpatterns = [
     # Product CRUD endpoints
-    path('products/', views.ProductListCreateView.as_view(), name='product-list-create'),
-    path('products/<int:pk>/', views.ProductDetailView.as_view(), name='product-detail'),
+    path('products/', product_list_create, name='product-list-create'),
+    path('products/<int:pk>/', product_detail, name='product-detail'),
+    path('products/changes/', views.product_changes, name='product-changes'),
     
     # Stock management endpoints
     path('products/<int:product_id>/increase-stock/', views.increase_stock, name='increase-stock'),
     path('products/<int:product_id>/decrease-stock/', views.decrease_stock, name='decrease-stock'),
+    path('products/stock-adjustments/', views.bulk_adjust_stock, name='bulk-stock-adjustments'),
+    path('products/<int:product_id>/stock-history/', views.StockHistoryView.as_view(), name='stock-history'),
+    
+    # Multi-location stock endpoints
+    path('products/<int:product_id>/locations/', views.location_stock, name='location-stock'),
+    path('products/<int:product_id>/locations/<int:location_id>/increase-stock/',
+         views.increase_location_stock, name='increase-location-stock'),
+    path('products/<int:product_id>/locations/<int:location_id>/decrease-stock/',
+         views.decrease_location_stock, name='decrease-location-stock'),
+    path('products/<int:product_id>/transfers/', views.transfer_stock, name='transfer-stock'),
+    
+    # Reservation endpoints
+    path('products/<int:product_id>/reservations/', views.reserve_stock, name='reserve-stock'),
+    path('products/<int:product_id>/availability/', views.stock_availability, name='stock-availability'),
+    path('reservations/<int:reservation_id>/commit/', views.commit_reservation, name='commit-reservation'),
+    path('reservations/<int:reservation_id>/release/', views.release_reservation, name='release-reservation'),
+    
+    # Low stock endpoints
+    path('products/low-stock/', low_stock_products, name='low-stock-products'),
+    path('events/low-stock/', views.low_stock_events, name='low-stock-events'),
+    
+    # Catalog export/import endpoints
+    path('products/export/', views.export_products, name='export-products'),
+    path('products/import/', views.import_products, name='import-products'),
+    
+    # Summary endpoint
+    path('products/summary/', inventory_summary, name='inventory-summary'),
     
-    # Low stock endpoint
-    path('products/low-stock/', views.low_stock_products, name='low-stock-products'),
+    # Operational endpoints
+    path('system/db-pool/', views.database_pool_stats, name='db-pool-stats'),
 ]
\ No newline at end of file
@@ -3,24 +3,95 @@ Product Inventory Management API Views
 Simple CRUD and inventory management endpoints
 """
 
-from django.db.models import F
-
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
 from rest_framework import generics, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 
-from .models import Product
-from .serializers import ProductSerializer
+from inventory_management.db.pool import pool_stats
+
+from .models import Location, Product, StockMovement, StockReservation
+from .serializers import (
+    BulkStockAdjustmentSerializer,
+    PRODUCT_VALUE_FIELDS,
+    ProductSerializer,
+    StockMovementSerializer,
+    StockReservationRequestSerializer,
+    StockReservationSerializer,
+    StockTransferSerializer,
+    serialize_product_rows,
+)
+from .services import InventoryService, stock_increment_buffer
+from .helpers.exceptions import (
+    BulkAdjustmentError,
+    ImportFormatError,
+    InsufficientStockException,
+    PreconditionFailedError,
+    ReservationError,
+    ShardedStockError,
+)
+from .helpers.cache import product_cache
+from .helpers.etags import (
+    if_match_versions,
+    if_none_match,
+    not_modified,
+    page_version_fields,
+    paginated_page_etag,
+    precondition_failed,
+    product_etag,
+    representation_etag,
+)
+from .helpers.events import astream_events, low_stock_feed, stream_events
+from .helpers.export import aiter_chunks, iter_product_rows, stream_csv, stream_ndjson
+from .helpers.filters import ProductFilterBackend
+from .helpers.idempotency import idempotent
+from .helpers.importers import ProductImporter, decode_lines, read_rows
+from .helpers.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, gauge_lines, render_metrics
+from .helpers.renderers import FastJSONRenderer
+from .helpers.responses import APIResponse, ProductCursorPagination, StockHistoryPagination
+from .helpers.sync import (
+    DEFAULT_PAGE_SIZE as SYNC_PAGE_SIZE,
+    MAX_PAGE_SIZE as SYNC_MAX_PAGE_SIZE,
+    CursorExpired,
+    InvalidCursor,
+    delete_product,
+    get_changes,
+)
 
 
 class ProductListCreateView(generics.ListCreateAPIView):
     """
     Handle product list and create operations
-    GET:  /api/products/ - List all products
+    GET:  /api/products/ - List products in name order, cursor paginated
+          (?cursor=, ?page_size=, ?count=exact|estimate) and filtered
+          (?search=, ?name_prefix=, ?is_active=, ?low_stock=, ?min_stock=, ?max_stock=)
     POST: /api/products/ - Create new product
+    Listing reads .values() rows and skips ProductSerializer entirely.
+    Pages carry an ETag; If-None-Match is checked against the page's ids
+    and updated_at values before the full rows are read.
     """
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
+    filter_backends = [ProductFilterBackend]
+    renderer_classes = [FastJSONRenderer]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'If-None-Match' in request.headers:
+            versions = self.paginate_queryset(queryset.values(*page_version_fields(self.paginator)))
+            etag = paginated_page_etag(self.paginator, versions)
+            if if_none_match(request, etag):
+                return not_modified(etag)
+        
+        page = self.paginate_queryset(queryset.values(*PRODUCT_VALUE_FIELDS))
+        response = self.get_paginated_response(serialize_product_rows(page))
+        response['ETag'] = paginated_page_etag(self.paginator, page)
+        return response
 
 
 class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -28,37 +99,88 @@ class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
     Handle single product operations
     GET:    /api/products/{id}/ - Get product details
     PUT:    /api/products/{id}/ - Update product
-    DELETE: /api/products/{id}/ - Delete product
+    PATCH:  /api/products/{id}/ - Partially update product
+    DELETE: /api/products/{id}/ - Delete product, leaving a sync tombstone
+    GET responses are served through the read-through product cache and
+    carry an ETag; If-None-Match answers 304 from the cached data. Writes
+    honour If-Match with 412 Precondition Failed.
     """
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        def load():
+            return self.get_serializer(self.get_object()).data
+
+        data = product_cache.get(self.kwargs['pk'], load)
+        etag = representation_etag(data)
+        if if_none_match(request, etag):
+            return not_modified(etag)
+        return Response(data, headers={'ETag': etag})
+
+    def update(self, request, *args, **kwargs):
+        versions = if_match_versions(request, int(self.kwargs['pk']))
+        if versions is None:
+            response = super().update(request, *args, **kwargs)
+        else:
+            with transaction.atomic():
+                # Only the version column; the lock holds it until the update commits
+                current = Product.objects.select_for_update().filter(
+                    pk=self.kwargs['pk']
+                ).values_list('updated_at', flat=True).first()
+                if current not in versions:
+                    return precondition_failed()
+                response = super().update(request, *args, **kwargs)
+        
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = representation_etag(response.data)
+        return response
+
+    def perform_destroy(self, instance):
+        delete_product(instance)
+
 
 @api_view(['POST'])
+@idempotent
 def increase_stock(request, product_id):
     """
     Increase product stock quantity
     Expected JSON body: {"quantity": number}
+    Retries carrying the same Idempotency-Key header replay the first response.
+    An If-Match header makes the increase conditional (412 when stale).
     """
     try:
-        product = Product.objects.get(id=product_id)
         quantity = request.data.get('quantity')
         
         if not quantity or quantity <= 0:
+            # A missing product answers 404 before the quantity is rejected;
+            # only this error path pays for the lookup
+            if not Product.objects.filter(id=product_id).exists():
+                raise Product.DoesNotExist
             return Response(
                 {'error': 'Quantity must be a positive number'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        product.stock_quantity += quantity
-        product.save()
+        product = InventoryService.increase_stock(
+            product_id, quantity, user_id=request.user.id,
+            versions=if_match_versions(request, product_id)
+        )
+        if product is None:
+            # Buffered with immediate durability; applied on the next flush
+            return Response({
+                'success': True,
+                'message': f'Stock increase of {quantity} units queued'
+            }, status=status.HTTP_202_ACCEPTED)
         
         return Response({
             'success': True,
             'message': f'Stock increased by {quantity} units',
             'data': ProductSerializer(product).data
-        })
+        }, headers={'ETag': product_etag(product.id, product.updated_at)})
         
+    except PreconditionFailedError:
+        return precondition_failed()
     except Product.DoesNotExist:
         return Response(
             {'error': 'Product not found'},
@@ -72,36 +194,182 @@ def increase_stock(request, product_id):
 
 
 @api_view(['POST'])
+@idempotent
 def decrease_stock(request, product_id):
     """
     Decrease product stock quantity
     Expected JSON body: {"quantity": number}
+    Retries carrying the same Idempotency-Key header replay the first response.
+    An If-Match header makes the decrease conditional (412 when stale).
     """
     try:
-        product = Product.objects.get(id=product_id)
         quantity = request.data.get('quantity')
         
         if not quantity or quantity <= 0:
+            # A missing product answers 404 before the quantity is rejected;
+            # only this error path pays for the lookup
+            if not Product.objects.filter(id=product_id).exists():
+                raise Product.DoesNotExist
             return Response(
                 {'error': 'Quantity must be a positive number'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if product.stock_quantity < quantity:
-            return Response(
-                {'error': 'Insufficient stock available'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        product.stock_quantity -= quantity
-        product.save()
+        product = InventoryService.decrease_stock(
+            product_id, quantity, user_id=request.user.id,
+            versions=if_match_versions(request, product_id)
+        )
         
         return Response({
             'success': True,
             'message': f'Stock decreased by {quantity} units',
             'data': ProductSerializer(product).data
-        })
+        }, headers={'ETag': product_etag(product.id, product.updated_at)})
         
+    except PreconditionFailedError:
+        return precondition_failed()
+    except InsufficientStockException:
+        return Response(
+            {'error': 'Insufficient stock available'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Product.DoesNotExist:
+        return Response(
+            {'error': 'Product not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to decrease stock'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@idempotent
+def bulk_adjust_stock(request):
+    """
+    Apply many stock adjustments in one transaction
+    Expected JSON body:
+        {"items": [{"product_id": number, "delta": number}, ...], "atomic": bool}
+    With atomic=true (default) any failing item rejects the whole batch;
+    with atomic=false valid items are applied and failures are reported.
+    Retries carrying the same Idempotency-Key header replay the first response.
+    """
+    serializer = BulkStockAdjustmentSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid adjustment items', 'detail': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        result = InventoryService.bulk_adjust_stock(
+            serializer.validated_data['items'],
+            atomic=serializer.validated_data['atomic'],
+            user_id=request.user.id
+        )
+    except BulkAdjustmentError as exc:
+        return Response(
+            {
+                'success': False,
+                'error': 'No adjustments were applied',
+                'failed': exc.failures
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to apply stock adjustments'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    return Response({
+        'success': True,
+        'message': (
+            f"Applied adjustments to {len(result['applied'])} products, "
+            f"{len(result['failed'])} items failed"
+        ),
+        'data': result
+    })
+
+
+def _adjust_location_stock(request, product_id, location_id, sign):
+    """Shared body of the location-scoped increase/decrease views."""
+    quantity = request.data.get('quantity')
+    
+    if not quantity or quantity <= 0:
+        return Response(
+            {'error': 'Quantity must be a positive number'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    reason = StockMovement.Reason.INCREASE if sign > 0 else StockMovement.Reason.DECREASE
+    product, at_location = InventoryService.adjust_location_stock(
+        product_id, location_id, sign * quantity, reason, user_id=request.user.id
+    )
+    return Response({
+        'success': True,
+        'message': f"Stock {'increased' if sign > 0 else 'decreased'} by {quantity} units at location {location_id}",
+        'data': {
+            **ProductSerializer(product).data,
+            'location': {'location_id': location_id, 'quantity': at_location},
+        }
+    }, headers={'ETag': product_etag(product.id, product.updated_at)})
+
+
+@api_view(['POST'])
+@idempotent
+def increase_location_stock(request, product_id, location_id):
+    """
+    Increase a product's stock at one location
+    Expected JSON body: {"quantity": number}
+    The product's stock_quantity grows by the same amount.
+    """
+    try:
+        return _adjust_location_stock(request, product_id, location_id, 1)
+    except ShardedStockError:
+        return Response(
+            {'error': 'Products with sharded stock cannot be stocked at locations'},
+            status=status.HTTP_409_CONFLICT
+        )
+    except Location.DoesNotExist:
+        return Response(
+            {'error': 'Location not found or inactive'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Product.DoesNotExist:
+        return Response(
+            {'error': 'Product not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to increase stock'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@idempotent
+def decrease_location_stock(request, product_id, location_id):
+    """
+    Decrease a product's stock at one location
+    Expected JSON body: {"quantity": number}
+    The product's stock_quantity drops by the same amount.
+    """
+    try:
+        return _adjust_location_stock(request, product_id, location_id, -1)
+    except InsufficientStockException:
+        return Response(
+            {'error': 'Insufficient stock at location'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Location.DoesNotExist:
+        return Response(
+            {'error': 'Location not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
     except Product.DoesNotExist:
         return Response(
             {'error': 'Product not found'},
@@ -114,26 +382,459 @@ def decrease_stock(request, product_id):
         )
 
 
+@api_view(['POST'])
+@idempotent
+def transfer_stock(request, product_id):
+    """
+    Move stock of a product between two locations atomically
+    Expected JSON body: {"from_location": id, "to_location": id, "quantity": number}
+    The product's stock_quantity is unchanged.
+    """
+    serializer = StockTransferSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid transfer', 'detail': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    data = serializer.validated_data
+    try:
+        after = InventoryService.transfer_stock(
+            product_id, data['from_location'], data['to_location'], data['quantity'],
+            user_id=request.user.id
+        )
+    except InsufficientStockException:
+        return Response(
+            {'error': 'Insufficient stock at source location'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Location.DoesNotExist:
+        return Response(
+            {'error': 'Location not found or inactive'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Product.DoesNotExist:
+        return Response(
+            {'error': 'Product not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to transfer stock'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    return Response({
+        'success': True,
+        'message': f"Transferred {data['quantity']} units",
+        'data': {
+            'product_id': product_id,
+            'locations': [
+                {'location_id': location_id, 'quantity': quantity}
+                for location_id, quantity in after.items()
+            ],
+        }
+    })
+
+
 @api_view(['GET'])
+def location_stock(request, product_id):
+    """
+    Get a product's stock split by location
+    Unassigned stock is the part of stock_quantity not held at any location.
+    """
+    try:
+        return Response({
+            'success': True,
+            'message': 'Location stock retrieved',
+            'data': InventoryService.get_location_stock(product_id)
+        })
+        
+    except Product.DoesNotExist:
+        return Response(
+            {'error': 'Product not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+
+@api_view(['POST'])
+@idempotent
+def reserve_stock(request, product_id):
+    """
+    Hold available stock for a pending checkout
+    Expected JSON body: {"quantity": number, "ttl_seconds": number (optional)}
+    On-hand stock is only decremented when the reservation is committed.
+    """
+    serializer = StockReservationRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid reservation', 'detail': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        reservation = InventoryService.reserve_stock(
+            product_id,
+            serializer.validated_data['quantity'],
+            ttl_seconds=serializer.validated_data.get('ttl_seconds')
+        )
+        
+        return Response({
+            'success': True,
+            'message': f"Reserved {reservation.quantity} units",
+            'data': StockReservationSerializer(reservation).data
+        }, status=status.HTTP_201_CREATED)
+        
+    except InsufficientStockException:
+        return Response(
+            {'error': 'Insufficient stock available'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except ShardedStockError:
+        return Response(
+            {'error': 'Products with sharded stock cannot be reserved'},
+            status=status.HTTP_409_CONFLICT
+        )
+    except Product.DoesNotExist:
+        return Response(
+            {'error': 'Product not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to reserve stock'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@idempotent
+def commit_reservation(request, reservation_id):
+    """
+    Convert an active reservation into a stock decrease
+    """
+    try:
+        product = InventoryService.commit_reservation(
+            reservation_id, user_id=request.user.id
+        )
+        
+        return Response({
+            'success': True,
+            'message': f'Reservation {reservation_id} committed',
+            'data': ProductSerializer(product).data
+        })
+        
+    except ReservationError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+    except StockReservation.DoesNotExist:
+        return Response(
+            {'error': 'Reservation not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to commit reservation'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+def release_reservation(request, reservation_id):
+    """
+    Return an active reservation's quantity to available stock
+    """
+    try:
+        reservation = InventoryService.release_reservation(reservation_id)
+        
+        return Response({
+            'success': True,
+            'message': f'Reservation {reservation_id} released',
+            'data': StockReservationSerializer(reservation).data
+        })
+        
+    except ReservationError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+    except StockReservation.DoesNotExist:
+        return Response(
+            {'error': 'Reservation not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception:
+        return Response(
+            {'error': 'Failed to release reservation'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+def stock_availability(request, product_id):
+    """
+    Get on-hand, reserved and available stock for a product
+    Available stock is on-hand minus active reservations and stock held at locations.
+    """
+    try:
+        return Response({
+            'success': True,
+            'message': 'Stock availability retrieved',
+            'data': InventoryService.get_stock_availability(product_id)
+        })
+        
+    except Product.DoesNotExist:
+        return Response(
+            {'error': 'Product not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer])
+def product_changes(request):
+    """
+    Get products changed and deleted after a sync cursor
+    GET: /api/products/changes/?since=<cursor>&page_size=n
+    Start without ?since= for a full sync, then pass back data.next;
+    keep going while data.has_more is true.
+    """
+    try:
+        page_size = min(max(int(request.query_params['page_size']), 1), SYNC_MAX_PAGE_SIZE)
+    except (KeyError, ValueError):
+        page_size = SYNC_PAGE_SIZE
+    
+    try:
+        data = get_changes(request.query_params.get('since'), page_size)
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    except CursorExpired:
+        return Response(
+            {'error': 'Cursor has expired; start a full sync without since'},
+            status=status.HTTP_410_GONE
+        )
+    
+    return Response({
+        'success': True,
+        'message': f"{len(data['results'])} changed and {len(data['deleted'])} deleted products",
+        'data': data
+    })
+
+
+class StockHistoryView(generics.ListAPIView):
+    """
+    Handle stock movement history for a product
+    GET: /api/products/{id}/stock-history/ - Newest-first movements, cursor paginated
+    """
+    serializer_class = StockMovementSerializer
+    pagination_class = StockHistoryPagination
+
+    def get_queryset(self):
+        return InventoryService.get_stock_history(self.kwargs['product_id'])
+
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer])
 def low_stock_products(request):
     """
-    Get all products with low stock
+    Get all active products with low stock
     Returns products where stock_quantity <= low_stock_threshold
     """
     try:
-        products = Product.objects.filter(
-            stock_quantity__lte=F('low_stock_threshold')
-        ).order_by('stock_quantity')
+        rows = InventoryService.get_low_stock_products().values(*PRODUCT_VALUE_FIELDS)
         
-        serializer = ProductSerializer(products, many=True)
+        data = serialize_product_rows(rows)
         return Response({
             'success': True,
-            'message': f'Found {len(serializer.data)} low stock products',
-            'data': serializer.data
+            'message': f'Found {len(data)} low stock products',
+            'data': data
         })
         
     except Exception:
         return Response(
             {'error': 'Failed to retrieve low stock products'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@api_view(['GET'])
+def inventory_summary(request):
+    """
+    Get overall inventory summary statistics
+    Returns total, low stock and out of stock product counts
+    """
+    try:
+        return Response({
+            'success': True,
+            'message': 'Inventory summary retrieved',
+            'data': InventoryService.get_inventory_summary()
+        })
+        
+    except Exception:
+        return Response(
+            {'error': 'Failed to retrieve inventory summary'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+def database_pool_stats(request):
+    """
+    Get connection pool statistics for this worker process
+    Pool size, checkouts, new connections and checkout wait times per database
+    """
+    database = settings.DATABASES['default']
+    return Response({
+        'success': True,
+        'message': 'Connection pool statistics retrieved',
+        'data': {
+            'pooled': settings.DB_POOL,
+            'pgbouncer': settings.DB_PGBOUNCER,
+            'conn_max_age': database['CONN_MAX_AGE'],
+            'pools': pool_stats(),
+        }
+    })
+
+
+def _runtime_metric_lines():
+    """Pool, product cache and increment buffer state read at scrape time."""
+    pools = pool_stats()
+    lines = gauge_lines(
+        'inventory_db_pool_connections', 'Pooled database connections by state.',
+        [({'database': name, 'state': state}, stats[state])
+         for name, stats in pools.items() for state in ('open', 'idle', 'in_use')]
+    )
+    for key in ('checkouts', 'connects', 'waits', 'timeouts'):
+        lines += gauge_lines(
+            f'inventory_db_pool_{key}_total', f'Pool {key} since the process started.',
+            [({'database': name}, stats[key]) for name, stats in pools.items()],
+            kind='counter'
+        )
+    lines += gauge_lines(
+        'inventory_product_cache_lookups_total', 'Product cache lookups by outcome.',
+        [({'outcome': outcome}, count) for outcome, count in product_cache.stats().items()
+         if outcome != 'local_entries'],
+        kind='counter'
+    )
+    if stock_increment_buffer.enabled:
+        buffer_stats = stock_increment_buffer.stats()
+        lines += gauge_lines(
+            'inventory_increment_buffer_pending', 'Stock increments waiting for a flush.',
+            [({}, buffer_stats['pending_ops'])]
+        )
+        lines += gauge_lines(
+            'inventory_increment_buffer_ops_total', 'Flushed stock increments by outcome.',
+            [({'outcome': 'flushed'}, buffer_stats['flushed_ops']),
+             ({'outcome': 'failed'}, buffer_stats['failed_ops'])],
+            kind='counter'
+        )
+    return lines
+
+
+@require_GET
+def metrics(request):
+    """
+    Request and runtime metrics for this worker process
+    GET: /metrics - Prometheus text exposition format
+    """
+    if not settings.INVENTORY_METRICS:
+        raise Http404("Metrics are disabled")
+    return HttpResponse(
+        render_metrics(_runtime_metric_lines()), content_type=METRICS_CONTENT_TYPE
+    )
+
+
+@require_GET
+def low_stock_events(request):
+    """
+    Push low-stock threshold crossings as Server-Sent Events
+    GET: /api/events/low-stock/ - one message per event, id = event sequence
+    Resumes after the Last-Event-ID header (or ?after=); new subscribers
+    start at the latest event. Each response ends after
+    INVENTORY_EVENTS_STREAM_SECONDS and EventSource reconnects.
+    """
+    after = request.headers.get('Last-Event-ID', request.GET.get('after'))
+    if after is None:
+        after = low_stock_feed.latest()
+    else:
+        try:
+            after = int(after)
+        except ValueError:
+            return JsonResponse(
+                {'error': 'Last-Event-ID must be an event sequence number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    seconds = settings.INVENTORY_EVENTS_STREAM_SECONDS
+    stream = astream_events if isinstance(request, ASGIRequest) else stream_events
+    response = StreamingHttpResponse(stream(after, seconds), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
+
+
+@require_GET
+def export_products(request):
+    """
+    Stream the full product catalog
+    GET: /api/products/export/?format=csv|ndjson
+    A plain Django view: DRF reserves ?format= for renderer selection.
+    Under ASGI the stream is handed over as an async iterator, which
+    Django does not buffer.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse(
+            {'error': f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    stream, content_type = EXPORT_FORMATS[export_format]
+    chunks = stream(iter_product_rows())
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="products.{export_format}"'
+    return response
+
+
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+
+
+@require_POST
+def import_products(request):
+    """
+    Upsert products from a streamed request body, matching on name
+    POST: /api/products/import/
+    Content-Type: text/csv (with header row) or application/x-ndjson
+    The body is read line by line, never buffered whole. Undecodable or
+    malformed input answers 400 naming the line; earlier batches stay
+    imported.
+    """
+    import_format = IMPORT_CONTENT_TYPES.get(request.content_type)
+    if import_format is None:
+        return JsonResponse(
+            {'error': f"Unsupported content type. Use one of: {', '.join(IMPORT_CONTENT_TYPES)}"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+    
+    importer = ProductImporter()
+    try:
+        stats = importer.run(read_rows(decode_lines(request, request.encoding or 'utf-8'), import_format))
+    except ImportFormatError as exc:
+        # Batches before the bad line are already committed
+        return JsonResponse(APIResponse.error_payload(
+            str(exc), {'line': exc.line, 'imported': importer.imported}
+        ), status=status.HTTP_400_BAD_REQUEST)
+    return JsonResponse({
+        'success': True,
+        'message': f"Imported {stats['imported']} of {stats['rows']} rows",
+        'data': stats
+    })
@@ -0,0 +1,190 @@
+"""
+In-process pool of open database connections.
+
+Django opens a connection per thread and closes it at the end of every
+request. The pooled backend hands those closes back to a ConnectionPool
+instead, so the next request reuses a warm connection. One pool exists
+per set of connection parameters.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict
+
+# Recent checkout waits kept for percentiles
+WAIT_SAMPLES = 1000
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections.
+
+    At most ``max_size`` connections are open at once; a checkout beyond
+    that waits up to ``timeout`` seconds for one to come back. Connections
+    idle for more than ``check_after`` seconds are health-checked before
+    reuse, and ones idle for more than ``max_idle`` seconds are closed.
+    """
+
+    def __init__(self, max_size: int = 20, timeout: float = 10,
+                 max_idle: float = 300, check_after: float = 30):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._idle = deque()  # (connection, returned_at), most recent last
+        self._open = 0
+        self._condition = threading.Condition()
+        self.checkouts = 0
+        self.connects = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.discarded = 0
+        self._wait_times = deque(maxlen=WAIT_SAMPLES)
+
+    def acquire(self, connect: Callable[[], Any], is_usable: Callable[[Any], bool]) -> Any:
+        """
+        Check out an idle connection, or open one with ``connect``.
+
+        Raises:
+            PoolTimeout: If the pool stays exhausted for ``timeout`` seconds
+        """
+        started = time.monotonic()
+        waited = False
+        while True:
+            with self._condition:
+                self._close_expired()
+                while not self._idle and self._open >= self.max_size:
+                    remaining = self.timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection free after {self.timeout}s "
+                            f"({self.max_size} in use)"
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                else:
+                    conn, returned_at = None, None
+                    self._open += 1
+
+            if conn is None:
+                try:
+                    conn = connect()
+                except Exception:
+                    self._forget()
+                    raise
+                self._record_checkout(started, waited, connected=True)
+                return conn
+
+            if time.monotonic() - returned_at < self.check_after or is_usable(conn):
+                self._record_checkout(started, waited, connected=False)
+                return conn
+            self._discard(conn)
+
+    def release(self, conn: Any, reusable: bool) -> None:
+        """Return a checked-out connection, or close it if not ``reusable``."""
+        if not reusable:
+            self._discard(conn)
+            return
+        with self._condition:
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def _record_checkout(self, started: float, waited: bool, connected: bool) -> None:
+        with self._condition:
+            self.checkouts += 1
+            self.connects += connected
+            self.waits += waited
+            self._wait_times.append((time.monotonic() - started) * 1000)
+
+    def _close_expired(self) -> None:
+        # Oldest idle connections sit at the left; caller holds the lock
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.popleft()
+            self._open -= 1
+            _close_quietly(conn)
+
+    def _discard(self, conn: Any) -> None:
+        _close_quietly(conn)
+        with self._condition:
+            self.discarded += 1
+        self._forget()
+
+    def _forget(self) -> None:
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._condition:
+            idle, self._idle = self._idle, deque()
+            self._open -= len(idle)
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, checkout counters and checkout wait percentiles (ms)."""
+        # Imported late: backends load before the app registry is ready
+        from inventory.helpers.benchmarking import summarize
+
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'discarded': self.discarded,
+                'wait_ms': summarize(list(self._wait_times)),
+            }
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_pools: Dict[Any, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key: Any, **options) -> ConnectionPool:
+    """The pool for connection parameters ``key``, created on first use."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(**options)
+        return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every pool in this process, keyed by database name."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    stats = {}
+    for key, pool in pools:
+        name = dict(key).get('database') or dict(key).get('dbname') or str(key)
+        stats[name] = pool.stats()
+    return stats
+
+
+def close_all_pools() -> None:
+    """Close the idle connections of every pool (e.g. before DROP DATABASE)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
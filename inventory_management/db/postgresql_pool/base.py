@@ -0,0 +1,100 @@
+"""
+PostgreSQL backend that checks connections out of a ConnectionPool.
+
+Configure it through the extra ``POOL`` key of a DATABASES entry:
+
+    'ENGINE': 'inventory_management.db.postgresql_pool',
+    'CONN_MAX_AGE': 0,  # give the connection back after every request
+    'POOL': {'MAX_SIZE': 20, 'TIMEOUT': 10, 'MAX_IDLE': 300,
+             'CHECK_AFTER': 30, 'PGBOUNCER': False},
+
+With ``PGBOUNCER`` on the backend never leaves session state behind, so
+it can sit behind PgBouncer in transaction pooling mode; pair it with
+DISABLE_SERVER_SIDE_CURSORS.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base, creation
+from psycopg2 import extensions
+
+from ..pool import close_all_pools, get_pool
+
+POOL_DEFAULTS = {
+    'MAX_SIZE': 20,
+    'TIMEOUT': 10,
+    'MAX_IDLE': 300,
+    'CHECK_AFTER': 30,
+    'PGBOUNCER': False,
+}
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would block DROP DATABASE
+        close_all_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @property
+    def pool_options(self):
+        return {**POOL_DEFAULTS, **self.settings_dict.get('POOL', {})}
+
+    def get_new_connection(self, conn_params):
+        options = self.pool_options
+        if options['PGBOUNCER'] and self.settings_dict['OPTIONS'].get('assume_role'):
+            raise ImproperlyConfigured(
+                "SET ROLE (OPTIONS['assume_role']) is session state; not usable behind PgBouncer"
+            )
+        pool = get_pool(
+            tuple(sorted(conn_params.items())),
+            max_size=options['MAX_SIZE'],
+            timeout=options['TIMEOUT'],
+            max_idle=options['MAX_IDLE'],
+            check_after=options['CHECK_AFTER'],
+        )
+        conn = pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            _is_usable,
+        )
+        self._pool = pool
+        return conn
+
+    def _close(self):
+        if self.connection is None:
+            return
+        conn = self.connection
+        reusable = not conn.closed
+        if reusable:
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_INTRANS:
+                try:
+                    conn.rollback()
+                except Exception:
+                    reusable = False
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                reusable = False
+        self._pool.release(conn, reusable)
+
+    def ensure_timezone(self):
+        if not self.pool_options['PGBOUNCER']:
+            return super().ensure_timezone()
+        # SET TIME ZONE would leak to other clients of the server connection
+        timezone_name = self.timezone_name
+        if timezone_name and self.connection.info.parameter_status('TimeZone') != timezone_name:
+            raise ImproperlyConfigured(
+                f"Behind PgBouncer the database's TimeZone must already be "
+                f"{timezone_name} (ALTER DATABASE ... SET timezone)"
+            )
+        return False
+
+
+def _is_usable(conn):
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return True
+    except Exception:
+        return False
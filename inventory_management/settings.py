@@ -32,6 +32,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'inventory.middleware.MetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'inventory_management.urls'
@@ -55,17 +56,97 @@ TEMPLATES = [
 WSGI_APPLICATION = 'inventory_management.wsgi.application'
 
 # Database
+# DB_POOL checks connections out of an in-process pool per worker process
+# (inventory_management.db.postgresql_pool) and hands them back after each
+# request; without it, Django keeps one persistent connection per thread for
+# DB_CONN_MAX_AGE seconds. DB_PGBOUNCER makes either mode safe behind
+# PgBouncer in transaction pooling mode: no server-side cursors and no
+# session state (the database's TimeZone must already be UTC).
+DB_POOL = config('DB_POOL', default=True, cast=bool)
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'inventory_management.db.postgresql_pool' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': config('DB_NAME', default='inventory_db'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='postgres'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'POOL': {
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'MAX_IDLE': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'CHECK_AFTER': config('DB_POOL_CHECK_AFTER', default=30, cast=float),
+            'PGBOUNCER': DB_PGBOUNCER,
+        },
     }
 }
 
+# Cache
+# Use a shared backend (e.g. Redis) in production so invalidations reach
+# every worker process; cache generations always live in 'default'.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='inventory'),
+    }
+}
+
+# Seconds a cached inventory summary may live; writes invalidate it sooner
+INVENTORY_SUMMARY_CACHE_TIMEOUT = config('INVENTORY_SUMMARY_CACHE_TIMEOUT', default=300, cast=int)
+
+# Product detail cache: in-process LRU size (0 disables it), optional shared
+# tier cache alias (empty disables it) and shared entry lifetime in seconds
+INVENTORY_PRODUCT_CACHE_SIZE = config('INVENTORY_PRODUCT_CACHE_SIZE', default=10000, cast=int)
+INVENTORY_PRODUCT_CACHE_ALIAS = config('INVENTORY_PRODUCT_CACHE_ALIAS', default='')
+INVENTORY_PRODUCT_CACHE_TIMEOUT = config('INVENTORY_PRODUCT_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds a stored Idempotency-Key response is replayed; purge expired keys
+# with `manage.py purge_idempotency_keys`
+INVENTORY_IDEMPOTENCY_KEY_TTL = config('INVENTORY_IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+
+# Default and maximum stock reservation lifetime in seconds; expired holds
+# are reclaimed by `manage.py sweep_reservations`
+INVENTORY_RESERVATION_TTL = config('INVENTORY_RESERVATION_TTL', default=900, cast=int)
+INVENTORY_RESERVATION_MAX_TTL = config('INVENTORY_RESERVATION_MAX_TTL', default=86400, cast=int)
+
+# Write-behind coalescing of increase_stock calls: flushed as one UPDATE per
+# product every FLUSH_MS milliseconds or MAX_OPS buffered calls. DURABILITY is
+# 'flush' (respond once committed) or 'immediate' (respond once buffered;
+# flushed on shutdown, lost on a crash). With 'flush', a call waits at most
+# WAIT_MS for its batch before failing
+INVENTORY_COALESCE_INCREMENTS = config('INVENTORY_COALESCE_INCREMENTS', default=False, cast=bool)
+INVENTORY_COALESCE_FLUSH_MS = config('INVENTORY_COALESCE_FLUSH_MS', default=50, cast=int)
+INVENTORY_COALESCE_MAX_OPS = config('INVENTORY_COALESCE_MAX_OPS', default=500, cast=int)
+INVENTORY_COALESCE_DURABILITY = config('INVENTORY_COALESCE_DURABILITY', default='flush')
+INVENTORY_COALESCE_WAIT_MS = config('INVENTORY_COALESCE_WAIT_MS', default=5000, cast=int)
+
+# Serve product list/detail, low-stock and summary GETs from async views on
+# the async ORM; pays off when served through asgi.py by an ASGI server
+INVENTORY_ASYNC_READS = config('INVENTORY_ASYNC_READS', default=False, cast=bool)
+
+# Per-route latency, DB query/time and serialization histograms, served in
+# Prometheus text format at /metrics (per worker process)
+INVENTORY_METRICS = config('INVENTORY_METRICS', default=True, cast=bool)
+
+# Delta sync feed (/products/changes/): rows newer than SETTLE_SECONDS are
+# held back on top of the open write transactions (a margin for clock skew
+# between app servers and the database, see helpers/sync.py); deletion
+# tombstones live TOMBSTONE_TTL seconds (purge_tombstones)
+INVENTORY_SYNC_SETTLE_SECONDS = config('INVENTORY_SYNC_SETTLE_SECONDS', default=2, cast=float)
+INVENTORY_TOMBSTONE_TTL = config('INVENTORY_TOMBSTONE_TTL', default=2592000, cast=int)
+
+# Low-stock event stream (/events/low-stock/): how often each process checks
+# for newly dispatched events, how long one SSE response stays open before
+# the client reconnects, and how long dispatched events are kept
+INVENTORY_EVENTS_POLL_MS = config('INVENTORY_EVENTS_POLL_MS', default=500, cast=int)
+INVENTORY_EVENTS_STREAM_SECONDS = config('INVENTORY_EVENTS_STREAM_SECONDS', default=55, cast=int)
+INVENTORY_EVENTS_RETENTION = config('INVENTORY_EVENTS_RETENTION', default=604800, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -1,6 +1,9 @@
 """inventory_management URL Configuration"""
 from django.urls import path, include
 
+from inventory.views import metrics
+
 urlpatterns = [
     path('api/v1/', include('inventory.urls')),
+    path('metrics', metrics, name='metrics'),
 ]